@@ -0,0 +1,118 @@
+"""
+In-memory TTL/LRU cache for intent analysis and vector search results.
+Keys are built from normalized text so repeated support questions hit the cache.
+"""
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace"""
+    return " ".join(re.findall(r"\w+", (text or "").lower()))
+
+
+def conversation_key(messages: List[Dict[str, str]], tail: int = 3) -> str:
+    """Cache key from the normalized last `tail` non-system messages"""
+    relevant = [msg for msg in messages if msg.get("role") != "system"][-tail:]
+    return "\n".join(f"{msg.get('role')}:{normalize_text(msg.get('content', ''))}" for msg in relevant)
+
+
+class TTLCache:
+    """
+    LRU cache with per-entry expiry and optional embedding-similarity lookup.
+
+    Entries may carry an embedding; get_similar() then returns the value of the
+    closest live entry whose cosine similarity reaches the given minimum.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 3600.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any, Optional[np.ndarray]]]" = OrderedDict()
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a live entry and mark it as recently used"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value, _ = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def get_similar(self, embedding: List[float], min_similarity: float) -> Optional[Any]:
+        """
+        Get the value of the most similar entry by cosine similarity.
+        Counts as a semantic hit; a miss was already recorded by get().
+        """
+        now = time.monotonic()
+        keys = []
+        vectors = []
+        for key, (expires_at, _, vector) in self._entries.items():
+            if vector is not None and expires_at >= now:
+                keys.append(key)
+                vectors.append(vector)
+
+        if not vectors:
+            return None
+
+        query = np.asarray(embedding, dtype=np.float32)
+        query /= np.linalg.norm(query) or 1.0
+        similarities = np.stack(vectors) @ query
+        best = int(np.argmax(similarities))
+        if similarities[best] < min_similarity:
+            return None
+
+        self._entries.move_to_end(keys[best])
+        self.semantic_hits += 1
+        return self._entries[keys[best]][1]
+
+    def set(self, key: str, value: Any, embedding: Optional[List[float]] = None):
+        """Store a value, evicting the least recently used entry when full"""
+        vector = None
+        if embedding is not None:
+            vector = np.asarray(embedding, dtype=np.float32)
+            vector /= np.linalg.norm(vector) or 1.0
+
+        self._entries[key] = (time.monotonic() + self.ttl, value, vector)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Drop all entries (counters are kept)"""
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get size and hit/miss counters"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.semantic_hits) / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations
+        }
@@ -2,15 +2,26 @@
 Chat service handling AI model interactions with streaming support.
 Manages OpenAI and Anthropic API calls with vector DB integration.
 """
-import json
 import asyncio
 import logging
-from typing import List, Dict, Any, AsyncGenerator
-from anthropic import Anthropic
-from openai import OpenAI
+import re
+import time
+from typing import List, Dict, Any, AsyncGenerator, Awaitable, Callable, Optional, Set, Tuple
+from anthropic import AsyncAnthropic
+from openai import AsyncOpenAI
 import os
 from dotenv import load_dotenv
 
+from vector_db.chroma_client import SearchQueueFullError
+from .cache import TTLCache, conversation_key, normalize_text
+from .context import ContextBuilder, parse_budgets
+from .events import ChatEvent, CONTENT, REASONING, TOOL_CALL_START, TOOL_CALL_END, USAGE, DONE, ERROR, collect_response
+from .metrics import ChatMetrics, TurnMetrics
+from .models import MODEL_IDS
+from .prompt_cache import anthropic_usage, openai_usage
+from .transport import ProviderLimits, create_http_client, pool_stats, prewarm
+from .intent import IntentEngine, RuleIntentClassifier, EmbeddingIntentClassifier, last_user_message
+
 load_dotenv()
 
 # Set up logging
@@ -25,27 +36,129 @@ class ChatService:
         self.prompt_manager = prompt_manager
         self.vector_db = vector_db
 
-        # Initialize API clients (optional - will fail at usage time if not set)
+        # Initialize async API clients (optional - will fail at usage time if not set).
+        # The async SDKs keep provider I/O on the event loop without blocking it,
+        # so concurrent /api/chat streams on one worker don't stall each other.
+        # Each client gets its own long-lived, tuned connection pool.
         anthropic_key = os.getenv("ANTHROPIC_API_KEY")
         openai_key = os.getenv("OPENAI_API_KEY")
+        pool_settings = {
+            "max_connections": int(os.getenv("PROVIDER_MAX_CONNECTIONS", "64")),
+            "max_keepalive": int(os.getenv("PROVIDER_MAX_KEEPALIVE", "32")),
+            "keepalive_expiry": float(os.getenv("PROVIDER_KEEPALIVE_EXPIRY", "60")),
+        }
+        self.prewarm_count = int(os.getenv("PROVIDER_PREWARM_CONNECTIONS", "2"))
+        self.http_clients = {}
 
         if anthropic_key:
-            self.anthropic_client = Anthropic(api_key=anthropic_key)
+            self.http_clients["anthropic"] = create_http_client(**pool_settings)
+            self.anthropic_client = AsyncAnthropic(api_key=anthropic_key, http_client=self.http_clients["anthropic"])
             logger.info("Anthropic client initialized")
         else:
             self.anthropic_client = None
             logger.warning("ANTHROPIC_API_KEY not set - Claude models will not work")
 
         if openai_key:
-            self.openai_client = OpenAI(api_key=openai_key)
+            self.http_clients["openai"] = create_http_client(**pool_settings)
+            self.openai_client = AsyncOpenAI(api_key=openai_key, http_client=self.http_clients["openai"])
             logger.info("OpenAI client initialized")
         else:
             self.openai_client = None
             logger.warning("OPENAI_API_KEY not set - OpenAI models will not work")
 
-    async def _analyze_intent(self, messages: List[Dict[str, str]]) -> Dict[str, Any]:
+        # Upstream concurrency: per provider and per model prefix; requests
+        # wait up to PROVIDER_QUEUE_TIMEOUT seconds for a slot
+        self.provider_limits = ProviderLimits(
+            provider_limits=parse_budgets(os.getenv("PROVIDER_CONCURRENCY", "openai=32,anthropic=32")),
+            model_limits=parse_budgets(os.getenv("MODEL_CONCURRENCY", "")),
+            queue_timeout=float(os.getenv("PROVIDER_QUEUE_TIMEOUT", "10"))
+        )
+
+        # Provider prompt caching: cache-friendly message layout, Anthropic
+        # cache_control breakpoints; token usage totals per provider
+        self.prompt_caching = os.getenv("PROMPT_CACHING", "true").lower() == "true"
+        self.prompt_cache_stats = {
+            provider: {"responses": 0, "input_tokens": 0, "output_tokens": 0,
+                       "cache_read_tokens": 0, "cache_write_tokens": 0}
+            for provider in ("openai", "anthropic")
+        }
+
+        # Per-stage latency metrics (GET /metrics) and optional timing events;
+        # with both off, turns run uninstrumented
+        self.metrics = ChatMetrics(
+            enabled=os.getenv("CHAT_METRICS", "true").lower() == "true",
+            models=MODEL_IDS
+        )
+        self.timing_events = os.getenv("CHAT_TIMING_EVENTS", "false").lower() == "true"
+
+        # Speculative retrieval: search on the raw user message while intent
+        # analysis runs, reuse the result if the rewritten query is close enough
+        self.speculative_retrieval = os.getenv("SPECULATIVE_RETRIEVAL", "true").lower() == "true"
+        self.speculative_match_threshold = float(os.getenv("SPECULATIVE_MATCH_THRESHOLD", "0.6"))
+        self._background_tasks: Set[asyncio.Task] = set()
+
+        # Intent engine: local classifiers first, LLM analysis only when unsure.
+        # INTENT_ENGINE=llm restores the LLM-only behaviour.
+        classifiers = []
+        if os.getenv("INTENT_ENGINE", "local").lower() == "local":
+            classifiers = [
+                RuleIntentClassifier(known_word=vector_db.is_known_term),
+                EmbeddingIntentClassifier(
+                    vector_db,
+                    max_distance=float(os.getenv("INTENT_SEARCH_DISTANCE", "1.0"))
+                ),
+            ]
+        self.intent_engine = IntentEngine(classifiers, fallback=self._analyze_intent_llm)
+
+        # TTL/LRU caches for intent analysis and vector search, keyed on the
+        # normalized conversation tail / query and cleared whenever the
+        # collection or a prompt changes
+        self.cache_enabled = os.getenv("CHAT_CACHE_ENABLED", "true").lower() == "true"
+        cache_size = int(os.getenv("CHAT_CACHE_MAX_ENTRIES", "1024"))
+        cache_ttl = float(os.getenv("CHAT_CACHE_TTL_SECONDS", "3600"))
+        self.cache_tail = int(os.getenv("CHAT_CACHE_CONVERSATION_TAIL", "3"))
+        self.semantic_cache = os.getenv("CHAT_CACHE_SEMANTIC", "false").lower() == "true"
+        self.semantic_min_similarity = float(os.getenv("CHAT_CACHE_SEMANTIC_MIN_SIMILARITY", "0.95"))
+        self.intent_cache = TTLCache(cache_size, cache_ttl)
+        self.search_cache = TTLCache(cache_size, cache_ttl)
+        self._cache_generation = None
+
+        # Context assembly: per-model token budget, distance cut-off, dedup
+        max_distance = os.getenv("CONTEXT_MAX_DISTANCE")
+        self.context_builder = ContextBuilder(
+            default_budget=int(os.getenv("CONTEXT_TOKEN_BUDGET", "2000")),
+            model_budgets=parse_budgets(os.getenv("CONTEXT_TOKEN_BUDGETS", "")),
+            max_distance=float(max_distance) if max_distance else None,
+            duplicate_similarity=float(os.getenv("CONTEXT_DUPLICATE_SIMILARITY", "0.8"))
+        )
+
+    async def _analyze_intent(
+        self,
+        messages: List[Dict[str, str]],
+        neighbours: Optional[Callable[[], Awaitable[Dict[str, Any]]]] = None
+    ) -> Dict[str, Any]:
         """
         Analyze conversation intent to determine if vector DB lookup is needed.
+        Clear cases are decided locally; the LLM is only asked when unsure.
+        Returns dict with 'needs_search' (bool), 'query' (str or None) and 'source'.
+        """
+        if not self.cache_enabled:
+            return await self.intent_engine.analyze(messages, neighbours)
+
+        self._check_cache_generation()
+        key = conversation_key(messages, self.cache_tail)
+        cached = self.intent_cache.get(key)
+        if cached is not None:
+            return {**cached, "cached": True}
+
+        result = await self.intent_engine.analyze(messages, neighbours)
+        if not result.get("error"):
+            self.intent_cache.set(key, result)
+        return result
+
+    async def _analyze_intent_llm(self, messages: List[Dict[str, str]]) -> Dict[str, Any]:
+        """
+        Ask gpt-4o-mini whether a vector DB lookup is needed and for a search query.
         Returns dict with 'needs_search' (bool) and 'query' (str or None).
         """
         try:
@@ -80,14 +193,15 @@ Beispiele:
             # Use fast model for intent analysis (gpt-4o-mini)
             if not self.openai_client:
                 logger.warning("OpenAI client not available, skipping intent analysis")
-                return {"needs_search": True, "query": messages[-1]["content"]}
-
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[{"role": "user", "content": intent_prompt}],
-                max_tokens=200,
-                temperature=0
-            )
+                return {"needs_search": True, "query": last_user_message(messages)}
+
+            async with self.provider_limits.slot("openai", "gpt-4o-mini"):
+                response = await self.openai_client.chat.completions.create(
+                    model="gpt-4o-mini",
+                    messages=[{"role": "user", "content": intent_prompt}],
+                    max_tokens=200,
+                    temperature=0
+                )
 
             result = response.choices[0].message.content.strip()
             logger.info(f"Intent analysis result: {result}")
@@ -106,30 +220,83 @@ Beispiele:
 
         except Exception as e:
             logger.error(f"Intent analysis error: {str(e)}")
-            # On error, fall back to no search
-            return {"needs_search": False, "query": None, "reason": str(e)}
+            # On error, fall back to no search (not cached)
+            return {"needs_search": False, "query": None, "reason": str(e), "error": True}
 
-    async def stream_chat(
+    def stream_events(
         self,
         messages: List[Dict[str, str]],
         model: str,
         prompt_id: str = "default",
-        model_config: Dict[str, Any] = None
-    ) -> AsyncGenerator[str, None]:
+        model_config: Dict[str, Any] = None,
+        prompt_version: int = None,
+        timing: bool = None
+    ) -> AsyncGenerator[ChatEvent, None]:
         """
         Stream chat responses with tool calls and vector DB retrieval.
-        Yields Server-Sent Events (SSE) formatted data.
+        Yields typed events (see events.py); the HTTP layer encodes them as SSE.
+        prompt_version pins a saved prompt version (None = latest); timing adds
+        a timing event before done (None = CHAT_TIMING_EVENTS).
         """
+        if timing is None:
+            timing = self.timing_events
+        if not self.metrics.enabled and not timing:
+            # Uninstrumented: the turn's events go straight to the caller
+            return self._stream_turn(messages, model, prompt_id, model_config, prompt_version, None)
+
+        turn = TurnMetrics(self.metrics if self.metrics.enabled else None, model, prompt_id, timing)
+        return turn.observe(
+            self._stream_turn(messages, model, prompt_id, model_config, prompt_version, turn.stages)
+        )
+
+    async def _stream_turn(
+        self,
+        messages: List[Dict[str, str]],
+        model: str,
+        prompt_id: str,
+        model_config: Optional[Dict[str, Any]],
+        prompt_version: Optional[int],
+        stages: Optional[Dict[str, Any]]
+    ) -> AsyncGenerator[ChatEvent, None]:
+        """One chat turn; stage timings go into `stages` when the turn is instrumented"""
+        model_config = model_config or {}
         try:
-            logger.info(f"Starting chat stream - model: {model}, prompt: {prompt_id}")
+            logger.info(f"Starting chat stream - model: {model}, prompt: {prompt_id}, version: {prompt_version or 'latest'}")
             # Get prompt configuration
-            prompt_config = self.prompt_manager.get_prompt(prompt_id)
+            prompt_config = self.prompt_manager.get_prompt(prompt_id, prompt_version)
             if not prompt_config:
+                if prompt_version is not None:
+                    yield ChatEvent(ERROR, {"message": f"Prompt {prompt_id} has no version {prompt_version}"})
+                    return
                 prompt_config = self._get_default_prompt()
+            if stages is not None:
+                # Label by the prompt actually used, so unknown ids don't add series
+                stages["prompt_id"] = prompt_config.get("id", "default")
+                stages["stage"] = "intent"
+
+            # Start a speculative search on the raw user message so retrieval
+            # overlaps with the intent analysis round trip
+            raw_query = last_user_message(messages)
+            speculative_task = None
+            neighbours = None
+            if self.speculative_retrieval and raw_query:
+                speculative_task = asyncio.create_task(self._timed_search(raw_query))
+
+                # The embedding intent classifier scores the same search results
+                async def neighbours() -> Dict[str, Any]:
+                    results, _ = await speculative_task
+                    return results
 
             # Analyze intent to determine if vector search is needed
-            intent_result = await self._analyze_intent(messages)
+            intent_start = time.perf_counter()
+            intent_result = await self._analyze_intent(messages, neighbours)
+            intent_ms = (time.perf_counter() - intent_start) * 1000
             logger.info(f"Intent analysis: {intent_result}")
+            if stages is not None:
+                stages["intent_ms"] = intent_ms
+                stages["intent_source"] = intent_result.get("source")
+                stages["intent_error"] = intent_result.get("error", False)
+                stages["stage"] = "search"
 
             context = ""
 
@@ -137,95 +304,224 @@ Beispiele:
             if intent_result["needs_search"] and intent_result["query"]:
                 search_query = intent_result["query"]
 
-                yield self._format_sse("tool_call_start", {
+                yield ChatEvent(TOOL_CALL_START, {
                     "tool": "vector_search",
                     "query": search_query
                 })
 
-                # Force event to be sent before blocking operation
-                await asyncio.sleep(0)
-
-                vector_results = self.vector_db.search(search_query, n_results=5)
-
-                yield self._format_sse("tool_call_end", {
+                wait_start = time.perf_counter()
+                if speculative_task and self._queries_match(raw_query, search_query):
+                    vector_results, search_ms = await speculative_task
+                    speculative = "hit"
+                else:
+                    if speculative_task:
+                        self._discard_task(speculative_task)
+                    vector_results, search_ms = await self._timed_search(search_query)
+                    speculative = "miss" if speculative_task else "off"
+                wait_ms = (time.perf_counter() - wait_start) * 1000
+                if stages is not None:
+                    stages["search_ms"] = search_ms
+
+                # Time-to-first-token saved = search time hidden behind intent analysis
+                timing = {
+                    "intent_ms": round(intent_ms, 1),
+                    "search_ms": round(search_ms, 1),
+                    "search_wait_ms": round(wait_ms, 1),
+                    "speculative": speculative,
+                    "saved_ms": round(max(search_ms - wait_ms, 0.0), 1) if speculative == "hit" else 0.0
+                }
+                logger.info(f"Retrieval timing: {timing}")
+
+                yield ChatEvent(TOOL_CALL_END, {
                     "tool": "vector_search",
-                    "results": vector_results
+                    "results": vector_results,
+                    "timing": timing
                 })
 
                 # Build context from vector results
-                context = self._build_context(vector_results)
+                context = self._build_context(vector_results, model)
             else:
                 # Skip vector search - intent was unclear or not relevant
+                if speculative_task:
+                    self._discard_task(speculative_task)
                 logger.info(f"Skipping vector search: {intent_result.get('reason', 'No reason provided')}")
 
-            # Prepare messages with system prompt and context
-            full_messages = self._prepare_messages(messages, prompt_config, context)
+            if stages is not None:
+                stages["stage"] = "generate"
 
-            # Stream based on provider
+            # Stream based on provider; messages are laid out so the static
+            # system prompt and the conversation so far form a cacheable prefix
             if model.startswith("gpt") or model.startswith("o1"):
                 if not self.openai_client:
-                    yield self._format_sse("error", {"message": "OpenAI API key not configured"})
+                    yield ChatEvent(ERROR, {"message": "OpenAI API key not configured"})
                     return
-                async for chunk in self._stream_openai(model, full_messages, model_config):
+                full_messages = self._prepare_messages(messages, prompt_config, context)
+                async for chunk in self._stream_openai(model, full_messages, model_config, prompt_config.get("hash")):
                     yield chunk
             elif model.startswith("claude"):
                 if not self.anthropic_client:
-                    yield self._format_sse("error", {"message": "Anthropic API key not configured"})
+                    yield ChatEvent(ERROR, {"message": "Anthropic API key not configured"})
                     return
-                async for chunk in self._stream_anthropic(model, full_messages, model_config):
+                system, chat_messages = self._prepare_anthropic_messages(messages, prompt_config, context)
+                async for chunk in self._stream_anthropic(model, system, chat_messages, model_config):
                     yield chunk
             else:
                 raise ValueError(f"Unsupported model: {model}")
 
         except Exception as e:
             logger.error(f"Stream chat error: {str(e)}")
-            yield self._format_sse("error", {"message": str(e)})
+            yield ChatEvent(ERROR, {"message": str(e)})
+
+    async def _timed_search(self, query: str) -> Tuple[Dict[str, Any], float]:
+        """Run a vector search and return (results, elapsed milliseconds)"""
+        start = time.perf_counter()
+        try:
+            results = await self._search(query, n_results=5)
+        except SearchQueueFullError as e:
+            # Under overload, answer without knowledge base context
+            logger.warning(f"Vector search rejected: {str(e)}")
+            results = {"query": query, "error": str(e), "documents": [[]],
+                       "metadatas": [[]], "distances": [[]], "ids": [[]]}
+        return results, (time.perf_counter() - start) * 1000
+
+    async def _search(self, query: str, n_results: int = 5) -> Dict[str, Any]:
+        """Vector search through the exact and (optional) semantic search cache"""
+        if not self.cache_enabled:
+            return await self.vector_db.search_async(query, n_results=n_results)
+
+        self._check_cache_generation()
+        key = f"{n_results}:{normalize_text(query)}"
+        cached = self.search_cache.get(key)
+        if cached is not None:
+            return cached
+
+        embedding = None
+        if self.semantic_cache:
+            # Embed once: used for the near-duplicate lookup and the search itself
+            embedding = (await self.vector_db.embed_async([query]))[0]
+            cached = self.search_cache.get_similar(embedding, self.semantic_min_similarity)
+            if cached is not None:
+                return cached
+
+        results = await self.vector_db.search_async(query, n_results=n_results, query_embedding=embedding)
+        if "error" not in results:
+            self.search_cache.set(key, results, embedding)
+        return results
+
+    def _check_cache_generation(self):
+        """Clear the caches when the collection or the prompts have changed"""
+        generation = (self.vector_db.version, self.prompt_manager.version)
+        if generation != self._cache_generation:
+            self.intent_cache.clear()
+            self.search_cache.clear()
+            self._cache_generation = generation
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get cache hit/miss counters and intent decision sources"""
+        return {
+            "enabled": self.cache_enabled,
+            "intent": self.intent_cache.get_stats(),
+            "search": self.search_cache.get_stats(),
+            "intent_sources": dict(self.intent_engine.decisions),
+            "provider_prompt_cache": self.get_prompt_cache_stats()
+        }
+
+    def get_prompt_cache_stats(self) -> Dict[str, Any]:
+        """Get provider prompt cache token totals and the share of input tokens read from cache"""
+        stats = {"enabled": self.prompt_caching}
+        for provider, totals in self.prompt_cache_stats.items():
+            stats[provider] = {
+                **totals,
+                "cache_read_ratio": round(totals["cache_read_tokens"] / totals["input_tokens"], 3)
+                if totals["input_tokens"] else 0.0
+            }
+        return stats
+
+    def get_provider_stats(self) -> Dict[str, Any]:
+        """Get connection pool and concurrency queue statistics per provider"""
+        return {
+            "pools": {name: pool_stats(client) for name, client in self.http_clients.items()},
+            **self.provider_limits.get_stats()
+        }
+
+    async def prewarm_connections(self) -> Dict[str, Any]:
+        """Open PROVIDER_PREWARM_CONNECTIONS pooled connections per configured provider"""
+        base_urls = {}
+        if self.openai_client:
+            base_urls["openai"] = str(self.openai_client.base_url)
+        if self.anthropic_client:
+            base_urls["anthropic"] = str(self.anthropic_client.base_url)
+
+        results = {}
+        if self.prewarm_count > 0:
+            for name, base_url in base_urls.items():
+                results[name] = await prewarm(self.http_clients[name], base_url, self.prewarm_count)
+        return results
+
+    async def close(self):
+        """Close the provider connection pools"""
+        for client in self.http_clients.values():
+            await client.aclose()
+
+    def clear_caches(self):
+        """Drop all cached intent and search results"""
+        self.intent_cache.clear()
+        self.search_cache.clear()
+
+    def _discard_task(self, task: asyncio.Task):
+        """
+        Drop a speculative search without cancelling it. The executor job keeps
+        running either way, so letting it finish keeps the search queue
+        accounting accurate; holding a reference stops it being garbage collected.
+        """
+        self._background_tasks.add(task)
+        task.add_done_callback(self._finish_discarded_task)
+
+    def _finish_discarded_task(self, task: asyncio.Task):
+        # Retrieve the exception so a failed search isn't reported as never retrieved
+        self._background_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Discarded speculative search failed: {task.exception()}")
+
+    def _query_terms(self, text: str) -> Set[str]:
+        """Lowercased word stems (first 5 chars) used to compare search queries"""
+        return {word[:5] for word in re.findall(r"\w+", text.lower()) if len(word) > 2}
+
+    def _queries_match(self, raw_query: Optional[str], search_query: str) -> bool:
+        """
+        Check whether the speculative search on the raw message can stand in for
+        the rewritten query: enough of the rewritten terms must occur in the raw text.
+        """
+        if not raw_query:
+            return False
+        if raw_query.strip().lower() == search_query.strip().lower():
+            return True
+
+        query_terms = self._query_terms(search_query)
+        if not query_terms:
+            return False
+
+        overlap = len(query_terms & self._query_terms(raw_query)) / len(query_terms)
+        return overlap >= self.speculative_match_threshold
 
     async def chat(
         self,
         messages: List[Dict[str, str]],
         model: str,
         prompt_id: str = "default",
-        model_config: Dict[str, Any] = None
+        model_config: Dict[str, Any] = None,
+        prompt_version: int = None,
+        timing: bool = None
     ) -> Dict[str, Any]:
         """
         Non-streaming chat completion.
         """
         try:
             logger.info(f"Starting non-streaming chat - model: {model}, prompt: {prompt_id}")
-            # Collect all streaming events
-            content = ""
-            tool_calls = []
-            reasoning = ""
-
-            async for event_str in self.stream_chat(messages, model, prompt_id, model_config or {}):
-                # Parse SSE format
-                if "event:" in event_str and "data:" in event_str:
-                    lines = event_str.strip().split('\n')
-                    event_type = ""
-                    data = {}
-
-                    for line in lines:
-                        if line.startswith('event:'):
-                            event_type = line.replace('event:', '').strip()
-                        elif line.startswith('data:'):
-                            try:
-                                data = json.loads(line.replace('data:', '').strip())
-                            except:
-                                pass
-
-                    if event_type == "content":
-                        content += data.get("delta", "")
-                    elif event_type == "tool_call_end":
-                        tool_calls.append(data)
-                    elif event_type == "reasoning":
-                        reasoning = data.get("content", "")
-
-            return {
-                "content": content,
-                "tool_calls": tool_calls,
-                "reasoning": reasoning if reasoning else None
-            }
+            # Collect the events of the turn into one response
+            return await collect_response(
+                self.stream_events(messages, model, prompt_id, model_config or {}, prompt_version, timing)
+            )
         except Exception as e:
             logger.error(f"Non-streaming chat error: {str(e)}")
             raise Exception(f"Chat error: {str(e)}")
@@ -234,103 +530,109 @@ Beispiele:
         self,
         model: str,
         messages: List[Dict[str, str]],
-        config: Dict[str, Any]
-    ) -> AsyncGenerator[str, None]:
+        config: Dict[str, Any],
+        prompt_hash: str = None
+    ) -> AsyncGenerator[ChatEvent, None]:
         """Stream OpenAI chat completion"""
         try:
-            # Handle o1 models (no streaming)
-            if model.startswith("o1"):
-                response = self.openai_client.chat.completions.create(
-                    model=model,
-                    messages=messages,
-                    max_completion_tokens=config.get("max_completion_tokens", 8000),
-                    **{k: v for k, v in config.items() if k != "max_completion_tokens"}
-                )
-
-                # Send reasoning if available
-                if hasattr(response.choices[0].message, "reasoning"):
-                    yield self._format_sse("reasoning", {
-                        "content": response.choices[0].message.reasoning
-                    })
-
-                yield self._format_sse("content", {
-                    "delta": response.choices[0].message.content
-                })
-                yield self._format_sse("done", {})
-            else:
-                # Standard streaming models
-                stream = self.openai_client.chat.completions.create(
-                    model=model,
-                    messages=messages,
-                    stream=True,
-                    **config
-                )
-
-                for chunk in stream:
-                    if chunk.choices[0].delta.content:
-                        yield self._format_sse("content", {
-                            "delta": chunk.choices[0].delta.content
+            if self.prompt_caching and prompt_hash:
+                # Route requests sharing the system prompt to the same prefix cache
+                config = {"prompt_cache_key": prompt_hash[:32], **config}
+            # Hold a provider slot for the whole request, stream included
+            async with self.provider_limits.slot("openai", model):
+                # Handle o1 models (no streaming)
+                if model.startswith("o1"):
+                    response = await self.openai_client.chat.completions.create(
+                        model=model,
+                        messages=messages,
+                        max_completion_tokens=config.get("max_completion_tokens", 8000),
+                        **{k: v for k, v in config.items() if k != "max_completion_tokens"}
+                    )
+
+                    # Send reasoning if available
+                    if hasattr(response.choices[0].message, "reasoning"):
+                        yield ChatEvent(REASONING, {
+                            "content": response.choices[0].message.reasoning
                         })
 
-                yield self._format_sse("done", {})
+                    yield ChatEvent(CONTENT, {
+                        "delta": response.choices[0].message.content
+                    })
+                    if response.usage:
+                        yield self._usage_event("openai", openai_usage(response.usage))
+                    yield ChatEvent(DONE, {})
+                else:
+                    # Standard streaming models
+                    # The last chunk carries the token usage, cached prompt tokens included
+                    stream = await self.openai_client.chat.completions.create(
+                        model=model,
+                        messages=messages,
+                        stream=True,
+                        **{"stream_options": {"include_usage": True}, **config}
+                    )
+
+                    usage = None
+                    async for chunk in stream:
+                        if chunk.choices and chunk.choices[0].delta.content:
+                            yield ChatEvent(CONTENT, {
+                                "delta": chunk.choices[0].delta.content
+                            })
+                        if getattr(chunk, "usage", None):
+                            usage = openai_usage(chunk.usage)
+
+                    if usage:
+                        yield self._usage_event("openai", usage)
+                    yield ChatEvent(DONE, {})
 
         except Exception as e:
             logger.error(f"OpenAI stream error: {str(e)}")
-            yield self._format_sse("error", {"message": str(e)})
+            yield ChatEvent(ERROR, {"message": str(e)})
 
     async def _stream_anthropic(
         self,
         model: str,
-        messages: List[Dict[str, str]],
+        system: Any,
+        messages: List[Dict[str, Any]],
         config: Dict[str, Any]
-    ) -> AsyncGenerator[str, None]:
+    ) -> AsyncGenerator[ChatEvent, None]:
         """Stream Anthropic chat completion"""
         try:
-            # Extract system message
-            system_msg = ""
-            chat_messages = []
-
-            for msg in messages:
-                if msg["role"] == "system":
-                    system_msg = msg["content"]
-                else:
-                    chat_messages.append(msg)
-
-            # Stream response
-            with self.anthropic_client.messages.stream(
-                model=model,
-                max_tokens=config.get("max_tokens", 8192),
-                system=system_msg,
-                messages=chat_messages,
-            ) as stream:
-                for text in stream.text_stream:
-                    yield self._format_sse("content", {"delta": text})
+            async with self.provider_limits.slot("anthropic", model):
+                # Stream response
+                async with self.anthropic_client.messages.stream(
+                    model=model,
+                    max_tokens=config.get("max_tokens", 8192),
+                    system=system,
+                    messages=messages,
+                ) as stream:
+                    async for text in stream.text_stream:
+                        yield ChatEvent(CONTENT, {"delta": text})
+                    message = await stream.get_final_message()
 
-            yield self._format_sse("done", {})
+            yield self._usage_event("anthropic", anthropic_usage(message.usage))
+            yield ChatEvent(DONE, {})
 
         except Exception as e:
             logger.error(f"Anthropic stream error: {str(e)}")
-            yield self._format_sse("error", {"message": str(e)})
-
-    def _build_context(self, vector_results: Dict[str, Any]) -> str:
-        """Build context string from vector search results"""
-        if not vector_results or not vector_results.get("documents"):
-            return ""
-
-        context_parts = ["# Relevant Knowledge Base Articles\n"]
-
-        documents = vector_results.get("documents", [[]])[0]
-        metadatas = vector_results.get("metadatas", [[]])[0]
-
-        for i, (doc, meta) in enumerate(zip(documents, metadatas), 1):
-            context_parts.append(f"\n## Article {i}")
-            if meta and meta.get("title"):
-                context_parts.append(f"Title: {meta['title']}")
-            if meta and meta.get("url"):
-                context_parts.append(f"Source: {meta['url']}")
-            context_parts.append(f"\n{doc}\n")
-
-        return "\n".join(context_parts)
+            yield ChatEvent(ERROR, {"message": str(e)})
+
+    def _usage_event(self, provider: str, usage: Dict[str, int]) -> ChatEvent:
+        """Count a response's token usage in the prompt cache stats and wrap it as an event"""
+        totals = self.prompt_cache_stats[provider]
+        totals["responses"] += 1
+        for key, value in usage.items():
+            totals[key] += value
+        return ChatEvent(USAGE, {"provider": provider, **usage})
+
+    def _build_context(self, vector_results: Dict[str, Any], model: str = None) -> str:
+        """Build context string from vector search results within the model's token budget"""
+        assembled = self.context_builder.assemble(vector_results, model)
+        logger.info(
+            f"Context: {assembled['articles_used']} articles, {assembled['tokens']} tokens "
+            f"(dropped {assembled['dropped_distance']} by distance, "
+            f"{assembled['dropped_duplicates']} duplicates, {assembled['dropped_budget']} over budget)"
+        )
+        return assembled["text"]
 
     def _prepare_messages(
         self,
@@ -338,16 +640,73 @@ Beispiele:
         prompt_config: Dict[str, Any],
         context: str
     ) -> List[Dict[str, str]]:
-        """Prepare messages with system prompt and context"""
+        """
+        Prepare messages with system prompt and context.
+
+        With prompt caching the retrieved context, which changes every turn,
+        goes in its own system message right before the latest user message,
+        so the system prompt and earlier turns stay a byte-identical prefix
+        (OpenAI caches such prefixes automatically). Otherwise the context is
+        appended to the system prompt.
+        """
         system_prompt = prompt_config.get("system_prompt", "")
 
+        if not self.prompt_caching:
+            if context:
+                system_prompt += f"\n\n{context}"
+            return [{"role": "system", "content": system_prompt}, *messages]
+
+        prepared = [{"role": "system", "content": system_prompt}, *messages[:-1]]
         if context:
-            system_prompt += f"\n\n{context}"
+            prepared.append({"role": "system", "content": context})
+        prepared.extend(messages[-1:])
+        return prepared
 
-        prepared = [{"role": "system", "content": system_prompt}]
-        prepared.extend(messages)
+    def _prepare_anthropic_messages(
+        self,
+        messages: List[Dict[str, str]],
+        prompt_config: Dict[str, Any],
+        context: str
+    ) -> Tuple[Any, List[Dict[str, Any]]]:
+        """
+        Prepare the system parameter and messages for Anthropic.
 
-        return prepared
+        With prompt caching the system prompt and the conversation before the
+        latest message end in cache_control breakpoints, and the context is
+        sent as a first content block of the latest message.
+
+        Returns:
+            (system, messages)
+        """
+        system_prompt = prompt_config.get("system_prompt", "")
+        chat_messages = [msg for msg in messages if msg["role"] != "system"]
+
+        if not self.prompt_caching:
+            if context:
+                system_prompt += f"\n\n{context}"
+            return system_prompt, chat_messages
+
+        cache_marker = {"type": "ephemeral"}
+        system = [{"type": "text", "text": system_prompt, "cache_control": cache_marker}] if system_prompt else ""
+
+        prepared = [dict(msg) for msg in chat_messages]
+        if len(prepared) > 1:
+            # The marker goes on the last block of the previous turn; an empty
+            # turn gets none (Anthropic rejects empty text blocks)
+            previous = prepared[-2]
+            blocks = self._content_blocks(previous["content"])
+            if blocks:
+                previous["content"] = blocks[:-1] + [{**blocks[-1], "cache_control": cache_marker}]
+        if context and prepared:
+            prepared[-1]["content"] = [{"type": "text", "text": context}] + self._content_blocks(prepared[-1]["content"])
+        return system, prepared
+
+    @staticmethod
+    def _content_blocks(content: Any) -> List[Dict[str, Any]]:
+        """Message content as a list of Anthropic content blocks (none for empty text)"""
+        if isinstance(content, list):
+            return list(content)
+        return [{"type": "text", "text": content}] if content else []
 
     def _get_default_prompt(self) -> Dict[str, Any]:
         """Get default prompt configuration"""
@@ -359,7 +718,3 @@ Beispiele:
             "use_case": "general customer support",
             "system_prompt": "You are a helpful customer service assistant for 1&1."
         }
-
-    def _format_sse(self, event_type: str, data: Dict[str, Any]) -> str:
-        """Format Server-Sent Event"""
-        return f"event: {event_type}\ndata: {json.dumps(data)}\n\n"
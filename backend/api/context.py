@@ -0,0 +1,246 @@
+"""
+Context assembly for retrieved knowledge base articles.
+Filters by distance, removes duplicate articles and fits the rest into a
+per-model token budget, trimming long articles to their most relevant span.
+"""
+import hashlib
+from typing import List, Dict, Any, Optional, Set
+
+from vector_db.chunking import group_by_article, estimate_tokens
+from .intent import tokenize, STOPWORDS
+from .cache import normalize_text
+
+
+def parse_budgets(spec: str) -> Dict[str, int]:
+    """Parse 'model-prefix=tokens,...' into a dict"""
+    budgets = {}
+    for item in (spec or "").split(","):
+        if "=" in item:
+            model, tokens = item.split("=", 1)
+            budgets[model.strip()] = int(tokens)
+    return budgets
+
+
+def merge_passages(passages: List[Dict[str, Any]]) -> str:
+    """
+    Join an article's passages in reading order. Neighbouring chunks repeat
+    the end of the previous chunk, which is removed; gaps are marked with [...].
+    """
+    merged = ""
+    previous_index = None
+    for passage in passages:
+        text = passage["text"]
+        index = passage.get("chunk_index", 0)
+        if previous_index is None:
+            merged = text
+        elif index == previous_index + 1:
+            overlap = _overlap_length(merged, text)
+            merged = f"{merged}\n{text[overlap:].lstrip()}" if overlap < len(text) else merged
+        else:
+            merged = f"{merged}\n[...]\n{text}"
+        previous_index = index
+    return merged
+
+
+def _overlap_length(previous: str, text: str, max_overlap: int = 400) -> int:
+    for size in range(min(len(previous), len(text), max_overlap), 19, -1):
+        if previous.endswith(text[:size]):
+            return size
+    return 0
+
+
+def shingles(text: str, size: int = 5) -> Set[int]:
+    """Hashed word n-grams used for near-duplicate detection"""
+    words = normalize_text(text).split()
+    if len(words) < size:
+        return {hash(" ".join(words))} if words else set()
+    return {hash(" ".join(words[i:i + size])) for i in range(len(words) - size + 1)}
+
+
+def jaccard(a: Set[int], b: Set[int]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _query_stems(query: str) -> Set[str]:
+    return {w[:5] for w in tokenize(query or "") if w not in STOPWORDS and len(w) > 2}
+
+
+def most_relevant_span(text: str, query: str, max_tokens: int) -> str:
+    """
+    Trim text to the window of consecutive lines that mentions the most query
+    terms within max_tokens. Cut-off ends are marked with [...].
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    max_chars = max_tokens * 4
+    lines = text.split("\n")
+    stems = _query_stems(query)
+    scores = [sum(1 for w in tokenize(line) if w[:5] in stems) for line in lines]
+
+    # Sliding window over lines maximizing the query term hits
+    best_start, best_end, best_score = 0, 0, -1
+    start = 0
+    size = 0
+    score = 0
+    for end, line in enumerate(lines):
+        size += len(line) + 1
+        score += scores[end]
+        while size > max_chars and start < end:
+            size -= len(lines[start]) + 1
+            score -= scores[start]
+            start += 1
+        if score > best_score:
+            best_start, best_end, best_score = start, end, score
+
+    span = "\n".join(lines[best_start:best_end + 1])
+    if len(span) > max_chars:
+        span = span[:max_chars].rsplit(" ", 1)[0]
+        trimmed_end = True
+    else:
+        trimmed_end = best_end < len(lines) - 1
+
+    if best_start > 0:
+        span = f"[...] {span}"
+    if trimmed_end:
+        span = f"{span} [...]"
+    return span
+
+
+class ContextBuilder:
+    """Turns vector search results into the knowledge base section of the system prompt"""
+
+    header = "# Relevant Knowledge Base Articles\n"
+
+    def __init__(
+        self,
+        default_budget: int = 2000,
+        model_budgets: Optional[Dict[str, int]] = None,
+        max_distance: Optional[float] = None,
+        duplicate_similarity: float = 0.8,
+        min_article_tokens: int = 50
+    ):
+        self.default_budget = default_budget
+        self.model_budgets = model_budgets or {}
+        self.max_distance = max_distance
+        self.duplicate_similarity = duplicate_similarity
+        self.min_article_tokens = min_article_tokens
+
+    def budget_for(self, model: Optional[str]) -> int:
+        """Token budget for a model (longest matching prefix, else the default)"""
+        matches = [prefix for prefix in self.model_budgets if model and model.startswith(prefix)]
+        if not matches:
+            return self.default_budget
+        return self.model_budgets[max(matches, key=len)]
+
+    def assemble(self, vector_results: Dict[str, Any], model: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Select, dedupe and trim retrieved articles.
+
+        Args:
+            vector_results: Result of VectorDBClient.search
+            model: Model id used to pick the token budget
+
+        Returns:
+            Dict with 'text' (context string, may be empty), 'tokens', and the
+            number of articles used / dropped by distance / dropped as
+            duplicates / dropped for lack of budget
+        """
+        stats = {"text": "", "tokens": 0, "articles_used": 0,
+                 "dropped_distance": 0, "dropped_duplicates": 0, "dropped_budget": 0}
+
+        if not vector_results or not vector_results.get("documents"):
+            return stats
+
+        articles = vector_results.get("articles")
+        if articles is None:
+            articles = group_by_article(
+                vector_results.get("documents", [[]])[0],
+                vector_results.get("metadatas", [[]])[0],
+                vector_results.get("distances", [[]])[0]
+            )
+
+        # Distance threshold
+        if self.max_distance is not None:
+            close = [a for a in articles if a.get("distance") is None or a["distance"] <= self.max_distance]
+            stats["dropped_distance"] = len(articles) - len(close)
+            articles = close
+
+        # Exact and near-duplicate articles (results are best first, keep the first)
+        unique = []
+        seen_hashes = set()
+        seen_shingles: List[Set[int]] = []
+        for article in articles:
+            text = merge_passages(article["passages"])
+            digest = hashlib.md5(normalize_text(text).encode()).hexdigest()
+            article_shingles = shingles(text)
+            if digest in seen_hashes or any(
+                jaccard(article_shingles, other) >= self.duplicate_similarity for other in seen_shingles
+            ):
+                stats["dropped_duplicates"] += 1
+                continue
+            seen_hashes.add(digest)
+            seen_shingles.append(article_shingles)
+            unique.append({**article, "text": text})
+
+        if not unique:
+            return stats
+
+        # Headers are always included; their cost comes out of the budget first
+        for article in unique:
+            lines = []
+            if article.get("title"):
+                lines.append(f"Title: {article['title']}")
+            if article.get("url"):
+                lines.append(f"Source: {article['url']}")
+            article["header"] = "\n".join(lines)
+
+        budget = self.budget_for(model) - estimate_tokens(self.header)
+
+        # Admit articles in rank order while each can still get its header and
+        # at least min_article_tokens of text (shorter articles: all of it);
+        # lower-ranked articles that no longer fit are dropped
+        admitted = []
+        reserved = 0
+        for article in unique:
+            article["tokens"] = estimate_tokens(article["text"])
+            header_cost = estimate_tokens(article["header"]) + 6
+            minimum = min(article["tokens"], self.min_article_tokens)
+            if header_cost + minimum > budget - reserved:
+                break
+            budget -= header_cost
+            reserved += minimum
+            admitted.append(article)
+        stats["dropped_budget"] = len(unique) - len(admitted)
+
+        # Water-filling: short articles keep their full text, the rest of the
+        # budget is shared evenly among the longer ones. The minimums fit, so
+        # every share is at least min_article_tokens
+        allowances = {}
+        remaining = budget
+        by_length = sorted(range(len(admitted)), key=lambda i: admitted[i]["tokens"])
+        for position, i in enumerate(by_length):
+            share = remaining // (len(admitted) - position)
+            allowances[i] = min(admitted[i]["tokens"], share)
+            remaining -= allowances[i]
+
+        query = vector_results.get("query", "")
+        parts = [self.header]
+        used = 0
+        for i, article in enumerate(admitted):
+            used += 1
+            body = most_relevant_span(article["text"], query, allowances[i])
+            parts.append(f"\n## Article {used}")
+            if article["header"]:
+                parts.append(article["header"])
+            parts.append(f"\n{body}\n")
+
+        if used == 0:
+            return stats
+
+        stats["text"] = "\n".join(parts)
+        stats["tokens"] = estimate_tokens(stats["text"])
+        stats["articles_used"] = used
+        return stats
@@ -0,0 +1,78 @@
+"""
+Typed events of a chat turn.
+
+ChatService.stream_events yields ChatEvent objects: retrieval emits
+tool_call_start / tool_call_end, the provider streams emit reasoning, content,
+usage (token counts, prompt cache hits included) and done, and any stage may
+emit error. With timing requested, a timing event with per-stage latencies
+precedes done. Consumers work on the events directly;
+only the HTTP edge encodes them as Server-Sent Events (streaming.SSEStream),
+and non-streaming responses are collected from them (collect_response).
+"""
+import json
+from typing import Dict, Any, AsyncIterator
+
+
+# Event types
+CONTENT = "content"
+REASONING = "reasoning"
+TOOL_CALL_START = "tool_call_start"
+TOOL_CALL_END = "tool_call_end"
+USAGE = "usage"
+TIMING = "timing"
+DONE = "done"
+ERROR = "error"
+
+
+class ChatEvent:
+    """One event of a chat turn: a type and a JSON-serializable payload"""
+
+    __slots__ = ("type", "data")
+
+    def __init__(self, type: str, data: Dict[str, Any] = None):
+        self.type = type
+        self.data = data if data is not None else {}
+
+    def __repr__(self) -> str:
+        return f"ChatEvent({self.type!r}, {self.data!r})"
+
+    def to_sse(self) -> str:
+        """Format as a Server-Sent Event"""
+        return f"event: {self.type}\ndata: {json.dumps(self.data)}\n\n"
+
+
+async def collect_response(events: AsyncIterator[ChatEvent]) -> Dict[str, Any]:
+    """
+    Build a non-streaming chat response from an event stream.
+
+    Returns:
+        Dict with the full 'content', the 'tool_calls' (tool_call_end payloads)
+        'reasoning' (None if the model sent none), the token 'usage'
+        (None if the provider reported none) and, if requested, the 'timing'
+        payload
+    """
+    parts = []
+    tool_calls = []
+    reasoning = ""
+    usage = None
+    timing = None
+
+    async for event in events:
+        if event.type == CONTENT:
+            parts.append(event.data.get("delta") or "")
+        elif event.type == TOOL_CALL_END:
+            tool_calls.append(event.data)
+        elif event.type == REASONING:
+            reasoning = event.data.get("content", "")
+        elif event.type == USAGE:
+            usage = event.data
+        elif event.type == TIMING:
+            timing = event.data
+
+    return {
+        "content": "".join(parts),
+        "tool_calls": tool_calls,
+        "reasoning": reasoning if reasoning else None,
+        "usage": usage,
+        **({"timing": timing} if timing is not None else {})
+    }
@@ -0,0 +1,223 @@
+"""
+Intent classification for the chat pipeline.
+Decides locally whether a knowledge base search is needed and only falls back
+to the LLM intent analysis when the local classifiers are unsure.
+"""
+import re
+from typing import List, Dict, Any, Optional, Callable, Awaitable
+
+
+# Words that carry no search intent on their own (German + a few English)
+SMALLTALK_WORDS = {
+    "hallo", "hi", "hey", "moin", "servus", "guten", "gute", "tag", "morgen", "abend",
+    "nacht", "danke", "dankeschön", "vielen", "dank", "besten", "tschüss", "ciao",
+    "ok", "okay", "super", "prima", "toll", "alles", "klar", "ja", "nein", "bye",
+    "thanks", "thank", "you", "hello", "perfekt", "gut", "schön", "bitte",
+}
+
+STOPWORDS = {
+    "ich", "mein", "meine", "meinen", "meinem", "meiner", "mir", "mich", "wir", "uns",
+    "unser", "unsere", "du", "dein", "deine", "sie", "ihr", "ihre", "ihren", "er",
+    "wie", "was", "wo", "wann", "warum", "wieso", "weshalb", "wer", "welche", "welcher",
+    "welches", "woher", "wohin", "kann", "könnte", "können", "kannst", "muss", "müssen",
+    "soll", "sollte", "darf", "will", "möchte", "würde", "ist", "sind", "war", "bin",
+    "bist", "habe", "hat", "haben", "hatte", "wird", "werden", "der", "die", "das",
+    "den", "dem", "des", "ein", "eine", "einen", "einem", "einer", "und", "oder", "aber",
+    "mit", "für", "zu", "zum", "zur", "auf", "in", "im", "an", "am", "bei", "von", "vom",
+    "aus", "nach", "über", "um", "es", "nicht", "kein", "keine", "bitte", "noch", "schon",
+    "auch", "mal", "denn", "doch", "so", "nur", "man", "gibt", "geht", "the", "a", "is",
+    "how", "what", "do", "my", "i", "can",
+}
+
+# References that only make sense with the earlier conversation
+ANAPHORA_WORDS = {
+    "das", "dies", "diese", "dieser", "dieses", "es", "dafür", "dazu", "damit",
+    "davon", "darauf", "dabei", "dort", "dann", "ihn", "ihm", "it", "that",
+}
+CONJUNCTION_STARTS = {"und", "aber", "also", "oder", "and", "but"}
+
+KEYBOARD_ROWS = ("qwertzuiopü", "asdfghjklöä", "yxcvbnm", "qwertyuiop", "zxcvbnm")
+VOWELS = set("aeiouäöüy")
+# Shorter keyboard runs and vowel-less words are often real terms ("Wert", "http")
+MIN_GIBBERISH_LENGTH = 5
+
+
+def last_user_message(messages: List[Dict[str, str]]) -> Optional[str]:
+    """Get the content of the most recent non-empty user message"""
+    for msg in reversed(messages):
+        if msg.get("role") == "user" and msg.get("content", "").strip():
+            return msg["content"].strip()
+    return None
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens"""
+    return re.findall(r"\w+", text.lower())
+
+
+def is_gibberish_word(word: str, known_word: Optional[Callable[[str], bool]] = None) -> bool:
+    """
+    Keyboard mashing ("asdfgh") or a vowel-less letter string ("xkcdq").
+    Acronyms in capitals (VDSL, HTTP), words with digits and words that occur
+    in the corpus (known_word) never count.
+    """
+    if len(word) < MIN_GIBBERISH_LENGTH or any(ch.isdigit() for ch in word) or word.isupper():
+        return False
+    lower = word.lower()
+    if VOWELS & set(lower) and not any(lower in row for row in KEYBOARD_ROWS):
+        return False
+    return not (known_word and known_word(lower))
+
+
+def is_follow_up(messages: List[Dict[str, str]], words: List[str]) -> bool:
+    """
+    Check whether the last user message depends on earlier turns, e.g.
+    "und was kostet das?" after a conversation about a technician visit.
+    """
+    has_history = any(msg.get("role") == "assistant" for msg in messages)
+    if not has_history:
+        return False
+
+    content_words = [w for w in words if w not in STOPWORDS]
+    return (
+        len(content_words) < 3
+        or words[0] in CONJUNCTION_STARTS
+        or any(w in ANAPHORA_WORDS for w in words)
+    )
+
+
+def _search(query: str, source: str) -> Dict[str, Any]:
+    return {"needs_search": True, "query": query, "source": source}
+
+
+def _skip(reason: str, source: str) -> Dict[str, Any]:
+    return {"needs_search": False, "query": None, "reason": reason, "source": source}
+
+
+class RuleIntentClassifier:
+    """
+    Heuristic classifier for clear-cut turns: greetings, gibberish, single
+    vague words and self-contained questions. Runs in well under a millisecond.
+    """
+
+    name = "rules"
+
+    def __init__(self, known_word: Optional[Callable[[str], bool]] = None):
+        # Corpus vocabulary lookup, so product terms are never taken for gibberish
+        self.known_word = known_word
+
+    async def classify(
+        self,
+        messages: List[Dict[str, str]],
+        neighbours: Optional[Callable[[], Awaitable[Dict[str, Any]]]] = None
+    ) -> Optional[Dict[str, Any]]:
+        text = last_user_message(messages)
+        if not text:
+            return _skip("Keine Nutzernachricht", self.name)
+
+        words = tokenize(text)
+        if not words:
+            return _skip("Keine erkennbare Anfrage", self.name)
+
+        if all(w in SMALLTALK_WORDS for w in words):
+            return _skip("Begrüßung oder Smalltalk", self.name)
+
+        # Case matters here (acronyms), so use the original tokens
+        if sum(is_gibberish_word(w, self.known_word) for w in re.findall(r"\w+", text)) * 2 > len(words):
+            return _skip("Keine erkennbare Anfrage", self.name)
+
+        # Follow-ups need the conversation to build a query
+        if is_follow_up(messages, words):
+            return None
+
+        content_words = [w for w in words if w not in STOPWORDS and w not in SMALLTALK_WORDS]
+        if len(content_words) <= 1:
+            return _skip("Anliegen zu vage, Klärungsfrage nötig", self.name)
+        if len(content_words) >= 3:
+            return _search(text, self.name)
+
+        return None
+
+
+class EmbeddingIntentClassifier:
+    """
+    Nearest-neighbour classifier: searches when the message lies close to an
+    existing article embedding. Leaves follow-ups and distant messages undecided.
+    """
+
+    name = "embedding"
+
+    def __init__(self, vector_db, max_distance: float = 1.0):
+        self.vector_db = vector_db
+        self.max_distance = max_distance
+
+    async def classify(
+        self,
+        messages: List[Dict[str, str]],
+        neighbours: Optional[Callable[[], Awaitable[Dict[str, Any]]]] = None
+    ) -> Optional[Dict[str, Any]]:
+        text = last_user_message(messages)
+        if not text:
+            return None
+
+        words = tokenize(text)
+        if not words or is_follow_up(messages, words):
+            return None
+
+        if neighbours is not None:
+            results = await neighbours()
+        elif self.vector_db is not None:
+            results = await self.vector_db.search_async(text, n_results=1)
+        else:
+            return None
+
+        # Passages found only by the lexical index carry no distance
+        distances = [d for d in (results.get("distances") or [[]])[0] if d is not None]
+        if distances and min(distances) <= self.max_distance:
+            return _search(text, self.name)
+
+        return None
+
+
+class IntentEngine:
+    """
+    Runs intent classifiers in order and returns the first decision.
+    The fallback (the LLM analysis) is only called when every classifier is unsure.
+    """
+
+    def __init__(
+        self,
+        classifiers: List[Any],
+        fallback: Callable[[List[Dict[str, str]]], Awaitable[Dict[str, Any]]]
+    ):
+        self.classifiers = classifiers
+        self.fallback = fallback
+        self.decisions: Dict[str, int] = {c.name: 0 for c in classifiers}
+        self.decisions["llm"] = 0
+
+    async def analyze(
+        self,
+        messages: List[Dict[str, str]],
+        neighbours: Optional[Callable[[], Awaitable[Dict[str, Any]]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Decide whether a vector DB lookup is needed.
+
+        Args:
+            messages: Conversation messages
+            neighbours: Optional coroutine function returning search results for
+                the last user message (lets callers reuse a running search)
+
+        Returns:
+            Dict with 'needs_search', 'query', optional 'reason' and 'source'
+        """
+        for classifier in self.classifiers:
+            result = await classifier.classify(messages, neighbours)
+            if result is not None:
+                self.decisions[classifier.name] += 1
+                return result
+
+        self.decisions["llm"] += 1
+        result = await self.fallback(messages)
+        result["source"] = "llm"
+        return result
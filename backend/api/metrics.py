@@ -0,0 +1,211 @@
+"""
+Per-stage latency metrics for chat turns, in the Prometheus text format.
+
+A chat turn goes through intent analysis, retrieval (query embedding plus
+vector search) and generation. TurnMetrics follows one turn's event stream
+and records, labelled by model and prompt id:
+
+    chat_intent_seconds               intent analysis (also by decision source)
+    chat_retrieval_seconds            embedding + vector search
+    chat_time_to_first_token_seconds  turn start to first content delta
+    chat_output_tokens_per_second     output tokens / generation time
+    chat_duration_seconds             turn start to last event
+    chat_errors_total                 error events, by the stage that failed
+
+Model labels are limited to the known models (anything else is "other") and
+prompt ids to the prompt actually used, so clients can't add series at will.
+Metrics are kept in memory and rendered by ChatMetrics.render() for the
+/metrics endpoint; nothing is measured while they are disabled.
+"""
+import time
+from bisect import bisect_left
+from typing import Dict, Any, AsyncIterator, Iterable, List, Optional, Tuple
+
+from .events import ChatEvent, CONTENT, USAGE, DONE, ERROR, TIMING
+
+
+# Upper bounds in seconds; stage latencies span ~1 ms (cached intent) to minutes (long answers)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+RATE_BUCKETS = (5, 10, 20, 30, 50, 75, 100, 150, 200, 300)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """A monotonically increasing count per label set"""
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...]):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1.0):
+        self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for values, count in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labels, values)} {count!r}")
+        return lines
+
+
+class Histogram:
+    """Bucketed observations per label set"""
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...], buckets: Tuple[float, ...]):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.buckets = buckets
+        # label values -> [per-bucket counts (last = +Inf), sum]
+        self._series: Dict[Tuple[str, ...], List[Any]] = {}
+
+    def observe(self, value: float, *label_values: str):
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for values, (counts, total) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                bucket_labels = _format_labels(self.labels, values, f'le="{le}"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            label_text = _format_labels(self.labels, values)
+            lines.append(f"{self.name}_sum{label_text} {total!r}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+class ChatMetrics:
+    """Chat turn metrics, shared by all turns of a ChatService"""
+
+    def __init__(self, enabled: bool = True, models: Iterable[str] = ()):
+        self.enabled = enabled
+        self.models = frozenset(models)
+        labels = ("model", "prompt_id")
+        self.intent = Histogram(
+            "chat_intent_seconds", "Intent analysis time", labels + ("source",), LATENCY_BUCKETS)
+        self.retrieval = Histogram(
+            "chat_retrieval_seconds", "Query embedding and vector search time", labels, LATENCY_BUCKETS)
+        self.ttft = Histogram(
+            "chat_time_to_first_token_seconds", "Time from turn start to the first content delta",
+            labels, LATENCY_BUCKETS)
+        self.tokens_per_second = Histogram(
+            "chat_output_tokens_per_second", "Output tokens per second of generation", labels, RATE_BUCKETS)
+        self.duration = Histogram(
+            "chat_duration_seconds", "Total chat turn duration", labels, LATENCY_BUCKETS)
+        self.errors = Counter(
+            "chat_errors_total", "Failed chat turns and intent calls by stage "
+            "(intent and generate are upstream provider errors)", labels + ("stage",))
+
+    def model_label(self, model: str) -> str:
+        """The model as a label value: known models by id, anything else as 'other'"""
+        return model if model in self.models else "other"
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        for metric in (self.intent, self.retrieval, self.ttft, self.tokens_per_second, self.duration, self.errors):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class TurnMetrics:
+    """
+    Stage timings of one chat turn.
+
+    The chat service writes stage results into `stages` as the turn
+    progresses; observe() times the event stream itself (first token, tokens,
+    end) and records everything into ChatMetrics when the stream ends.
+    """
+
+    def __init__(self, metrics: Optional[ChatMetrics], model: str, prompt_id: str, timing_event: bool = False):
+        self.metrics = metrics
+        self.model = model
+        self.timing_event = timing_event
+        self.start = time.perf_counter()
+        # Filled in by the chat service: prompt_id (resolved), stage, intent_ms,
+        # intent_source, intent_error, search_ms
+        self.stages: Dict[str, Any] = {"prompt_id": prompt_id, "stage": "prompt"}
+        self.first_token: Optional[float] = None
+        self.content_events = 0
+        self.output_tokens: Optional[int] = None
+
+    async def observe(self, events: AsyncIterator[ChatEvent]) -> AsyncIterator[ChatEvent]:
+        """Pass a turn's events through, timing them; adds a timing event before done if requested"""
+        failed = False
+        completed = False
+        try:
+            async for event in events:
+                if event.type == CONTENT:
+                    if self.first_token is None:
+                        self.first_token = time.perf_counter()
+                    self.content_events += 1
+                elif event.type == USAGE:
+                    self.output_tokens = event.data.get("output_tokens")
+                elif event.type == ERROR:
+                    failed = True
+                elif event.type == DONE:
+                    completed = True
+                    if self.timing_event:
+                        yield ChatEvent(TIMING, self.timing())
+                yield event
+        finally:
+            # Client went away mid-stream: close the turn too
+            if hasattr(events, "aclose"):
+                await events.aclose()
+            if self.metrics is not None:
+                self.record(failed, completed)
+
+    def timing(self) -> Dict[str, Any]:
+        """Stage timings so far, in milliseconds"""
+        now = time.perf_counter()
+        tokens = self.output_tokens if self.output_tokens is not None else self.content_events
+        timing = {
+            "intent_ms": round(self.stages["intent_ms"], 1) if "intent_ms" in self.stages else None,
+            "search_ms": round(self.stages["search_ms"], 1) if "search_ms" in self.stages else None,
+            "ttft_ms": round((self.first_token - self.start) * 1000, 1) if self.first_token else None,
+            "total_ms": round((now - self.start) * 1000, 1),
+            "output_tokens": tokens,
+        }
+        if self.first_token and now > self.first_token:
+            timing["tokens_per_s"] = round(tokens / (now - self.first_token), 1)
+        return timing
+
+    def record(self, failed: bool, completed: bool):
+        metrics = self.metrics
+        end = time.perf_counter()
+        stages = self.stages
+        labels = (metrics.model_label(self.model), stages["prompt_id"])
+
+        if "intent_ms" in stages:
+            metrics.intent.observe(stages["intent_ms"] / 1000, *labels, stages.get("intent_source") or "unknown")
+        if stages.get("intent_error"):
+            metrics.errors.inc(*labels, "intent")
+        if "search_ms" in stages:
+            metrics.retrieval.observe(stages["search_ms"] / 1000, *labels)
+        if self.first_token is not None:
+            metrics.ttft.observe(self.first_token - self.start, *labels)
+            tokens = self.output_tokens if self.output_tokens is not None else self.content_events
+            # An aborted stream says nothing about generation speed
+            if completed and tokens and end > self.first_token:
+                metrics.tokens_per_second.observe(tokens / (end - self.first_token), *labels)
+        metrics.duration.observe(end - self.start, *labels)
+        if failed:
+            metrics.errors.inc(*labels, stages["stage"])
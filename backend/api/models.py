@@ -0,0 +1,77 @@
+"""
+Chat models offered by the API, with their default and configurable parameters.
+"""
+from typing import Dict, Any, List
+
+
+MODELS: List[Dict[str, Any]] = [
+    {
+        "id": "gpt-4o",
+        "name": "GPT-4o",
+        "provider": "openai",
+        "supports_streaming": True,
+        "default_config": {}
+    },
+    {
+        "id": "gpt-4o-mini",
+        "name": "GPT-4o Mini",
+        "provider": "openai",
+        "supports_streaming": True,
+        "default_config": {}
+    },
+    {
+        "id": "o1",
+        "name": "GPT-5 (o1)",
+        "provider": "openai",
+        "supports_streaming": False,
+        "default_config": {
+            "max_completion_tokens": 8000,
+            "reasoning_effort": "medium"
+        },
+        "config_options": {
+            "reasoning_effort": {
+                "type": "select",
+                "options": ["low", "medium", "high"],
+                "description": "Thinking time for reasoning tasks"
+            }
+        }
+    },
+    {
+        "id": "o1-mini",
+        "name": "GPT-5 Mini (o1-mini)",
+        "provider": "openai",
+        "supports_streaming": False,
+        "default_config": {
+            "max_completion_tokens": 8000,
+            "reasoning_effort": "medium"
+        },
+        "config_options": {
+            "reasoning_effort": {
+                "type": "select",
+                "options": ["low", "medium", "high"],
+                "description": "Thinking time for reasoning tasks"
+            }
+        }
+    },
+    {
+        "id": "claude-sonnet-4-20250514",
+        "name": "Claude Sonnet 4",
+        "provider": "anthropic",
+        "supports_streaming": True,
+        "default_config": {
+            "max_tokens": 8192
+        }
+    },
+    {
+        "id": "claude-opus-4-20250514",
+        "name": "Claude Opus 4",
+        "provider": "anthropic",
+        "supports_streaming": True,
+        "default_config": {
+            "max_tokens": 8192
+        }
+    }
+]
+
+# Ids of the offered models
+MODEL_IDS = frozenset(model["id"] for model in MODELS)
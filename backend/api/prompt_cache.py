@@ -0,0 +1,41 @@
+"""
+Token usage of provider responses, normalized across providers.
+
+Both providers cache prompt prefixes: OpenAI automatically for prompts of
+1024+ tokens, Anthropic up to explicit cache_control breakpoints. They report
+the cached share of a prompt differently; these helpers map their usage
+objects to one shape:
+
+    input_tokens        all prompt tokens, cached ones included
+    output_tokens       completion tokens
+    cache_read_tokens   prompt tokens served from the provider's cache
+    cache_write_tokens  prompt tokens written to the cache (Anthropic only)
+"""
+from typing import Any, Dict
+
+
+def _count(value: Any) -> int:
+    return int(value or 0)
+
+
+def openai_usage(usage: Any) -> Dict[str, int]:
+    """Normalize an OpenAI CompletionUsage (cached tokens are part of prompt_tokens)"""
+    details = getattr(usage, "prompt_tokens_details", None)
+    return {
+        "input_tokens": _count(getattr(usage, "prompt_tokens", 0)),
+        "output_tokens": _count(getattr(usage, "completion_tokens", 0)),
+        "cache_read_tokens": _count(getattr(details, "cached_tokens", 0)),
+        "cache_write_tokens": 0,
+    }
+
+
+def anthropic_usage(usage: Any) -> Dict[str, int]:
+    """Normalize an Anthropic Usage (input_tokens excludes cache reads and writes)"""
+    cache_read = _count(getattr(usage, "cache_read_input_tokens", 0))
+    cache_write = _count(getattr(usage, "cache_creation_input_tokens", 0))
+    return {
+        "input_tokens": _count(getattr(usage, "input_tokens", 0)) + cache_read + cache_write,
+        "output_tokens": _count(getattr(usage, "output_tokens", 0)),
+        "cache_read_tokens": cache_read,
+        "cache_write_tokens": cache_write,
+    }
@@ -0,0 +1,153 @@
+"""
+Versioned, content-addressed prompt history.
+
+Every saved prompt configuration becomes an immutable snapshot named by the
+hash of its content (timestamps and version fields excluded), so identical
+configurations share one snapshot and the hash is a stable cache key. Each
+prompt id has an append-only version log mapping version numbers to hashes.
+
+Layout under the history directory:
+    objects/{hash}.json   snapshot content, written once
+    {prompt_id}.jsonl     one {"version", "hash", "saved_at"} line per version
+
+Everything is loaded into memory when the store is opened; lookups by
+(id, version), by hash and of the latest version never touch the disk.
+"""
+import hashlib
+import json
+import os
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+
+# Bookkeeping fields that do not change what a prompt does
+UNHASHED_FIELDS = ("created_at", "updated_at", "version", "hash")
+
+
+def prompt_content(config: Dict[str, Any]) -> Dict[str, Any]:
+    """The part of a configuration that is versioned and hashed"""
+    return {k: v for k, v in config.items() if k not in UNHASHED_FIELDS}
+
+
+def prompt_hash(config: Dict[str, Any]) -> str:
+    """Stable SHA-256 of a configuration's content (key order does not matter)"""
+    canonical = json.dumps(prompt_content(config), sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class PromptStore:
+    """Immutable prompt snapshots with an in-memory (id, version) index"""
+
+    def __init__(self, history_dir):
+        self.history_dir = Path(history_dir)
+        self.objects_dir = self.history_dir / "objects"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+
+        # hash -> snapshot content; prompt id -> version log (index = version - 1)
+        self._snapshots: Dict[str, Dict[str, Any]] = {}
+        self._versions: Dict[str, List[Dict[str, Any]]] = {}
+        self._load()
+
+    def _load(self):
+        for log_file in self.history_dir.glob("*.jsonl"):
+            entries = []
+            with open(log_file, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # Line torn by a crash mid-append
+                        continue
+                    if entry.get("version") == len(entries) + 1 and self._read_snapshot(entry["hash"]):
+                        entries.append(entry)
+            if entries:
+                self._versions[log_file.stem] = entries
+
+    def _read_snapshot(self, digest: str) -> Optional[Dict[str, Any]]:
+        if digest not in self._snapshots:
+            try:
+                with open(self.objects_dir / f"{digest}.json", "r", encoding="utf-8") as f:
+                    self._snapshots[digest] = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Error loading prompt snapshot {digest}: {e}")
+                return None
+        return self._snapshots[digest]
+
+    def commit(self, prompt_id: str, config: Dict[str, Any]) -> Tuple[int, str]:
+        """
+        Record a configuration as the latest version of a prompt.
+
+        Saving content identical to the latest version creates no new version.
+
+        Returns:
+            (version, hash) of the latest version
+        """
+        digest = prompt_hash(config)
+        entries = self._versions.setdefault(prompt_id, [])
+        if entries and entries[-1]["hash"] == digest:
+            return entries[-1]["version"], digest
+
+        if digest not in self._snapshots:
+            self._write_snapshot(digest, prompt_content(config))
+
+        entry = {"version": len(entries) + 1, "hash": digest, "saved_at": datetime.now().isoformat()}
+        log_file = self.history_dir / f"{prompt_id}.jsonl"
+        with open(log_file, "a", encoding="utf-8") as f:
+            # Terminate a line torn by a crash so the new entry stays readable
+            if f.tell():
+                with open(log_file, "rb") as tail:
+                    tail.seek(-1, os.SEEK_END)
+                    if tail.read(1) != b"\n":
+                        f.write("\n")
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        entries.append(entry)
+        return entry["version"], digest
+
+    def _write_snapshot(self, digest: str, content: Dict[str, Any]):
+        path = self.objects_dir / f"{digest}.json"
+        if not path.exists():
+            fd, tmp_path = tempfile.mkstemp(dir=self.objects_dir, prefix=f".{digest[:12]}-")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(content, f, indent=2, ensure_ascii=False)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, path)
+            except Exception:
+                os.unlink(tmp_path)
+                raise
+        self._snapshots[digest] = content
+
+    def _resolve(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """A copy of a snapshot with its version metadata"""
+        return {
+            **self._snapshots[entry["hash"]],
+            "version": entry["version"],
+            "hash": entry["hash"],
+            "updated_at": entry["saved_at"],
+        }
+
+    def get(self, prompt_id: str, version: int) -> Optional[Dict[str, Any]]:
+        """A specific version of a prompt, or None"""
+        entries = self._versions.get(prompt_id)
+        if not entries or not 1 <= version <= len(entries):
+            return None
+        return self._resolve(entries[version - 1])
+
+    def latest(self, prompt_id: str) -> Optional[Dict[str, Any]]:
+        """The latest version of a prompt, or None"""
+        entries = self._versions.get(prompt_id)
+        return self._resolve(entries[-1]) if entries else None
+
+    def by_hash(self, digest: str) -> Optional[Dict[str, Any]]:
+        """Snapshot content by hash, or None"""
+        snapshot = self._snapshots.get(digest)
+        return {**snapshot, "hash": digest} if snapshot is not None else None
+
+    def versions(self, prompt_id: str) -> List[Dict[str, Any]]:
+        """Version log of a prompt, oldest first"""
+        return [dict(entry) for entry in self._versions.get(prompt_id, [])]
@@ -1,19 +1,35 @@
 """
 Prompt configuration management.
 Handles loading, saving, and versioning of prompt configurations as JSON files.
+Every save is also recorded as an immutable snapshot (see prompt_store.py).
 """
 import json
 import os
+import tempfile
+import threading
+import time
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 from datetime import datetime
+from .prompt_store import PromptStore, prompt_content
 from .prompts_examples import EXAMPLE_PROMPTS
 
 
 class PromptManager:
-    """Manages prompt configurations stored as JSON files"""
+    """
+    Manages prompt configurations stored as JSON files.
 
-    def __init__(self, prompts_dir: str = None):
+    All prompts are loaded once and served from memory. The directory is
+    re-scanned (file mtimes and sizes) at most every `poll_interval` seconds,
+    so edits made outside the API are picked up without reading every file
+    on each request. Writes go to a temp file that is renamed into place.
+
+    prompts/{id}.json holds the latest version; every distinct configuration
+    saved (or edited on disk) is kept as a numbered, immutable version in
+    prompts/.history, so a version can be pinned with get_prompt(id, version).
+    """
+
+    def __init__(self, prompts_dir: str = None, poll_interval: float = None):
         if prompts_dir is None:
             # Default to project's prompts directory
             base_dir = Path(__file__).parent.parent.parent
@@ -22,8 +38,26 @@ class PromptManager:
         self.prompts_dir = Path(prompts_dir)
         self.prompts_dir.mkdir(parents=True, exist_ok=True)
 
+        # Bumped on every save/delete so caches can detect prompt changes
+        self.version = 0
+
+        # Seconds between directory scans for changes made outside the API
+        # (0 = scan on every read)
+        if poll_interval is None:
+            poll_interval = float(os.getenv("PROMPT_POLL_INTERVAL", "2"))
+        self.poll_interval = poll_interval
+
+        # prompt id -> config, and file name -> (mtime_ns, size) it was read at
+        self._prompts: Dict[str, Dict[str, Any]] = {}
+        self._files: Dict[str, tuple] = {}
+        self._last_scan = 0.0
+        self._lock = threading.RLock()
+        self.store = PromptStore(self.prompts_dir / ".history")
+
+        self.refresh(force=True)
+
         # Initialize with example prompts if none exist
-        if not list(self.prompts_dir.glob("*.json")):
+        if not self._files:
             self._create_example_prompts()
 
     def _create_example_prompts(self):
@@ -33,40 +67,101 @@ class PromptManager:
             prompt["updated_at"] = datetime.now().isoformat()
             self.save_prompt(prompt)
 
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Reload prompt files that were added, changed or removed on disk.
+
+        Args:
+            force: Scan now even if the poll interval has not passed
+
+        Returns:
+            True if the registry changed
+        """
+        now = time.monotonic()
+        if not force and now - self._last_scan < self.poll_interval:
+            return False
+
+        with self._lock:
+            self._last_scan = now
+            seen = {}
+            for entry in os.scandir(self.prompts_dir):
+                if entry.name.endswith(".json") and entry.is_file():
+                    stat = entry.stat()
+                    seen[entry.name] = (stat.st_mtime_ns, stat.st_size)
+
+            changed = False
+            for name in set(self._files) - set(seen):
+                del self._files[name]
+                self._prompts.pop(name[:-len(".json")], None)
+                changed = True
+
+            for name, signature in seen.items():
+                if self._files.get(name) == signature:
+                    continue
+                try:
+                    with open(self.prompts_dir / name, 'r', encoding='utf-8') as f:
+                        prompt = json.load(f)
+                except Exception as e:
+                    print(f"Error loading prompt {name}: {e}")
+                    continue
+                self._files[name] = signature
+                prompt_id = name[:-len(".json")]
+                # Files edited by hand become a new version too
+                prompt["version"], prompt["hash"] = self.store.commit(prompt_id, prompt)
+                self._prompts[prompt_id] = prompt
+                changed = True
+
+            if changed:
+                self.version += 1
+            return changed
+
     def list_prompts(self) -> List[Dict[str, Any]]:
         """List all available prompt configurations"""
-        prompts = []
-
-        for prompt_file in self.prompts_dir.glob("*.json"):
-            try:
-                with open(prompt_file, 'r', encoding='utf-8') as f:
-                    prompt = json.load(f)
-                    prompts.append({
-                        "id": prompt.get("id"),
-                        "name": prompt.get("name"),
-                        "version": prompt.get("version"),
-                        "created_at": prompt.get("created_at"),
-                        "updated_at": prompt.get("updated_at"),
-                        "use_case": prompt.get("use_case"),
-                    })
-            except Exception as e:
-                print(f"Error loading prompt {prompt_file}: {e}")
+        self.refresh()
+        with self._lock:
+            prompts = [
+                {
+                    "id": prompt.get("id"),
+                    "name": prompt.get("name"),
+                    "version": prompt.get("version"),
+                    "created_at": prompt.get("created_at"),
+                    "updated_at": prompt.get("updated_at"),
+                    "use_case": prompt.get("use_case"),
+                }
+                for prompt in self._prompts.values()
+            ]
 
         return sorted(prompts, key=lambda x: x.get("updated_at", ""), reverse=True)
 
-    def get_prompt(self, prompt_id: str) -> Optional[Dict[str, Any]]:
-        """Get a specific prompt configuration"""
-        prompt_file = self.prompts_dir / f"{prompt_id}.json"
+    def get_prompt(self, prompt_id: str, version: int = None) -> Optional[Dict[str, Any]]:
+        """
+        Get a prompt configuration: the latest version, or a pinned one.
 
-        if not prompt_file.exists():
-            return None
+        Args:
+            prompt_id: Prompt id
+            version: Version number (None = latest)
 
-        try:
-            with open(prompt_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"Error loading prompt {prompt_id}: {e}")
-            return None
+        Returns:
+            The configuration including its 'version' and 'hash', or None
+        """
+        if version is not None:
+            with self._lock:
+                return self.store.get(prompt_id, version)
+
+        self.refresh()
+        prompt = self._prompts.get(prompt_id)
+        # Copy so callers can't change the registry's entry
+        return dict(prompt) if prompt is not None else None
+
+    def get_prompt_by_hash(self, prompt_hash: str) -> Optional[Dict[str, Any]]:
+        """Get the prompt configuration snapshot with a given content hash"""
+        with self._lock:
+            return self.store.by_hash(prompt_hash)
+
+    def list_versions(self, prompt_id: str) -> List[Dict[str, Any]]:
+        """List the versions of a prompt ('version', 'hash', 'saved_at'), oldest first"""
+        with self._lock:
+            return self.store.versions(prompt_id)
 
     def save_prompt(self, config: Dict[str, Any]) -> Dict[str, Any]:
         """Save a prompt configuration"""
@@ -74,53 +169,81 @@ class PromptManager:
         if not prompt_id:
             raise ValueError("Prompt configuration must have an 'id' field")
 
-        # Update timestamp
-        existing = self.get_prompt(prompt_id)
-        if existing:
-            config["created_at"] = existing.get("created_at", datetime.now().isoformat())
-        else:
-            config["created_at"] = datetime.now().isoformat()
+        with self._lock:
+            # Update timestamp
+            existing = self._prompts.get(prompt_id)
+            if existing:
+                config["created_at"] = existing.get("created_at", datetime.now().isoformat())
+            else:
+                config["created_at"] = datetime.now().isoformat()
 
-        config["updated_at"] = datetime.now().isoformat()
+            config["updated_at"] = datetime.now().isoformat()
 
-        # Save to file
-        prompt_file = self.prompts_dir / f"{prompt_id}.json"
+            # Snapshot first, so the file always names a version that exists
+            config["version"], config["hash"] = self.store.commit(prompt_id, config)
 
-        try:
-            with open(prompt_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=2, ensure_ascii=False)
+            # Save to file
+            prompt_file = self.prompts_dir / f"{prompt_id}.json"
+
+            try:
+                self._write_atomic(prompt_file, config)
+            except Exception as e:
+                raise Exception(f"Error saving prompt: {e}")
+
+            stat = prompt_file.stat()
+            self._files[prompt_file.name] = (stat.st_mtime_ns, stat.st_size)
+            self._prompts[prompt_id] = dict(config)
+            self.version += 1
 
             return {
                 "status": "saved",
                 "id": prompt_id,
+                "version": config["version"],
+                "hash": config["hash"],
                 "file": str(prompt_file)
             }
-        except Exception as e:
-            raise Exception(f"Error saving prompt: {e}")
+
+    def _write_atomic(self, path: Path, config: Dict[str, Any]):
+        """Write JSON to a temp file and rename it over `path`, so readers never see a partial file"""
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.stem}-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(config, f, indent=2, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
 
     def delete_prompt(self, prompt_id: str) -> bool:
         """Delete a prompt configuration"""
         prompt_file = self.prompts_dir / f"{prompt_id}.json"
 
-        if not prompt_file.exists():
-            return False
+        with self._lock:
+            if not prompt_file.exists():
+                return False
 
-        try:
-            prompt_file.unlink()
+            try:
+                prompt_file.unlink()
+            except Exception as e:
+                print(f"Error deleting prompt {prompt_id}: {e}")
+                return False
+
+            self._files.pop(prompt_file.name, None)
+            self._prompts.pop(prompt_id, None)
+            self.version += 1
             return True
-        except Exception as e:
-            print(f"Error deleting prompt {prompt_id}: {e}")
-            return False
 
-    def duplicate_prompt(self, prompt_id: str, new_id: str) -> Optional[Dict[str, Any]]:
-        """Duplicate an existing prompt with a new ID"""
-        existing = self.get_prompt(prompt_id)
+    def duplicate_prompt(self, prompt_id: str, new_id: str, version: int = None) -> Optional[Dict[str, Any]]:
+        """Duplicate an existing prompt (latest or given version) with a new ID, starting at version 1"""
+        existing = self.get_prompt(prompt_id, version)
 
         if not existing:
             return None
 
-        # Create new config
-        new_config = existing.copy()
+        # Create new config from the content only; it gets its own history
+        new_config = prompt_content(existing)
         new_config["id"] = new_id
         new_config["name"] = f"{existing.get('name', 'Unnamed')} (Copy)"
 
@@ -0,0 +1,168 @@
+"""
+SSE output stage for chat streams: token coalescing and frame statistics.
+
+Providers often deliver one or two characters per delta; sending each as its
+own SSE frame means many tiny writes and per-frame overhead on server and
+browser. SSEStream merges consecutive content deltas and flushes them when
+the oldest buffered delta is `window_ms` old or the buffer reaches
+`max_bytes`. The first content delta and every other event (tool calls,
+reasoning, done, error) are sent at once, after any buffered content.
+The upstream stream is read by one task from start to end and closed when
+the client goes away.
+"""
+import asyncio
+import os
+from typing import Dict, Any, AsyncIterator, List
+
+from .events import ChatEvent, CONTENT
+
+
+# Upstream events read ahead of the consumer; marks the end of the stream
+READ_AHEAD = 64
+_END = object()
+
+
+class SSEStream:
+    """Coalesces content events and encodes chat event streams as SSE"""
+
+    def __init__(self, window_ms: float = None, max_bytes: int = None):
+        if window_ms is None:
+            window_ms = float(os.getenv("SSE_COALESCE_MS", "30"))
+        if max_bytes is None:
+            max_bytes = int(os.getenv("SSE_COALESCE_BYTES", "512"))
+        # 0 ms sends every delta as its own frame
+        self.window = window_ms / 1000
+        self.max_bytes = max_bytes
+
+        self.responses = 0
+        self.frames = 0
+        self.bytes = 0
+        self.content_events = 0
+        self.content_frames = 0
+
+    async def encode(self, events: AsyncIterator[ChatEvent]) -> AsyncIterator[str]:
+        """Coalesce and encode an event stream as Server-Sent Events, for StreamingResponse"""
+        self.responses += 1
+        async for event in self.coalesce(events):
+            frame = event.to_sse()
+            self.frames += 1
+            # json.dumps escapes non-ASCII, so characters are bytes
+            self.bytes += len(frame)
+            if event.type == CONTENT:
+                self.content_frames += 1
+            yield frame
+
+    async def coalesce(self, events: AsyncIterator[ChatEvent]) -> AsyncIterator[ChatEvent]:
+        """Merge consecutive content deltas within the time window / byte threshold"""
+        if self.window <= 0:
+            try:
+                async for event in events:
+                    if event.type == CONTENT:
+                        self.content_events += 1
+                    yield event
+            finally:
+                if hasattr(events, "aclose"):
+                    await events.aclose()
+            return
+
+        loop = asyncio.get_running_loop()
+        # SDK streams must be iterated and closed by the task that opened them,
+        # so one reader task owns the upstream stream from start to end
+        queue: asyncio.Queue = asyncio.Queue(maxsize=READ_AHEAD)
+        reader = asyncio.ensure_future(self._read(events, queue))
+        pending: List[str] = []
+        size = 0
+        deadline = 0.0
+        first = True
+        next_item = None
+
+        try:
+            while True:
+                if next_item is None:
+                    next_item = asyncio.ensure_future(queue.get())
+
+                # With content buffered, wait for the next event only until the window closes
+                if pending:
+                    timeout = deadline - loop.time()
+                    done = ()
+                    if timeout > 0:
+                        done, _ = await asyncio.wait((next_item,), timeout=timeout)
+                    if not done:
+                        yield ChatEvent(CONTENT, {"delta": "".join(pending)})
+                        pending, size = [], 0
+                        continue
+
+                try:
+                    event = await next_item
+                finally:
+                    next_item = None
+                if event is _END:
+                    break
+                if isinstance(event, BaseException):
+                    raise event
+
+                if event.type != CONTENT:
+                    if pending:
+                        yield ChatEvent(CONTENT, {"delta": "".join(pending)})
+                        pending, size = [], 0
+                    yield event
+                    continue
+
+                self.content_events += 1
+                delta = event.data.get("delta") or ""
+                if first:
+                    # The first token goes out at once so time-to-first-token is unchanged
+                    first = False
+                    yield event
+                    continue
+                if not delta:
+                    continue
+
+                if not pending:
+                    deadline = loop.time() + self.window
+                pending.append(delta)
+                size += len(delta.encode("utf-8"))
+                if size >= self.max_bytes:
+                    yield ChatEvent(CONTENT, {"delta": "".join(pending)})
+                    pending, size = [], 0
+
+            if pending:
+                yield ChatEvent(CONTENT, {"delta": "".join(pending)})
+        finally:
+            # Client went away mid-stream: stop the reader, which closes the upstream stream
+            if next_item is not None:
+                next_item.cancel()
+            reader.cancel()
+            try:
+                await reader
+            except asyncio.CancelledError:
+                pass
+
+    @staticmethod
+    async def _read(events: AsyncIterator[ChatEvent], queue: asyncio.Queue):
+        """Read the upstream stream into the queue, then _END (or the error it raised); always closes it"""
+        try:
+            async for event in events:
+                await queue.put(event)
+        except Exception as e:
+            await queue.put(e)
+            return
+        finally:
+            if hasattr(events, "aclose"):
+                await events.aclose()
+        await queue.put(_END)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Frame counters and averages (frames per response, bytes per frame)"""
+        return {
+            "window_ms": self.window * 1000,
+            "max_bytes": self.max_bytes,
+            "responses": self.responses,
+            "frames": self.frames,
+            "bytes": self.bytes,
+            "content_events": self.content_events,
+            "content_frames": self.content_frames,
+            "frames_per_response": round(self.frames / self.responses, 2) if self.responses else 0.0,
+            "bytes_per_frame": round(self.bytes / self.frames, 1) if self.frames else 0.0,
+            "events_per_content_frame": round(self.content_events / self.content_frames, 2) if self.content_frames else 0.0,
+        }
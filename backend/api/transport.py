@@ -0,0 +1,173 @@
+"""
+Provider transport: pooled HTTP clients and upstream concurrency limits.
+
+Each provider SDK client gets one long-lived httpx client with a tuned
+connection pool and keep-alive, shared by every request to that provider.
+Connections can be opened ahead of the first request (prewarm).
+
+Upstream requests are bounded by a semaphore per provider and, optionally,
+per model prefix. A request waits at most `queue_timeout` seconds for a slot,
+then fails with ProviderBusyError instead of piling up inside the SDK.
+"""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Any, AsyncIterator, List, Optional
+
+import httpx
+
+
+class ProviderBusyError(Exception):
+    """Raised when no provider/model slot frees up within the queue timeout"""
+
+
+def create_http_client(
+    max_connections: int,
+    max_keepalive: int,
+    keepalive_expiry: float,
+    connect_timeout: float = 5.0
+) -> httpx.AsyncClient:
+    """An httpx client for one provider SDK, with its own connection pool"""
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry
+        ),
+        # Streams can run for minutes; only connecting has a short timeout
+        timeout=httpx.Timeout(600, connect=connect_timeout),
+        follow_redirects=True
+    )
+
+
+async def prewarm(client: httpx.AsyncClient, base_url: str, connections: int) -> Dict[str, Any]:
+    """
+    Open up to `connections` pooled connections to a provider with concurrent
+    lightweight requests (the response status does not matter).
+
+    Returns:
+        Dict with connections opened and elapsed milliseconds
+    """
+    start = time.perf_counter()
+
+    async def touch():
+        try:
+            await client.head(base_url)
+        except httpx.HTTPError:
+            pass
+
+    await asyncio.gather(*[touch() for _ in range(connections)])
+    return {
+        "connections": pool_stats(client).get("connections", 0),
+        "ms": round((time.perf_counter() - start) * 1000, 1)
+    }
+
+
+def pool_stats(client: Optional[httpx.AsyncClient]) -> Dict[str, Any]:
+    """Open / idle / busy connections of a client's pool (best effort: httpx keeps the pool private)"""
+    pool = getattr(getattr(client, "_transport", None), "_pool", None)
+    connections = list(getattr(pool, "connections", None) or [])
+    idle = sum(1 for connection in connections if connection.is_idle())
+    return {"connections": len(connections), "idle": idle, "busy": len(connections) - idle}
+
+
+class ConcurrencyLimit:
+    """A semaphore with a bounded wait and queue statistics"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._semaphore = asyncio.Semaphore(limit)
+        self.in_flight = 0
+        self.waiting = 0
+        self.max_waiting = 0
+        self.acquired = 0
+        self.timeouts = 0
+        self.wait_s = 0.0
+        self.max_wait_s = 0.0
+
+    async def acquire(self, timeout: float):
+        start = time.perf_counter()
+        self.waiting += 1
+        self.max_waiting = max(self.max_waiting, self.waiting)
+        try:
+            if self._semaphore.locked():
+                await asyncio.wait_for(self._semaphore.acquire(), timeout)
+            else:
+                await self._semaphore.acquire()
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self.waiting -= 1
+            waited = time.perf_counter() - start
+            self.wait_s += waited
+            self.max_wait_s = max(self.max_wait_s, waited)
+        self.in_flight += 1
+        self.acquired += 1
+
+    def release(self):
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "max_waiting": self.max_waiting,
+            "acquired": self.acquired,
+            "timeouts": self.timeouts,
+            "mean_wait_ms": round(self.wait_s / max(self.acquired + self.timeouts, 1) * 1000, 2),
+            "max_wait_ms": round(self.max_wait_s * 1000, 2),
+        }
+
+
+class ProviderLimits:
+    """Per-provider and per-model-prefix concurrency limits"""
+
+    def __init__(self, provider_limits: Dict[str, int], model_limits: Dict[str, int], queue_timeout: float):
+        self.queue_timeout = queue_timeout
+        self.providers = {name: ConcurrencyLimit(limit) for name, limit in provider_limits.items()}
+        self.models = {prefix: ConcurrencyLimit(limit) for prefix, limit in model_limits.items()}
+
+    def _model_limit(self, model: str) -> Optional[ConcurrencyLimit]:
+        # Longest matching prefix, as for the context token budgets
+        matches = [prefix for prefix in self.models if model.startswith(prefix)]
+        return self.models[max(matches, key=len)] if matches else None
+
+    @asynccontextmanager
+    async def slot(self, provider: str, model: str) -> AsyncIterator[None]:
+        """
+        Hold a provider slot (and model slot, if the model is limited) for the
+        duration of an upstream request, streaming included.
+
+        Raises:
+            ProviderBusyError: If no slot frees up within queue_timeout
+        """
+        # Always model first, then provider, so waiters can't deadlock
+        limits: List[ConcurrencyLimit] = [
+            limit for limit in (self._model_limit(model), self.providers.get(provider)) if limit
+        ]
+        deadline = time.perf_counter() + self.queue_timeout
+        held: List[ConcurrencyLimit] = []
+        try:
+            for limit in limits:
+                try:
+                    await limit.acquire(max(deadline - time.perf_counter(), 0.0))
+                except asyncio.TimeoutError:
+                    raise ProviderBusyError(
+                        f"{provider} ({model}) is at its concurrency limit of {limit.limit} requests; "
+                        f"no slot within {self.queue_timeout:g}s"
+                    )
+                held.append(limit)
+            yield
+        finally:
+            for limit in reversed(held):
+                limit.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "queue_timeout_s": self.queue_timeout,
+            "providers": {name: limit.get_stats() for name, limit in self.providers.items()},
+            "models": {prefix: limit.get_stats() for prefix, limit in self.models.items()},
+        }
@@ -0,0 +1 @@
+"""Benchmarks and load tests for the 11-prompt backend"""
@@ -0,0 +1,138 @@
+"""
+Load time and memory benchmark for the article file formats.
+
+Each format is measured in a fresh subprocess so peak RSS is not shared:
+    json   - legacy JSON array, json.load
+    jsonl  - JSON Lines, streamed with iter_articles
+    store  - binary article store, memory-mapped (scraper/article_store.py)
+
+Reported per format: time to open / fully load, time to iterate all articles,
+mean time of a lookup by id, and RSS growth.
+
+Usage:
+    cd backend
+    python -m benchmarks.article_store --copies 10
+"""
+import argparse
+import json
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Any, List
+
+from scraper.article_files import default_articles_file, iter_articles, write_articles
+from scraper.article_store import ArticleStore, write_store
+
+
+def _rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure(fmt: str, path: str, lookups: int = 1000) -> Dict[str, Any]:
+    """Measure one format in the current process"""
+    rss_before = _rss_mb()
+
+    if fmt == "store":
+        start = time.perf_counter()
+        store = ArticleStore(path)
+        open_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        count = sum(1 for _ in store)
+        iterate_s = time.perf_counter() - start
+
+        ids = [store.field(i, "id") for i in random.Random(0).choices(range(len(store)), k=lookups)]
+        start = time.perf_counter()
+        for article_id in ids:
+            store.get(article_id)
+        lookup_s = (time.perf_counter() - start) / lookups
+    else:
+        start = time.perf_counter()
+        if fmt == "json":
+            with open(path, "r", encoding="utf-8") as f:
+                articles = json.load(f)
+        else:
+            articles = list(iter_articles(path))
+        open_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        count = sum(1 for _ in articles)
+        iterate_s = time.perf_counter() - start
+
+        # Lookup by id needs a dict over the loaded articles
+        start = time.perf_counter()
+        by_id = {article["id"]: article for article in articles}
+        ids = random.Random(0).choices(list(by_id), k=lookups)
+        for article_id in ids:
+            by_id.get(article_id)
+        lookup_s = (time.perf_counter() - start) / lookups
+
+    return {
+        "format": fmt,
+        "articles": count,
+        "file_mb": round(Path(path).stat().st_size / 1e6, 2),
+        "open_ms": round(open_s * 1000, 2),
+        "iterate_ms": round(iterate_s * 1000, 2),
+        "lookup_us": round(lookup_s * 1e6, 2),
+        "rss_growth_mb": round(_rss_mb() - rss_before, 1),
+    }
+
+
+def run(source: str, copies: int) -> List[Dict[str, Any]]:
+    articles = list(iter_articles(source))
+    # Simulate a larger corpus (more help centers) with re-keyed copies
+    corpus = [
+        {**article, "id": f"{article['id']}-{copy}" if copy else article["id"]}
+        for copy in range(copies)
+        for article in articles
+    ]
+
+    with tempfile.TemporaryDirectory(prefix="article-store-bench-") as tmp:
+        paths = {
+            "json": str(Path(tmp) / "articles.json"),
+            "jsonl": str(Path(tmp) / "articles.jsonl"),
+            "store": str(Path(tmp) / "articles.bin"),
+        }
+        with open(paths["json"], "w", encoding="utf-8") as f:
+            json.dump(corpus, f, indent=2, ensure_ascii=False)
+        write_articles(paths["jsonl"], corpus)
+        write_store(paths["store"], corpus)
+        del corpus, articles
+
+        results = []
+        for fmt, path in paths.items():
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.article_store", "--child", fmt, path],
+                capture_output=True, text=True, check=True
+            ).stdout
+            results.append(json.loads(output))
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Article file format benchmark")
+    parser.add_argument("--articles", default=str(default_articles_file()), help="Scraped articles file")
+    parser.add_argument("--copies", type=int, default=1, help="Multiply the corpus to simulate growth")
+    parser.add_argument("--child", nargs=2, metavar=("FORMAT", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(*args.child)))
+        return
+
+    results = run(args.articles, args.copies)
+
+    print(f"{'format':>7} {'articles':>9} {'file':>8} {'open':>10} {'iterate':>10} {'lookup':>9} {'RSS':>8}")
+    for r in results:
+        print(f"{r['format']:>7} {r['articles']:>9} {r['file_mb']:>6}MB {r['open_ms']:>8}ms "
+              f"{r['iterate_ms']:>8}ms {r['lookup_us']:>7}us {r['rss_growth_mb']:>6}MB")
+    print(json.dumps({"copies": args.copies, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
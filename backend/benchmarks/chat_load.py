@@ -0,0 +1,116 @@
+"""
+Load test for concurrent chat streams on a single event loop.
+
+Runs N concurrent ChatService.stream_events calls against the local stub provider
+and compares aggregate throughput with a single stream. With non-blocking
+provider clients the speedup should be close to N; a blocking client stays at ~1x.
+
+Usage:
+    cd backend
+    python -m benchmarks.chat_load --model gpt-4o --concurrency 1 4 16 32
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Dict, Any, List
+
+from api.events import CONTENT, ERROR
+from benchmarks.stub_provider import create_stub_app, StubProviderServer
+
+
+class _EmptyVectorDB:
+    """Vector DB stand-in so the benchmark measures provider streaming only"""
+
+    version = 0
+
+    def search(self, query: str, n_results: int = 5, where=None, **kwargs) -> Dict[str, Any]:
+        return {"query": query, "documents": [[]], "metadatas": [[]], "distances": [[]], "ids": [[]]}
+
+    async def search_async(self, query: str, n_results: int = 5, where=None, **kwargs) -> Dict[str, Any]:
+        return self.search(query, n_results, where)
+
+    def is_known_term(self, word: str) -> bool:
+        return False
+
+
+async def _consume(chat_service, model: str) -> int:
+    """Drain one chat stream and return the number of content events"""
+    content_events = 0
+    messages = [{"role": "user", "content": "Wie aktiviere ich meine eSIM?"}]
+    async for event in chat_service.stream_events(messages, model, "default", {}):
+        if event.type == CONTENT:
+            content_events += 1
+        elif event.type == ERROR:
+            raise RuntimeError(event.data.get("message"))
+    return content_events
+
+
+async def _run_level(chat_service, model: str, concurrency: int) -> Dict[str, Any]:
+    start = time.perf_counter()
+    counts = await asyncio.gather(*[_consume(chat_service, model) for _ in range(concurrency)])
+    elapsed = time.perf_counter() - start
+    tokens = sum(counts)
+    return {
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 3),
+        "tokens": tokens,
+        "tokens_per_s": round(tokens / elapsed, 1),
+    }
+
+
+def run(model: str, levels: List[int], tokens: int, token_delay: float) -> Dict[str, Any]:
+    app = create_stub_app(tokens_per_response=tokens, token_delay=token_delay)
+
+    with StubProviderServer(app) as server:
+        # Point the SDK clients at the stub before ChatService builds them
+        os.environ["OPENAI_API_KEY"] = "stub"
+        os.environ["OPENAI_BASE_URL"] = f"{server.base_url}/v1"
+        os.environ["ANTHROPIC_API_KEY"] = "stub"
+        os.environ["ANTHROPIC_BASE_URL"] = server.base_url
+
+        from api.chat import ChatService
+        from api.prompts import PromptManager
+
+        async def main() -> List[Dict[str, Any]]:
+            chat_service = ChatService(PromptManager(), _EmptyVectorDB())
+            # Warm up connections so level 1 isn't penalised by connection setup
+            await _consume(chat_service, model)
+            return [await _run_level(chat_service, model, n) for n in levels]
+
+        results = asyncio.run(main())
+
+    baseline = results[0]["tokens_per_s"]
+    for result in results:
+        result["speedup"] = round(result["tokens_per_s"] / baseline, 2)
+
+    return {
+        "model": model,
+        "tokens_per_response": tokens,
+        "token_delay_s": token_delay,
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent chat stream load test")
+    parser.add_argument("--model", default="gpt-4o", help="Model id (gpt-* or claude-*)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 32])
+    parser.add_argument("--tokens", type=int, default=50, help="Tokens per streamed response")
+    parser.add_argument("--token-delay", type=float, default=0.01, help="Seconds between tokens")
+    args = parser.parse_args()
+
+    # Per-request INFO logs would dominate the runtime at high concurrency
+    logging.disable(logging.INFO)
+    report = run(args.model, args.concurrency, args.tokens, args.token_delay)
+
+    print(f"{'streams':>8} {'elapsed':>9} {'tok/s':>9} {'speedup':>8}")
+    for r in report["results"]:
+        print(f"{r['concurrency']:>8} {r['elapsed_s']:>8}s {r['tokens_per_s']:>9} {r['speedup']:>7}x")
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Cold start benchmark for the API process.
+
+Starts uvicorn in a subprocess and polls /health and /ready, reporting the time
+until the worker answers health checks and until it reports ready, together
+with the import / warm-up breakdown from /ready.
+
+Usage:
+    cd backend
+    python -m benchmarks.cold_start --runs 3
+    WARMUP_MODE=eager python -m benchmarks.cold_start
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+from typing import Dict, Any, Optional
+
+import httpx
+
+
+def _wait_for(client: httpx.Client, url: str, started: float, timeout: float) -> Optional[float]:
+    """Seconds since `started` until url returns 200, or None on timeout"""
+    while time.perf_counter() - started < timeout:
+        try:
+            if client.get(url).status_code == 200:
+                return time.perf_counter() - started
+        except httpx.TransportError:
+            pass
+        time.sleep(0.02)
+    return None
+
+
+def measure(port: int, timeout: float) -> Dict[str, Any]:
+    base_url = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    try:
+        with httpx.Client(timeout=1.0) as client:
+            health_s = _wait_for(client, f"{base_url}/health", started, timeout)
+            ready_s = _wait_for(client, f"{base_url}/ready", started, timeout)
+            timing = client.get(f"{base_url}/ready").json().get("timing") if ready_s else None
+    finally:
+        process.terminate()
+        process.wait()
+
+    return {
+        "health_s": round(health_s, 3) if health_s is not None else None,
+        "ready_s": round(ready_s, 3) if ready_s is not None else None,
+        "timing": timing,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API cold start benchmark")
+    parser.add_argument("--runs", type=int, default=1)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=300.0, help="Seconds to wait for readiness")
+    args = parser.parse_args()
+
+    runs = [measure(args.port, args.timeout) for _ in range(args.runs)]
+
+    print(f"{'run':>4} {'health':>8} {'ready':>8} {'import':>8}")
+    for i, run in enumerate(runs, 1):
+        import_s = (run["timing"] or {}).get("import_s")
+        print(f"{i:>4} {run['health_s']!s:>7}s {run['ready_s']!s:>7}s {import_s!s:>7}s")
+    print(json.dumps({"runs": runs}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Extraction micro-benchmark: BeautifulSoup vs raw lxml, single process vs pool.
+
+Runs scraper/extraction.py over saved HTML pages and reports per-page parse
+time for each parser, pool throughput, and every page where the parsers
+disagree (their output must be identical).
+
+Fixtures are .html files in a directory; collect real ones during a crawl with
+SCRAPER_SAVE_HTML=../data/html_fixtures. Without --fixtures, pages are
+synthesized from the scraped articles in both layouts the help center serves:
+server-rendered markup and a client-rendered shell with __NEXT_DATA__.
+
+Usage:
+    cd backend
+    python -m benchmarks.extraction --fixtures ../data/html_fixtures
+    python -m benchmarks.extraction --sample 300 --workers 4
+"""
+import argparse
+import html as html_lib
+import json
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, List, Tuple
+
+from scraper.article_files import default_articles_file, iter_articles
+from scraper.extraction import EXTRACTORS, extract_article
+
+
+def load_fixtures(directory: str) -> List[Tuple[str, bytes]]:
+    """(url, html) per .html file; the URL comes from a leading <!-- url --> comment if present"""
+    pages = []
+    for path in sorted(Path(directory).glob("*.html")):
+        data = path.read_bytes()
+        url = path.stem
+        if data.startswith(b"<!-- "):
+            url = data[5:data.index(b" -->")].decode("utf-8")
+        pages.append((url, data))
+    return pages
+
+
+def render_page(article: Dict[str, Any], client_rendered: bool) -> str:
+    """A help center page for an article, as served or as rendered"""
+    title = html_lib.escape(article.get("title") or "")
+    paragraphs = "\n".join(
+        f"      <p>{html_lib.escape(line)}</p>" for line in (article.get("content") or "").split("\n")
+    )
+    header = '<header><a href="/">Hilfe-Center</a><nav><a href="/a">Start</a> <a href="/b">Kontakt</a></nav></header>'
+    footer = "<footer>&copy; 1&amp;1 <span>Impressum</span></footer>"
+
+    if client_rendered:
+        payload = json.dumps({"props": {"pageProps": {"article": {
+            "headline": article.get("title"),
+            "body": "<div>" + paragraphs + "</div>",
+            "tags": ["help"],
+        }}}})
+        return (f"<!DOCTYPE html><html><head><title>{title} | 1&amp;1</title></head><body>{header}"
+                f'<div id="__next"><main></main></div>'
+                f'<script id="__NEXT_DATA__" type="application/json">{payload}</script>{footer}</body></html>')
+
+    return (f"<!DOCTYPE html><html><head><title>{title} | 1&amp;1</title>"
+            f"<style>main {{ color: #333; }}</style></head><body>{header}"
+            f'<main class="page">\n  <nav class="breadcrumb"><a>Hilfe</a> &gt; <a>Artikel</a></nav>\n'
+            f'  <article class="help-article">\n    <h1 data-testid="title">{title}</h1>\n'
+            f"    <!-- content -->\n    <div class=\"article-content\">\n{paragraphs}\n"
+            f"      <script>window.track && track('view');</script>\n"
+            f"      <ul><li>Tipp: <strong>Hinweis</strong> lesen</li><li>Weitere<br>Infos</li></ul>\n"
+            f"    </div>\n  </article>\n</main>{footer}</body></html>")
+
+
+def synthesize(articles_file: str, sample: int, seed: int) -> List[Tuple[str, str]]:
+    articles = list(iter_articles(articles_file))
+    if sample and sample < len(articles):
+        articles = random.Random(seed).sample(articles, sample)
+    return [(a["url"], render_page(a, client_rendered=i % 2 == 1)) for i, a in enumerate(articles)]
+
+
+def _strip_time(article):
+    if article:
+        article = dict(article)
+        article.pop("scraped_at", None)
+    return article
+
+
+def time_parser(pages: List[Tuple[str, Any]], parser: str, repeat: int) -> Tuple[float, List[Any]]:
+    """Best-of-repeat seconds for extracting every page in this process"""
+    best = float("inf")
+    outputs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        outputs = [extract_article(url, html, parser) for url, html in pages]
+        best = min(best, time.perf_counter() - start)
+    return best, outputs
+
+
+def time_pool(pages: List[Tuple[str, Any]], parser: str, workers: int) -> float:
+    """Seconds for extracting every page in a process pool (started before timing)"""
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(extract_article, ["warm-up"] * workers, ["<p>x</p>"] * workers))
+        start = time.perf_counter()
+        futures = [pool.submit(extract_article, url, html, parser) for url, html in pages]
+        for future in futures:
+            future.result()
+        return time.perf_counter() - start
+
+
+def run(pages: List[Tuple[str, Any]], workers: int, repeat: int) -> Dict[str, Any]:
+    results = {}
+    outputs = {}
+    for parser in EXTRACTORS:
+        seconds, outputs[parser] = time_parser(pages, parser, repeat)
+        results[parser] = {
+            "per_page_ms": round(seconds / len(pages) * 1000, 3),
+            "pages_per_s": round(len(pages) / seconds, 1),
+        }
+        if workers > 1:
+            pool_s = time_pool(pages, parser, workers)
+            results[parser]["pool_pages_per_s"] = round(len(pages) / pool_s, 1)
+
+    mismatches = [
+        url for (url, _), a, b in zip(pages, outputs["bs4"], outputs["lxml"])
+        if _strip_time(a) != _strip_time(b)
+    ]
+    return {
+        "pages": len(pages),
+        "extracted": sum(1 for article in outputs["lxml"] if article),
+        "workers": workers,
+        "parsers": results,
+        "speedup": round(results["bs4"]["per_page_ms"] / results["lxml"]["per_page_ms"], 2),
+        "mismatches": len(mismatches),
+        "mismatched_urls": mismatches[:20],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTML extraction micro-benchmark")
+    parser.add_argument("--fixtures", help="Directory of saved .html pages (default: synthesize from articles)")
+    parser.add_argument("--articles", default=str(default_articles_file()), help="Scraped articles for synthetic pages")
+    parser.add_argument("--sample", type=int, default=200, help="Synthetic pages to generate")
+    parser.add_argument("--workers", type=int, default=4, help="Process pool size (1 = skip the pool run)")
+    parser.add_argument("--repeat", type=int, default=3, help="Single-process runs per parser (best is kept)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    pages = load_fixtures(args.fixtures) if args.fixtures else synthesize(args.articles, args.sample, args.seed)
+    if not pages:
+        print("No pages to extract")
+        return
+
+    report = run(pages, args.workers, args.repeat)
+
+    print(f"{'parser':>7} {'per page':>10} {'pages/s':>9} {'pool pages/s':>13}")
+    for name, r in report["parsers"].items():
+        print(f"{name:>7} {r['per_page_ms']:>8}ms {r['pages_per_s']:>9} {r.get('pool_pages_per_s', '-'):>13}")
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
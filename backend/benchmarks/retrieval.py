@@ -0,0 +1,181 @@
+"""
+Retrieval quality and latency benchmark for VectorDBClient.
+
+Builds a fresh index from the scraped articles in a temporary directory,
+then runs a labelled query set against it in each search mode and reports
+recall@k, MRR, search latency percentiles and index build time as JSON.
+
+The default query set maps every article title to the URL(s) of the articles
+carrying that title. A custom set can be given with --queries as a JSON list of
+{"query": "...", "urls": ["..."]} (or a single "url").
+
+Usage:
+    cd backend
+    python -m benchmarks.retrieval --sample 300 --modes vector hybrid lexical
+    python -m benchmarks.retrieval --output ../data/retrieval_baseline.json
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+from scraper.article_files import default_articles_file, iter_articles
+
+
+def title_queries(articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Labelled queries from article titles; duplicate titles share all their URLs"""
+    by_title: Dict[str, List[str]] = {}
+    for article in articles:
+        title = (article.get("title") or "").strip()
+        if title and article.get("url"):
+            by_title.setdefault(title, []).append(article["url"])
+    return [{"query": title, "urls": urls} for title, urls in by_title.items()]
+
+
+def load_queries(path: str) -> List[Dict[str, Any]]:
+    """Load a labelled query set ({"query", "urls" or "url"} per entry)"""
+    with open(path, "r", encoding="utf-8") as f:
+        entries = json.load(f)
+    return [
+        {"query": e["query"], "urls": e.get("urls") or [e["url"]]}
+        for e in entries
+    ]
+
+
+def rank_of(result: Dict[str, Any], relevant: List[str]) -> Optional[int]:
+    """1-based rank of the first relevant article in a search result, or None"""
+    for rank, article in enumerate(result.get("articles") or [], 1):
+        if article.get("url") in relevant:
+            return rank
+    return None
+
+
+def _percentiles(latencies: List[float]) -> Dict[str, float]:
+    values = np.percentile(np.asarray(latencies) * 1000, [50, 95, 99])
+    return {
+        "p50_ms": round(float(values[0]), 2),
+        "p95_ms": round(float(values[1]), 2),
+        "p99_ms": round(float(values[2]), 2),
+        "mean_ms": round(float(np.mean(latencies)) * 1000, 2),
+    }
+
+
+def evaluate(vector_db, queries: List[Dict[str, Any]], mode: str, ks: List[int]) -> Dict[str, Any]:
+    """
+    Run every query once in the given mode.
+
+    Returns:
+        Dict with recall@k per k, MRR, latency percentiles and error count
+    """
+    n_results = max(ks)
+    # First search loads the embedding model; keep it out of the latencies
+    vector_db.search(queries[0]["query"], n_results=n_results, mode=mode)
+
+    ranks: List[Optional[int]] = []
+    latencies: List[float] = []
+    errors = 0
+    for entry in queries:
+        start = time.perf_counter()
+        result = vector_db.search(entry["query"], n_results=n_results, mode=mode)
+        latencies.append(time.perf_counter() - start)
+        if "error" in result:
+            errors += 1
+        ranks.append(rank_of(result, entry["urls"]))
+
+    found = [r for r in ranks if r is not None]
+    return {
+        "mode": mode,
+        "queries": len(queries),
+        "errors": errors,
+        "recall": {f"@{k}": round(sum(1 for r in found if r <= k) / len(queries), 4) for k in ks},
+        "mrr": round(sum(1.0 / r for r in found) / len(queries), 4),
+        "latency": _percentiles(latencies),
+    }
+
+
+def run(
+    articles_file: str,
+    modes: List[str],
+    ks: List[int],
+    sample: Optional[int] = None,
+    queries_file: Optional[str] = None,
+    seed: int = 0
+) -> Dict[str, Any]:
+    articles = list(iter_articles(articles_file))
+
+    queries = load_queries(queries_file) if queries_file else title_queries(articles)
+    if sample and sample < len(queries):
+        queries = random.Random(seed).sample(queries, sample)
+
+    with tempfile.TemporaryDirectory(prefix="retrieval-bench-") as tmp:
+        # Keep the benchmark index away from the application's data directory
+        os.environ["LEXICAL_INDEX_PATH"] = str(Path(tmp) / "lexical_index.npz")
+        from vector_db.chroma_client import VectorDBClient
+
+        vector_db = VectorDBClient(persist_directory=str(Path(tmp) / "chroma"), articles_file=articles_file)
+
+        start = time.perf_counter()
+        vector_db.add_articles(articles)
+        vector_build_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        lexical = vector_db.get_lexical_index()
+        lexical_build_s = time.perf_counter() - start
+
+        results = [evaluate(vector_db, queries, mode, ks) for mode in modes]
+        passages = vector_db.collection.count()
+        vector_db.close()
+
+    return {
+        "articles_file": str(articles_file),
+        "articles": len(articles),
+        "passages": passages,
+        "queries": len(queries),
+        "query_set": queries_file or "titles",
+        "settings": {
+            "chunk_size": vector_db.chunk_size,
+            "chunk_overlap": vector_db.chunk_overlap,
+            "chunk_overfetch": vector_db.chunk_overfetch,
+        },
+        "build": {
+            "vector_index_s": round(vector_build_s, 2),
+            "lexical_index_s": round(lexical_build_s, 2) if lexical is not None else None,
+        },
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Retrieval quality and latency benchmark")
+    parser.add_argument("--articles", default=str(default_articles_file()), help="Scraped articles (JSONL or JSON)")
+    parser.add_argument("--queries", help="Labelled query set JSON (default: article titles)")
+    parser.add_argument("--modes", nargs="+", default=["vector", "hybrid", "lexical"])
+    parser.add_argument("--k", type=int, nargs="+", default=[1, 3, 5, 10], help="Cut-offs for recall@k")
+    parser.add_argument("--sample", type=int, help="Evaluate a random sample of N queries")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = run(args.articles, args.modes, sorted(args.k), args.sample, args.queries, args.seed)
+
+    recall_keys = [f"@{k}" for k in sorted(args.k)]
+    print(f"{'mode':>8} " + " ".join(f"{'R' + key:>7}" for key in recall_keys) + f" {'MRR':>7} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for r in report["results"]:
+        recall = " ".join(f"{r['recall'][key]:>7}" for key in recall_keys)
+        latency = r["latency"]
+        print(f"{r['mode']:>8} {recall} {r['mrr']:>7} {latency['p50_ms']:>6}ms {latency['p95_ms']:>6}ms {latency['p99_ms']:>6}ms")
+    print(json.dumps(report, indent=2))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""
+Local stub for the OpenAI and Anthropic HTTP APIs.
+Streams canned tokens with a fixed per-token delay so benchmarks can exercise
+the real SDK clients without network access or API keys.
+
+Prompt caching is simulated the way the providers report it: OpenAI caches
+any previously seen prefix of whole messages, Anthropic previously seen
+prefixes ending at a cache_control breakpoint; both only from
+cache_min_tokens on. Token counts are estimates.
+"""
+import asyncio
+import hashlib
+import json
+import socket
+import threading
+import time
+from typing import AsyncGenerator, Dict, Any, List, Tuple
+
+from vector_db.chunking import estimate_tokens
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+
+def create_stub_app(
+    tokens_per_response: int = 50,
+    token_delay: float = 0.01,
+    intent_reply: str = "SKIP: Benchmark",
+    intent_delay: float = 0.0,
+    cache_min_tokens: int = 1024,
+) -> FastAPI:
+    """
+    Build a FastAPI app that mimics the provider endpoints used by ChatService.
+
+    Args:
+        tokens_per_response: Number of content deltas per streamed answer
+        token_delay: Seconds to wait between deltas (simulated generation time)
+        intent_reply: Fixed answer for non-streaming completions (intent analysis)
+        intent_delay: Seconds to wait before answering a non-streaming completion
+        cache_min_tokens: Shortest prefix the simulated prompt cache stores
+
+    Returns:
+        FastAPI application
+    """
+    app = FastAPI(title="Stub Provider")
+    app.state.requests = []
+    app.state.cached_prefixes = set()
+
+    def prefix_cache(items: List[Any], breakpoints_only: bool = False) -> Tuple[int, int, int]:
+        """
+        Run a prompt of messages / content blocks through the simulated cache.
+
+        Every previously stored prefix of whole items can be read; prefixes
+        are stored after each item, or only at cache_control items.
+
+        Returns:
+            (prompt tokens, tokens read from cache, tokens written to cache)
+        """
+        digest = hashlib.sha256()
+        tokens = 0
+        read = written = 0
+        for item in items:
+            # Breakpoint markers don't change the cached content
+            content = {k: v for k, v in item.items() if k != "cache_control"}
+            encoded = json.dumps(content, sort_keys=True)
+            digest.update(encoded.encode("utf-8"))
+            tokens += estimate_tokens(encoded)
+            if tokens < cache_min_tokens:
+                continue
+            if digest.hexdigest() in app.state.cached_prefixes:
+                read = tokens
+            elif not breakpoints_only or item.get("cache_control"):
+                app.state.cached_prefixes.add(digest.hexdigest())
+                written = tokens
+        return tokens, read, max(written - read, 0)
+
+    def anthropic_blocks(body: Dict[str, Any]) -> List[Any]:
+        """System and message content flattened into blocks, in prompt order"""
+        system = body.get("system") or []
+        blocks = [{"type": "text", "text": system}] if isinstance(system, str) else list(system)
+        for message in body.get("messages", []):
+            content = message["content"]
+            if isinstance(content, str):
+                content = [{"type": "text", "text": content}]
+            blocks.extend({"role": message["role"], **block} for block in content)
+        return blocks
+
+    @app.post("/v1/chat/completions")
+    async def openai_chat(request: Request):
+        body = await request.json()
+        app.state.requests.append({"provider": "openai", "body": body})
+        model = body.get("model", "stub")
+        prompt_tokens, cached_tokens, _ = prefix_cache(body.get("messages", []))
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": tokens_per_response,
+            "total_tokens": prompt_tokens + tokens_per_response,
+            "prompt_tokens_details": {"cached_tokens": cached_tokens}
+        }
+
+        if not body.get("stream"):
+            await asyncio.sleep(intent_delay)
+            return {
+                "id": "chatcmpl-stub",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": intent_reply},
+                    "finish_reason": "stop"
+                }],
+                "usage": {**usage, "completion_tokens": 5, "total_tokens": prompt_tokens + 5}
+            }
+
+        async def stream() -> AsyncGenerator[str, None]:
+            for i in range(tokens_per_response):
+                await asyncio.sleep(token_delay)
+                chunk = {
+                    "id": "chatcmpl-stub",
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [{"index": 0, "delta": {"content": f"tok{i} "}, "finish_reason": None}]
+                }
+                yield f"data: {json.dumps(chunk)}\n\n"
+            if (body.get("stream_options") or {}).get("include_usage"):
+                chunk = {
+                    "id": "chatcmpl-stub",
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [],
+                    "usage": usage
+                }
+                yield f"data: {json.dumps(chunk)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    @app.post("/v1/messages")
+    async def anthropic_messages(request: Request):
+        body = await request.json()
+        app.state.requests.append({"provider": "anthropic", "body": body})
+        model = body.get("model", "stub")
+        prompt_tokens, cache_read, cache_write = prefix_cache(anthropic_blocks(body), breakpoints_only=True)
+
+        def sse(event: str, data: Dict[str, Any]) -> str:
+            return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+        async def stream() -> AsyncGenerator[str, None]:
+            yield sse("message_start", {
+                "type": "message_start",
+                "message": {
+                    "id": "msg_stub",
+                    "type": "message",
+                    "role": "assistant",
+                    "model": model,
+                    "content": [],
+                    "stop_reason": None,
+                    "stop_sequence": None,
+                    "usage": {
+                        "input_tokens": prompt_tokens - cache_read - cache_write,
+                        "cache_read_input_tokens": cache_read,
+                        "cache_creation_input_tokens": cache_write,
+                        "output_tokens": 0
+                    }
+                }
+            })
+            yield sse("content_block_start", {
+                "type": "content_block_start",
+                "index": 0,
+                "content_block": {"type": "text", "text": ""}
+            })
+            for i in range(tokens_per_response):
+                await asyncio.sleep(token_delay)
+                yield sse("content_block_delta", {
+                    "type": "content_block_delta",
+                    "index": 0,
+                    "delta": {"type": "text_delta", "text": f"tok{i} "}
+                })
+            yield sse("content_block_stop", {"type": "content_block_stop", "index": 0})
+            yield sse("message_delta", {
+                "type": "message_delta",
+                "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+                "usage": {"output_tokens": tokens_per_response}
+            })
+            yield sse("message_stop", {"type": "message_stop"})
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    return app
+
+
+class StubProviderServer:
+    """Runs the stub provider app with uvicorn in a background thread"""
+
+    def __init__(self, app: FastAPI, host: str = "127.0.0.1", port: int = 0):
+        self.app = app
+        self.host = host
+        self.port = port or self._free_port(host)
+        self.server = uvicorn.Server(uvicorn.Config(app, host=self.host, port=self.port, log_level="warning"))
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    @staticmethod
+    def _free_port(host: str) -> int:
+        with socket.socket() as sock:
+            sock.bind((host, 0))
+            return sock.getsockname()[1]
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def __enter__(self) -> "StubProviderServer":
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.should_exit = True
+        self.thread.join(timeout=5)
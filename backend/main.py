@@ -2,18 +2,30 @@
 Main FastAPI application for 11-prompt project.
 Provides API endpoints for chat, prompt configuration, and vector search.
 """
+import time
+
+_import_started = time.perf_counter()
+
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Load backend/.env before any module reads its settings
+load_dotenv(Path(__file__).parent / ".env")
+
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import StreamingResponse, JSONResponse, PlainTextResponse
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
-import json
+import asyncio
 import os
-from pathlib import Path
+import threading
 
-from api.chat import ChatService
+from api.models import MODELS
+from api.streaming import SSEStream
 from api.prompts import PromptManager
-from vector_db.chroma_client import VectorDBClient
+from scraper.article_files import iter_articles
+from vector_db.chroma_client import VectorDBClient, SearchQueueFullError
 
 app = FastAPI(title="11-Prompt API", version="1.0.0")
 
@@ -26,52 +38,144 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize services
+# Initialize services. Both are cheap to construct: the vector DB opens Chroma
+# and loads the embedding model on first use or during warm-up.
 prompt_manager = PromptManager()
 vector_db = VectorDBClient()
-chat_service = ChatService(prompt_manager, vector_db)
+# Coalesces token deltas into fewer SSE frames (SSE_COALESCE_MS / SSE_COALESCE_BYTES)
+sse_stream = SSEStream()
+
+# Request limits of the vector search endpoints; a batch can't exceed the
+# search queue either, since every query takes a pending slot
+MAX_SEARCH_RESULTS = int(os.getenv("VECTOR_SEARCH_MAX_RESULTS", "50"))
+MAX_BATCH_QUERIES = min(int(os.getenv("VECTOR_SEARCH_MAX_BATCH", "32")), vector_db.max_pending_searches)
+
+# ChatService pulls in the provider SDKs (~2s of imports), so it is created
+# by the warm-up or on the first request that needs it, never on the event loop
+_chat_service = None
+_chat_service_lock = threading.Lock()
+_chat_service_init: Optional[asyncio.Lock] = None
+
+# WARMUP_MODE: background (bind immediately, warm up in a thread), eager
+# (warm up before accepting requests) or lazy (initialize on first use)
+WARMUP_MODE = os.getenv("WARMUP_MODE", "background")
+
+startup_timing: Dict[str, Any] = {"import_s": None, "startup_s": None, "warm_up": None}
+_warm_up_started = None
+_warm_up_done = False
+_sync_pending = False
+
+
+def build_chat_service():
+    """Create the chat service on first use (blocking; call from a worker thread)"""
+    global _chat_service
+    if _chat_service is None:
+        with _chat_service_lock:
+            if _chat_service is None:
+                from api.chat import ChatService
+                _chat_service = ChatService(prompt_manager, vector_db)
+    return _chat_service
+
+
+async def get_chat_service():
+    """The chat service, built in the default executor if the warm-up hasn't finished it yet"""
+    global _chat_service_init
+    if _chat_service is not None:
+        return _chat_service
+    if _chat_service_init is None:
+        _chat_service_init = asyncio.Lock()
+    # Concurrent first requests wait here instead of occupying executor threads
+    async with _chat_service_init:
+        return await asyncio.get_running_loop().run_in_executor(None, build_chat_service)
+
+
+def sync_knowledge_base():
+    """Incrementally sync the vector DB with the scraped articles file"""
+    data_file = vector_db.articles_file
+
+    if not data_file.exists():
+        print(f"Warning: Scraped articles file not found at {data_file}")
+        return
+
+    def report(status: Dict[str, Any]):
+        print(f"Vector DB sync: embedded {status['embedded']}/{status['to_embed']} passages")
+
+    # Articles are streamed from the JSONL file
+    result = vector_db.sync_articles(iter_articles(data_file), progress=report)
+    if result["status"] == "success":
+        print(
+            f"Vector DB sync done in {result['duration_s']}s: {result['added']} added, "
+            f"{result['updated']} updated, {result['removed']} removed, {result['unchanged']} unchanged"
+        )
+    else:
+        print(f"Vector DB sync failed: {result.get('message')}")
+
+    # Load (or build) the BM25 index used for hybrid search
+    vector_db.get_lexical_index()
+
+
+def warm_up():
+    """Initialize services, load the index and embedder, then sync the knowledge base"""
+    global _warm_up_done, _sync_pending
+    timings = {}
+
+    start = time.perf_counter()
+    build_chat_service()
+    timings["chat_service_s"] = round(time.perf_counter() - start, 3)
+
+    try:
+        timings.update(vector_db.warm_up())
+    except Exception as e:
+        print(f"Vector DB warm-up failed: {e}")
+
+    # An empty index is not worth serving: wait for the first sync
+    _sync_pending = timings.get("document_count", 0) == 0
+    timings["total_s"] = round(time.perf_counter() - _warm_up_started, 3)
+    startup_timing["warm_up"] = timings
+    _warm_up_done = True
+    print(f"Warm-up done: {timings}")
+
+    try:
+        sync_knowledge_base()
+    finally:
+        _sync_pending = False
+
+
+async def prewarm_providers():
+    """Open provider connections on the server's event loop once the chat service exists"""
+    try:
+        chat_service = await get_chat_service()
+        startup_timing["provider_prewarm"] = await chat_service.prewarm_connections()
+    except Exception as e:
+        print(f"Provider pre-warm failed: {e}")
 
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize vector DB with scraped data if collection is empty"""
-    stats = vector_db.get_stats()
-
-    if stats.get("document_count", 0) == 0:
-        print("Vector DB is empty, loading scraped articles...")
-
-        # Load scraped articles
-        data_file = Path(__file__).parent.parent / "data" / "scraped_articles.json"
-
-        if data_file.exists():
-            with open(data_file, "r", encoding="utf-8") as f:
-                articles = json.load(f)
-
-            # Prepare data for ChromaDB
-            documents = []
-            metadatas = []
-            ids = []
-
-            for article in articles:
-                if article.get("content"):
-                    documents.append(article["content"])
-                    metadatas.append({
-                        "title": article.get("title", ""),
-                        "url": article.get("url", ""),
-                        "source": "1&1 Helpdesk"
-                    })
-                    # Generate ID from URL or title
-                    article_id = article.get("url", "").split("/")[-1] or f"article_{len(ids)}"
-                    ids.append(article_id)
-
-            if documents:
-                result = vector_db.add_documents(documents, metadatas, ids)
-                print(f"Loaded {len(documents)} articles into vector DB")
-                print(f"Result: {result}")
-        else:
-            print(f"Warning: Scraped articles file not found at {data_file}")
+    """Warm up services and sync scraped articles according to WARMUP_MODE"""
+    global _warm_up_started
+    _warm_up_started = time.perf_counter()
+
+    # Searches keep working on the existing collection while the sync runs
+    loop = asyncio.get_running_loop()
+    if WARMUP_MODE == "eager":
+        await asyncio.gather(loop.run_in_executor(None, warm_up), prewarm_providers())
+    elif WARMUP_MODE == "background":
+        app.state.warm_up_task = loop.run_in_executor(None, warm_up)
+        app.state.prewarm_task = asyncio.create_task(prewarm_providers())
     else:
-        print(f"Vector DB already has {stats.get('document_count')} documents")
+        app.state.warm_up_task = loop.run_in_executor(None, sync_knowledge_base)
+
+    startup_timing["startup_s"] = round(time.perf_counter() - _warm_up_started, 3)
+    print(f"Startup: import {startup_timing['import_s']}s, startup event {startup_timing['startup_s']}s")
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release the vector search executor and provider connections"""
+    vector_db.close()
+    if _chat_service is not None:
+        await _chat_service.close()
 
 
 # Request/Response models
@@ -84,7 +188,9 @@ class ChatRequest(BaseModel):
     messages: List[ChatMessage]
     model: str
     prompt_id: Optional[str] = "default"
+    prompt_version: Optional[int] = None  # pin a saved prompt version (default: latest)
     stream: bool = True
+    timing: Optional[bool] = None  # add a timing event with per-stage latencies (default: CHAT_TIMING_EVENTS)
     model_params: Optional[Dict[str, Any]] = None  # Renamed from model_config (reserved in Pydantic v2)
 
 
@@ -102,6 +208,13 @@ class PromptConfig(BaseModel):
 class VectorSearchRequest(BaseModel):
     query: str
     n_results: int = 5
+    mode: Optional[str] = None  # vector, hybrid or lexical (default: SEARCH_MODE)
+
+
+class VectorBatchSearchRequest(BaseModel):
+    queries: List[str]
+    n_results: int = 5
+    mode: Optional[str] = None
 
 
 # API Endpoints
@@ -111,6 +224,30 @@ async def root():
     return {"status": "ok", "service": "11-prompt API"}
 
 
+@app.get("/health")
+async def health():
+    """Liveness check; answers as soon as the worker is bound"""
+    return {"status": "ok"}
+
+
+@app.get("/ready")
+async def ready():
+    """Readiness check: 200 once services, index and embedder are warm, else 503"""
+    if WARMUP_MODE == "lazy":
+        is_ready = True
+    else:
+        is_ready = _warm_up_done and vector_db.is_ready() and not _sync_pending
+
+    body = {
+        "ready": is_ready,
+        "mode": WARMUP_MODE,
+        "components": {**vector_db.warm, "chat_service": _chat_service is not None},
+        "sync": vector_db.sync_status,
+        "timing": startup_timing
+    }
+    return JSONResponse(body, status_code=200 if is_ready else 503)
+
+
 @app.post("/api/chat")
 async def chat(request: ChatRequest):
     """
@@ -121,14 +258,17 @@ async def chat(request: ChatRequest):
         # Convert Pydantic models to dicts
         messages_dict = [msg.model_dump() for msg in request.messages]
 
+        chat_service = await get_chat_service()
         if request.stream:
             return StreamingResponse(
-                chat_service.stream_chat(
+                sse_stream.encode(chat_service.stream_events(
                     messages=messages_dict,
                     model=request.model,
                     prompt_id=request.prompt_id,
-                    model_config=request.model_params or {}
-                ),
+                    model_config=request.model_params or {},
+                    prompt_version=request.prompt_version,
+                    timing=request.timing
+                )),
                 media_type="text/event-stream"
             )
         else:
@@ -136,7 +276,9 @@ async def chat(request: ChatRequest):
                 messages=messages_dict,
                 model=request.model,
                 prompt_id=request.prompt_id,
-                model_config=request.model_params or {}
+                model_config=request.model_params or {},
+                prompt_version=request.prompt_version,
+                timing=request.timing
             )
             return response
     except Exception as e:
@@ -158,6 +300,24 @@ async def get_prompt(prompt_id: str):
     return prompt
 
 
+@app.get("/api/prompts/{prompt_id}/versions")
+async def list_prompt_versions(prompt_id: str):
+    """List the saved versions of a prompt, oldest first"""
+    versions = prompt_manager.list_versions(prompt_id)
+    if not versions:
+        raise HTTPException(status_code=404, detail="Prompt not found")
+    return versions
+
+
+@app.get("/api/prompts/{prompt_id}/versions/{version}")
+async def get_prompt_version(prompt_id: str, version: int):
+    """Get a specific saved version of a prompt"""
+    prompt = prompt_manager.get_prompt(prompt_id, version)
+    if not prompt:
+        raise HTTPException(status_code=404, detail="Prompt version not found")
+    return prompt
+
+
 @app.post("/api/prompts")
 async def create_prompt(config: PromptConfig):
     """Create a new prompt configuration"""
@@ -195,13 +355,41 @@ async def delete_prompt(prompt_id: str):
 @app.post("/api/vector/search")
 async def vector_search(request: VectorSearchRequest):
     """Search the vector database"""
+    if not 1 <= request.n_results <= MAX_SEARCH_RESULTS:
+        raise HTTPException(status_code=422, detail=f"n_results must be between 1 and {MAX_SEARCH_RESULTS}")
     try:
-        results = vector_db.search(request.query, n_results=request.n_results)
+        results = await vector_db.search_async(request.query, n_results=request.n_results, mode=request.mode)
         return results
+    except SearchQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/api/vector/search/batch")
+async def vector_search_batch(request: VectorBatchSearchRequest):
+    """Search many queries with one embedding pass; results are returned in query order"""
+    if len(request.queries) > MAX_BATCH_QUERIES:
+        raise HTTPException(status_code=422, detail=f"At most {MAX_BATCH_QUERIES} queries per batch")
+    if not 1 <= request.n_results <= MAX_SEARCH_RESULTS:
+        raise HTTPException(status_code=422, detail=f"n_results must be between 1 and {MAX_SEARCH_RESULTS}")
+    try:
+        results = await vector_db.search_many_async(
+            request.queries, n_results=request.n_results, mode=request.mode
+        )
+        return {"count": len(results), "results": results}
+    except SearchQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/vector/sync")
+async def vector_sync_status():
+    """Progress of the background knowledge base sync"""
+    return vector_db.sync_status
+
+
 @app.get("/api/vector/stats")
 async def vector_stats():
     """Get vector database statistics"""
@@ -212,79 +400,50 @@ async def vector_stats():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/cache/stats")
+async def cache_stats():
+    """Get intent/search cache hit and miss counters (empty until the chat service exists)"""
+    return _chat_service.get_cache_stats() if _chat_service is not None else {}
+
+
+@app.get("/api/providers/stats")
+async def provider_stats():
+    """Get provider connection pool and concurrency queue statistics (empty until the chat service exists)"""
+    return _chat_service.get_provider_stats() if _chat_service is not None else {}
+
+
+@app.get("/api/stream/stats")
+async def stream_stats():
+    """Get SSE frame counters (frames per response, bytes per frame, coalescing ratio)"""
+    return sse_stream.get_stats()
+
+
+@app.get("/metrics")
+async def metrics():
+    """Per-stage chat latency metrics in the Prometheus text format (empty until the chat service exists)"""
+    if _chat_service is None:
+        return PlainTextResponse("", media_type="text/plain; version=0.0.4")
+    chat_metrics = _chat_service.metrics
+    if not chat_metrics.enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled (CHAT_METRICS=false)")
+    return PlainTextResponse(chat_metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.delete("/api/cache")
+async def clear_cache():
+    """Clear the intent and search caches"""
+    if _chat_service is not None:
+        _chat_service.clear_caches()
+    return {"status": "cleared"}
+
+
 @app.get("/api/models")
 async def list_models():
     """List available AI models with their configurations"""
-    return {
-        "models": [
-            {
-                "id": "gpt-4o",
-                "name": "GPT-4o",
-                "provider": "openai",
-                "supports_streaming": True,
-                "default_config": {}
-            },
-            {
-                "id": "gpt-4o-mini",
-                "name": "GPT-4o Mini",
-                "provider": "openai",
-                "supports_streaming": True,
-                "default_config": {}
-            },
-            {
-                "id": "o1",
-                "name": "GPT-5 (o1)",
-                "provider": "openai",
-                "supports_streaming": False,
-                "default_config": {
-                    "max_completion_tokens": 8000,
-                    "reasoning_effort": "medium"
-                },
-                "config_options": {
-                    "reasoning_effort": {
-                        "type": "select",
-                        "options": ["low", "medium", "high"],
-                        "description": "Thinking time for reasoning tasks"
-                    }
-                }
-            },
-            {
-                "id": "o1-mini",
-                "name": "GPT-5 Mini (o1-mini)",
-                "provider": "openai",
-                "supports_streaming": False,
-                "default_config": {
-                    "max_completion_tokens": 8000,
-                    "reasoning_effort": "medium"
-                },
-                "config_options": {
-                    "reasoning_effort": {
-                        "type": "select",
-                        "options": ["low", "medium", "high"],
-                        "description": "Thinking time for reasoning tasks"
-                    }
-                }
-            },
-            {
-                "id": "claude-sonnet-4-20250514",
-                "name": "Claude Sonnet 4",
-                "provider": "anthropic",
-                "supports_streaming": True,
-                "default_config": {
-                    "max_tokens": 8192
-                }
-            },
-            {
-                "id": "claude-opus-4-20250514",
-                "name": "Claude Opus 4",
-                "provider": "anthropic",
-                "supports_streaming": True,
-                "default_config": {
-                    "max_tokens": 8192
-                }
-            }
-        ]
-    }
+    return {"models": MODELS}
+
+
+startup_timing["import_s"] = round(time.perf_counter() - _import_started, 3)
 
 
 if __name__ == "__main__":
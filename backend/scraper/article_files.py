@@ -0,0 +1,172 @@
+"""
+Reading and writing scraped article files.
+
+Articles are stored as JSON Lines (one article per line), written atomically
+and read as a stream. While a crawl runs, finished articles are appended to a
+journal next to the output file so an interrupted run can resume.
+Legacy files holding one JSON array and binary article stores
+(see article_store.py) are read as well.
+"""
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Iterable, Iterator, Dict, Any
+
+from .article_store import ArticleStore, is_article_store
+
+
+DATA_DIR = Path(__file__).parent.parent.parent / "data"
+
+
+def default_articles_file() -> Path:
+    """
+    ARTICLES_FILE if set, else data/scraped_articles.jsonl, or the legacy
+    .json file if no JSONL file exists yet
+    """
+    if os.getenv("ARTICLES_FILE"):
+        return Path(os.getenv("ARTICLES_FILE"))
+    jsonl = DATA_DIR / "scraped_articles.jsonl"
+    legacy = DATA_DIR / "scraped_articles.json"
+    return legacy if not jsonl.exists() and legacy.exists() else jsonl
+
+
+def iter_articles(path) -> Iterator[Dict[str, Any]]:
+    """
+    Stream articles from a JSONL file (or a legacy JSON array file, or a
+    binary article store).
+
+    A truncated last line, as left by a crash mid-write, is skipped.
+    """
+    path = Path(path)
+    if is_article_store(path):
+        with ArticleStore(path) as store:
+            yield from store
+        return
+
+    with open(path, "r", encoding="utf-8") as f:
+        first = f.read(1)
+        while first and first.isspace():
+            first = f.read(1)
+        if first == "[":
+            f.seek(0)
+            yield from json.load(f)
+            return
+
+        f.seek(0)
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                print(f"Skipping unreadable line in {path}")
+
+
+def write_articles(path, articles: Iterable[Dict[str, Any]]) -> int:
+    """
+    Write articles as JSONL atomically (temp file + rename).
+
+    Returns:
+        Number of articles written
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}-")
+    count = 0
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            for article in articles:
+                f.write(json.dumps(article, ensure_ascii=False))
+                f.write("\n")
+                count += 1
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+    return count
+
+
+def ends_with_newline(path) -> bool:
+    """True if a file is empty or its last byte is a newline (reads one byte)"""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() == 0:
+            return True
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+class ArticleJournal:
+    """
+    Append-only JSONL journal of the articles finished in the current crawl,
+    plus a small checkpoint with progress counters.
+
+    Each article is flushed to disk as soon as it is done; resume() returns
+    what an interrupted run already scraped.
+    """
+
+    def __init__(self, output_file, checkpoint_every: int = 25):
+        output_file = Path(output_file)
+        self.path = output_file.with_name(output_file.name + ".partial")
+        self.checkpoint_path = output_file.with_name(output_file.name + ".checkpoint.json")
+        self.checkpoint_every = checkpoint_every
+        self.completed = 0
+        self.last_url = None
+        self._file = None
+
+    def resume(self) -> Dict[str, Dict[str, Any]]:
+        """Articles finished by a previous, interrupted run, by URL"""
+        if not self.path.exists():
+            return {}
+        articles = {article["url"]: article for article in iter_articles(self.path) if article.get("url")}
+        self.completed = len(articles)
+        return articles
+
+    def append(self, article: Dict[str, Any]):
+        """Append a finished article and flush it to disk"""
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+            # Terminate a line torn by a crash so the next record stays readable
+            if not ends_with_newline(self.path):
+                self._file.write("\n")
+        self._file.write(json.dumps(article, ensure_ascii=False) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+        self.completed += 1
+        self.last_url = article.get("url")
+        if self.completed % self.checkpoint_every == 0:
+            self.checkpoint()
+
+    def checkpoint(self, **extra):
+        """Atomically record progress (articles completed, last completed URL)"""
+        state = {
+            "completed": self.completed,
+            "last_url": self.last_url,
+            "updated_at": time.strftime('%Y-%m-%d %H:%M:%S'),
+            **extra
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=self.checkpoint_path.parent, prefix=".checkpoint-")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def clear(self):
+        """Remove the journal and checkpoint once the output file is written"""
+        self.close()
+        for path in (self.path, self.checkpoint_path):
+            if path.exists():
+                path.unlink()
+        self.completed = 0
+        self.last_url = None
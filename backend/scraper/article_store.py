@@ -0,0 +1,207 @@
+"""
+Compact binary article store with a memory-mapped offset index.
+
+All article fields are stored as raw UTF-8 in one blob; an int64 offset table
+marks where each field starts, and a sorted table of id hashes maps article
+ids to positions. Opening a store only maps the file, so load time and memory
+do not grow with the corpus; articles are decoded when accessed.
+
+Layout (little endian):
+    header   magic (8 bytes), count, field count, offsets pos, keys pos, data pos (u64 each)
+    data     UTF-8 field values, article after article
+    offsets  int64[count * fields + 1]
+    keys     uint64[count] sorted id hashes, then int64[count] article positions
+    fields   JSON list of field names (after the keys)
+
+Convert the scraped articles:
+    cd backend
+    python -m scraper.article_store ../data/scraped_articles.jsonl ../data/articles.bin
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+from pathlib import Path
+from typing import Iterable, Iterator, Dict, Any, Optional, List
+
+import numpy as np
+
+
+MAGIC = b"ARTSTOR1"
+HEADER = struct.Struct("<8sQQQQQ")
+
+# Stored as separate fields; any other keys (and non-string values) go to "extra" as JSON
+FIELDS = ("id", "url", "title", "content", "scraped_at", "extra")
+
+
+def _id_key(article_id: str) -> int:
+    return int.from_bytes(hashlib.md5(article_id.encode("utf-8")).digest()[:8], "little")
+
+
+def is_article_store(path) -> bool:
+    """Check a file's magic bytes"""
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def write_store(path, articles: Iterable[Dict[str, Any]]) -> int:
+    """
+    Write articles to a store file atomically (temp file + rename).
+
+    Returns:
+        Number of articles written
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}-")
+
+    offsets: List[int] = [0]
+    ids: List[str] = []
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(b"\0" * HEADER.size)
+            size = 0
+            for article in articles:
+                extra = {k: v for k, v in article.items() if k not in FIELDS}
+                values = []
+                for name in FIELDS[:-1]:
+                    value = article.get(name)
+                    if isinstance(value, str):
+                        values.append(value)
+                        continue
+                    # None and non-string values keep their type via "extra"
+                    if name in article:
+                        extra[name] = value
+                    values.append("" if value is None else str(value))
+                values.append(json.dumps(extra, ensure_ascii=False) if extra else "")
+                for value in values:
+                    encoded = value.encode("utf-8")
+                    f.write(encoded)
+                    size += len(encoded)
+                    offsets.append(size)
+                ids.append(values[0])
+
+            # Align the numeric tables for zero-copy views
+            f.write(b"\0" * (-f.tell() % 8))
+            offsets_pos = f.tell()
+            f.write(np.asarray(offsets, dtype="<i8").tobytes())
+
+            keys = np.asarray([_id_key(i) for i in ids], dtype="<u8")
+            order = np.argsort(keys, kind="stable")
+            keys_pos = f.tell()
+            f.write(keys[order].tobytes())
+            f.write(order.astype("<i8").tobytes())
+            f.write(json.dumps(FIELDS).encode("utf-8"))
+
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, len(ids), len(FIELDS), offsets_pos, keys_pos, HEADER.size))
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates files as 0600; give the store the usual umask-derived mode
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tmp_path, 0o666 & ~umask)
+        os.replace(tmp_path, path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+    return len(ids)
+
+
+class ArticleStore:
+    """Read-only, memory-mapped view of a store file"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, count, n_fields, offsets_pos, keys_pos, data_pos = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"Not an article store: {self.path}")
+
+        self.count = count
+        self.fields = json.loads(bytes(self._mmap[keys_pos + 16 * count:]).decode("utf-8"))
+        self._n_fields = n_fields
+        self._data_pos = data_pos
+        self._offsets = np.frombuffer(self._mmap, dtype="<i8", count=count * n_fields + 1, offset=offsets_pos)
+        self._keys = np.frombuffer(self._mmap, dtype="<u8", count=count, offset=keys_pos)
+        self._positions = np.frombuffer(self._mmap, dtype="<i8", count=count, offset=keys_pos + 8 * count)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __enter__(self) -> "ArticleStore":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        # numpy views must go before the map can be closed
+        self._offsets = self._keys = self._positions = None
+        self._mmap.close()
+        self._file.close()
+
+    def field(self, index: int, name: str) -> str:
+        """Decode a single field of the article at a position"""
+        slot = index * self._n_fields + self.fields.index(name)
+        start = self._data_pos + int(self._offsets[slot])
+        end = self._data_pos + int(self._offsets[slot + 1])
+        return self._mmap[start:end].decode("utf-8")
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        """Decode the article at a position"""
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        base = index * self._n_fields
+        bounds = self._offsets[base:base + self._n_fields + 1] + self._data_pos
+        article: Dict[str, Any] = {}
+        for name, start, end in zip(self.fields, bounds[:-1], bounds[1:]):
+            value = self._mmap[int(start):int(end)].decode("utf-8")
+            if name == "extra":
+                if value:
+                    article.update(json.loads(value))
+            else:
+                article[name] = value
+        return article
+
+    def get(self, article_id: str) -> Optional[Dict[str, Any]]:
+        """Look up an article by id (binary search over the id hashes)"""
+        key = np.uint64(_id_key(article_id))
+        slot = int(np.searchsorted(self._keys, key))
+        while slot < self.count and self._keys[slot] == key:
+            index = int(self._positions[slot])
+            if self.field(index, "id") == article_id:
+                return self[index]
+            slot += 1
+        return None
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for index in range(self.count):
+            yield self[index]
+
+
+def main():
+    import argparse
+    from .article_files import iter_articles
+
+    parser = argparse.ArgumentParser(description="Convert scraped articles (JSON/JSONL) to a binary article store")
+    parser.add_argument("source", help="Scraped articles file (JSONL or JSON array)")
+    parser.add_argument("target", help="Store file to write, e.g. data/articles.bin")
+    args = parser.parse_args()
+
+    count = write_store(args.target, iter_articles(args.source))
+    source_size = os.path.getsize(args.source)
+    target_size = os.path.getsize(args.target)
+    print(f"Wrote {count} articles to {args.target} ({source_size / 1e6:.2f} MB -> {target_size / 1e6:.2f} MB)")
+
+
+if __name__ == "__main__":
+    main()
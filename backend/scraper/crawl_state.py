@@ -0,0 +1,71 @@
+"""
+Per-URL crawl state for incremental re-crawls.
+Remembers the sitemap lastmod, HTTP validators (ETag / Last-Modified) and a
+hash of the extracted content, so later runs only fetch and re-index pages
+that changed.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+
+def article_hash(article: Dict[str, Any]) -> str:
+    """Hash of the extracted title and content"""
+    key = f"{article.get('title', '')}\n{article.get('content', '')}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+class CrawlState:
+    """URL -> {lastmod, etag, last_modified, content_hash, checked_at} stored as JSON"""
+
+    def __init__(self, path: str = None):
+        if path is None:
+            base_dir = Path(__file__).parent.parent.parent
+            path = base_dir / "data" / "crawl_state.json"
+        self.path = Path(path)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+
+        if self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.entries = json.load(f)
+            except Exception as e:
+                print(f"Error loading crawl state {self.path}: {e}")
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        return self.entries.get(url)
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since headers for a URL, if validators are known"""
+        entry = self.entries.get(url) or {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def update(self, url: str, **fields):
+        """Merge fields into a URL's entry and stamp it as checked"""
+        entry = self.entries.setdefault(url, {})
+        entry.update({key: value for key, value in fields.items() if value is not None})
+        entry["checked_at"] = time.strftime('%Y-%m-%d %H:%M:%S')
+
+    def remove(self, url: str):
+        self.entries.pop(url, None)
+
+    def save(self):
+        """Write the state atomically (temp file + rename)"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=".crawl_state-", suffix=".json")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
@@ -0,0 +1,229 @@
+"""
+Article extraction from help center HTML.
+
+Fetching (HTTP or Playwright) hands page HTML to extract_article(), a plain
+function so it can run in a process pool. Two parsers implement the same
+selectors and text normalization:
+    bs4  - BeautifulSoup over lxml (reference implementation)
+    lxml - raw lxml.html tree with XPath, several times faster
+"""
+import hashlib
+import json
+import time
+from typing import Dict, Any, Optional, List, Tuple
+
+import lxml.html
+from bs4 import BeautifulSoup, UnicodeDammit
+
+
+TITLE_SELECTORS = ['h1', '[data-testid="title"]', '.article-title', '.page-title', 'title']
+CONTENT_SELECTORS = ['main', 'article', '[role="main"]', '.article-content', '.help-article', '.content']
+UNWANTED_TAGS = ['script', 'style', 'nav', 'footer', 'header']
+UNTITLED = "Untitled Article"
+
+
+def _class_xpath(name: str) -> str:
+    return f"//*[contains(concat(' ', normalize-space(@class), ' '), ' {name} ')]"
+
+
+# XPath equivalents of the CSS selectors above, for the lxml parser
+TITLE_XPATHS = ['//h1', '//*[@data-testid="title"]', _class_xpath('article-title'), _class_xpath('page-title'), '//title']
+CONTENT_XPATHS = ['//main', '//article', '//*[@role="main"]', _class_xpath('article-content'),
+                  _class_xpath('help-article'), _class_xpath('content')]
+
+# Strings BeautifulSoup's get_text() leaves out
+NON_TEXT_TAGS = {'script', 'style', 'template'}
+
+
+def normalize_lines(text: str) -> str:
+    """Strip every line and drop empty ones"""
+    lines = [line.strip() for line in text.split('\n') if line.strip()]
+    return '\n'.join(lines)
+
+
+def next_data_text(payload: Optional[str], min_chars: int, html_to_text) -> Tuple[str, str]:
+    """
+    Extract (title, content) from a Next.js __NEXT_DATA__ payload.
+
+    The page props are searched for the longest text field (rich-text HTML is
+    converted with html_to_text); the title is the first short 'title' or
+    'headline' field. Returns ("", "") if there is no payload.
+    """
+    if not payload:
+        return "", ""
+
+    try:
+        data = json.loads(payload)
+    except ValueError:
+        return "", ""
+
+    title = ""
+    best = ""
+    stack = [data.get("props", {}).get("pageProps", {})]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            items = node.items()
+        elif isinstance(node, list):
+            items = ((None, value) for value in node)
+        else:
+            continue
+
+        for key, value in items:
+            if not isinstance(value, str):
+                stack.append(value)
+            elif key in ("title", "headline") and not title and 0 < len(value.strip()) <= 200:
+                title = value.strip()
+            elif len(value) > len(best) and len(value) >= min_chars:
+                best = value
+
+    if "<" in best and ">" in best:
+        best = html_to_text(best)
+    return title, normalize_lines(best)
+
+
+class SoupExtractor:
+    """BeautifulSoup parser (reference implementation)"""
+
+    name = "bs4"
+
+    def extract(self, html, min_chars: int) -> Tuple[str, str, str, str]:
+        """Returns (title, content, __NEXT_DATA__ title, __NEXT_DATA__ content)"""
+        soup = BeautifulSoup(html, 'lxml')
+
+        # Read the embedded data first, content extraction removes scripts
+        script = soup.find('script', id='__NEXT_DATA__')
+        next_title, next_content = next_data_text(
+            script.string if script is not None else None, min_chars,
+            lambda markup: BeautifulSoup(markup, 'lxml').get_text(separator='\n', strip=True)
+        )
+
+        return self._title(soup), self._content(soup), next_title, next_content
+
+    def _title(self, soup: BeautifulSoup) -> str:
+        for selector in TITLE_SELECTORS:
+            title_elem = soup.select_one(selector)
+            if title_elem and title_elem.get_text(strip=True):
+                return title_elem.get_text(strip=True)
+        return UNTITLED
+
+    def _content(self, soup: BeautifulSoup) -> str:
+        for selector in CONTENT_SELECTORS:
+            content_elem = soup.select_one(selector)
+            if content_elem:
+                # Remove script, style, nav, footer elements
+                for unwanted in content_elem(UNWANTED_TAGS):
+                    unwanted.decompose()
+                return normalize_lines(content_elem.get_text(separator='\n', strip=True))
+
+        # Fallback: get all paragraph text
+        paragraphs = soup.find_all('p')
+        if paragraphs:
+            text = '\n\n'.join(p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True))
+            if len(text) > 100:
+                return text
+
+        return ""
+
+
+def _strings(element, skip=()) -> List[str]:
+    """Text pieces of a subtree in document order, like BeautifulSoup's get_text()"""
+    pieces: List[str] = []
+
+    def walk(el):
+        if el.text and el.tag not in NON_TEXT_TAGS:
+            pieces.append(el.text)
+        for child in el:
+            # Comments and processing instructions have a non-string tag
+            if isinstance(child.tag, str) and child.tag not in skip:
+                walk(child)
+            if child.tail:
+                pieces.append(child.tail)
+
+    walk(element)
+    return pieces
+
+
+def _joined(element, separator: str = '', skip=()) -> str:
+    return separator.join(s.strip() for s in _strings(element, skip) if s.strip())
+
+
+class LxmlExtractor:
+    """Raw lxml parser: XPath instead of CSS selection, no soup tree"""
+
+    name = "lxml"
+
+    def extract(self, html, min_chars: int) -> Tuple[str, str, str, str]:
+        """Returns (title, content, __NEXT_DATA__ title, __NEXT_DATA__ content)"""
+        if isinstance(html, bytes):
+            # Same encoding detection as BeautifulSoup; lxml would assume Latin-1
+            html = UnicodeDammit(html, is_html=True).unicode_markup
+        if not html or not html.strip():
+            return UNTITLED, "", "", ""
+        doc = lxml.html.document_fromstring(html)
+
+        scripts = doc.xpath('//script[@id="__NEXT_DATA__"]')
+        next_title, next_content = next_data_text(
+            scripts[0].text if scripts else None, min_chars,
+            lambda markup: _joined(lxml.html.document_fromstring(markup), '\n')
+        )
+
+        return self._title(doc), self._content(doc), next_title, next_content
+
+    def _title(self, doc) -> str:
+        for xpath in TITLE_XPATHS:
+            elements = doc.xpath(xpath)
+            if elements:
+                title = _joined(elements[0])
+                if title:
+                    return title
+        return UNTITLED
+
+    def _content(self, doc) -> str:
+        for xpath in CONTENT_XPATHS:
+            elements = doc.xpath(xpath)
+            if elements:
+                return normalize_lines(_joined(elements[0], '\n', UNWANTED_TAGS))
+
+        paragraphs = [_joined(p) for p in doc.iter('p')]
+        text = '\n\n'.join(p for p in paragraphs if p)
+        return text if len(text) > 100 else ""
+
+
+EXTRACTORS = {"bs4": SoupExtractor(), "lxml": LxmlExtractor()}
+
+
+def extract_article(url: str, html, parser: str = "lxml", min_content_chars: int = 100) -> Optional[Dict[str, Any]]:
+    """
+    Build an article from page HTML (rendered or as served).
+
+    The content comes from the page markup; if that is too short (the page is
+    rendered client-side), from the article data Next.js embeds in __NEXT_DATA__.
+
+    Args:
+        url: Page URL (the article id is derived from it)
+        html: Page HTML as str or bytes
+        parser: 'lxml' (fast) or 'bs4'
+        min_content_chars: Minimum content length for a usable article
+
+    Returns:
+        Dictionary with article content and metadata, or None if neither
+        source has enough content
+    """
+    title, content, next_title, next_content = EXTRACTORS[parser].extract(html, min_content_chars)
+
+    if len(content) < min_content_chars and len(next_content) >= min_content_chars:
+        # Client-rendered page: the <title> tag is all the markup has
+        content = next_content
+        title = next_title or title
+
+    if len(content) < min_content_chars:
+        return None
+
+    return {
+        'id': hashlib.md5(url.encode()).hexdigest(),
+        'url': url,
+        'title': title,
+        'content': content,
+        'scraped_at': time.strftime('%Y-%m-%d %H:%M:%S')
+    }
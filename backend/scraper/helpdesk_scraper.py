@@ -2,24 +2,85 @@
 Web scraper for hilfe-center.1und1.de
 Extracts help articles from sitemap and uses Playwright for JavaScript-rendered content.
 """
+import argparse
+import asyncio
+import os
 import requests
 from bs4 import BeautifulSoup
 from typing import List, Dict, Any, Optional
 import time
 from pathlib import Path
 import hashlib
-import json
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+
+from .article_files import ArticleJournal, default_articles_file, iter_articles, write_articles
+from .crawl_state import CrawlState, article_hash
+from .extraction import EXTRACTORS, extract_article
+from .rate_limit import HostRateLimiter
+
+
+# Resource types the scraper never needs; blocking them saves bandwidth on both ends
+BLOCKED_RESOURCES = {"image", "media", "font"}
+
+USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
 
 
 class HelpdeskScraper:
     """Scraper for 1&1 help center articles"""
 
-    def __init__(self, base_url: str = "https://hilfe-center.1und1.de"):
+    # Elements holding the article text; rendering is done once one has enough text
+    content_selector = 'main, article, [role="main"]'
+    min_content_chars = 100
+
+    def __init__(
+        self,
+        base_url: str = "https://hilfe-center.1und1.de",
+        concurrency: int = None,
+        contexts: int = None,
+        requests_per_second: float = None
+    ):
         self.base_url = base_url
         self.sitemap_url = f"{base_url}/sitemap.xml"
         self.articles = []
 
+        # Pages scraped at once, spread over `contexts` browser contexts; all
+        # navigations share one per-host token bucket
+        self.concurrency = concurrency or int(os.getenv("SCRAPER_CONCURRENCY", "6"))
+        self.contexts = contexts or int(os.getenv("SCRAPER_CONTEXTS", "1"))
+        self.requests_per_second = requests_per_second or float(os.getenv("SCRAPER_RATE_LIMIT", "4"))
+        self.rate_limiter = HostRateLimiter(self.requests_per_second, burst=self.concurrency)
+
+        # auto: HTTP fetch first, Playwright only when the served HTML has too
+        # little content; http / browser: use only that tier
+        self.fetch_mode = os.getenv("SCRAPER_FETCH_MODE", "auto")
+        self.tier_stats = {"http": 0, "browser": 0, "failed": 0}
+
+        # Pooled HTTP session for the sitemap, conditional requests and the HTTP tier
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = USER_AGENT
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=self.concurrency)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        # Parsing runs in a process pool so fetching is never blocked by the GIL;
+        # 0 workers parses in a thread instead. lxml is the fast parser, bs4 the
+        # BeautifulSoup reference (same output)
+        self.extract_workers = int(os.getenv("SCRAPER_EXTRACT_WORKERS", str(min(4, os.cpu_count() or 1))))
+        self.parser = os.getenv("SCRAPER_PARSER", "lxml")
+        if self.parser not in EXTRACTORS:
+            raise ValueError(f"Unknown SCRAPER_PARSER: {self.parser} (expected one of {sorted(EXTRACTORS)})")
+        self._extract_pool: Optional[Executor] = None
+
+        # Directory to keep fetched pages in, as fixtures for benchmarks/extraction.py
+        self.save_html_dir = os.getenv("SCRAPER_SAVE_HTML")
+
+        # Journal receiving every finished article (set for crash-safe crawls)
+        self.journal: Optional[ArticleJournal] = None
+
+        # Validators (ETag / Last-Modified) of pages rendered by Playwright, per URL
+        self.response_headers: Dict[str, Dict[str, Optional[str]]] = {}
+
     def get_article_urls_from_sitemap(self) -> List[str]:
         """
         Fetch all article URLs from the sitemap.xml
@@ -27,23 +88,38 @@ class HelpdeskScraper:
         Returns:
             List of article URLs
         """
+        return [entry["url"] for entry in self.get_sitemap_entries()]
+
+    def get_sitemap_entries(self) -> List[Dict[str, Optional[str]]]:
+        """
+        Fetch all article URLs and their <lastmod> dates from the sitemap.xml
+
+        Returns:
+            List of dicts with 'url' and 'lastmod' (None if the sitemap has none)
+        """
         print(f"Fetching sitemap from: {self.sitemap_url}")
 
         try:
-            response = requests.get(self.sitemap_url, timeout=10)
+            response = self.session.get(self.sitemap_url, timeout=10)
             response.raise_for_status()
 
             soup = BeautifulSoup(response.content, 'xml')
-            urls = [loc.text for loc in soup.find_all('loc')]
+            entries = []
+            for loc in soup.find_all('loc'):
+                lastmod = loc.find_next_sibling('lastmod')
+                entries.append({
+                    "url": loc.text.strip(),
+                    "lastmod": lastmod.text.strip() if lastmod else None
+                })
 
-            print(f"Found {len(urls)} URLs in sitemap")
-            return urls
+            print(f"Found {len(entries)} URLs in sitemap")
+            return entries
 
         except Exception as e:
             print(f"Error fetching sitemap: {e}")
             return []
 
-    def scrape_article_with_playwright(self, url: str, page) -> Optional[Dict[str, Any]]:
+    async def scrape_article_with_playwright(self, url: str, page) -> Optional[Dict[str, Any]]:
         """
         Scrape a single help article using Playwright for JavaScript rendering.
 
@@ -55,37 +131,34 @@ class HelpdeskScraper:
             Dictionary with article content and metadata
         """
         try:
-            # Navigate to the page
-            page.goto(url, wait_until="domcontentloaded", timeout=30000)
-
-            # Wait a bit for JavaScript to load content
-            time.sleep(1)
-
-            # Get the rendered HTML
-            html = page.content()
-            soup = BeautifulSoup(html, 'lxml')
-
-            # Extract title
-            title = self._extract_title(soup)
-
-            # Extract main content
-            content = self._extract_content(soup)
-
-            if not content or len(content) < 100:
+            # Navigate to the page once the host's rate limit allows it
+            await self.rate_limiter.acquire(url)
+            response = await page.goto(url, wait_until="domcontentloaded", timeout=30000)
+            if response is not None:
+                self.response_headers[url] = {
+                    "etag": response.headers.get("etag"),
+                    "last_modified": response.headers.get("last-modified")
+                }
+
+            # Wait for JavaScript to render the article text
+            try:
+                await page.wait_for_function(
+                    """([selector, minChars]) => {
+                        const el = document.querySelector(selector);
+                        return el && el.innerText.trim().length >= minChars;
+                    }""",
+                    arg=[self.content_selector, self.min_content_chars],
+                    timeout=10000
+                )
+            except PlaywrightTimeoutError:
+                # Extract whatever rendered; short pages are skipped below
+                pass
+
+            # Get the rendered HTML and parse it in the extraction pool
+            html = await page.content()
+            article = await self.extract_in_pool(url, html)
+            if article is None:
                 print(f"  ⚠️  Skipped (insufficient content): {url}")
-                return None
-
-            # Generate unique ID
-            article_id = hashlib.md5(url.encode()).hexdigest()
-
-            article = {
-                'id': article_id,
-                'url': url,
-                'title': title,
-                'content': content,
-                'scraped_at': time.strftime('%Y-%m-%d %H:%M:%S')
-            }
-
             return article
 
         except PlaywrightTimeoutError:
@@ -95,58 +168,31 @@ class HelpdeskScraper:
             print(f"  ❌ Error scraping {url}: {e}")
             return None
 
-    def _extract_title(self, soup: BeautifulSoup) -> str:
-        """Extract article title from page"""
-        # Try different title selectors for Next.js rendered page
-        title_selectors = [
-            'h1',
-            '[data-testid="title"]',
-            '.article-title',
-            '.page-title',
-            'title'
-        ]
-
-        for selector in title_selectors:
-            title_elem = soup.select_one(selector)
-            if title_elem and title_elem.get_text(strip=True):
-                return title_elem.get_text(strip=True)
-
-        return "Untitled Article"
-
-    def _extract_content(self, soup: BeautifulSoup) -> str:
-        """Extract main article content from page"""
-        # Try different content selectors for Next.js rendered page
-        content_selectors = [
-            'main',
-            'article',
-            '[role="main"]',
-            '.article-content',
-            '.help-article',
-            '.content',
-        ]
-
-        for selector in content_selectors:
-            content_elem = soup.select_one(selector)
-            if content_elem:
-                # Remove script, style, nav, footer elements
-                for unwanted in content_elem(['script', 'style', 'nav', 'footer', 'header']):
-                    unwanted.decompose()
-
-                # Get text with preserved structure
-                text = content_elem.get_text(separator='\n', strip=True)
-
-                # Clean up excessive whitespace
-                lines = [line.strip() for line in text.split('\n') if line.strip()]
-                return '\n'.join(lines)
-
-        # Fallback: get all paragraph text
-        paragraphs = soup.find_all('p')
-        if paragraphs:
-            text = '\n\n'.join(p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True))
-            if len(text) > 100:
-                return text
-
-        return ""
+    def extract_article(self, url: str, html) -> Optional[Dict[str, Any]]:
+        """
+        Build an article from page HTML (rendered or as served), in this process.
+
+        Returns:
+            Dictionary with article content and metadata, or None if the page
+            has too little content (see extraction.extract_article)
+        """
+        return extract_article(url, html, self.parser, self.min_content_chars)
+
+    async def extract_in_pool(self, url: str, html) -> Optional[Dict[str, Any]]:
+        """Run extract_article in the extraction pool, off the event loop"""
+        if self.save_html_dir:
+            self._save_html(url, html)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._extract_pool, extract_article, url, html, self.parser, self.min_content_chars
+        )
+
+    def _save_html(self, url: str, html):
+        """Keep a page as an extraction fixture (see benchmarks/extraction.py)"""
+        path = Path(self.save_html_dir) / f"{hashlib.md5(url.encode()).hexdigest()}.html"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = html if isinstance(html, bytes) else html.encode("utf-8")
+        path.write_bytes(b"<!-- " + url.encode() + b" -->\n" + data)
 
     def scrape_all_articles(self, max_articles: int = None) -> List[Dict[str, Any]]:
         """
@@ -158,8 +204,20 @@ class HelpdeskScraper:
         Returns:
             List of article dictionaries
         """
+        return asyncio.run(self.scrape_all_articles_async(max_articles))
+
+    async def scrape_all_articles_async(self, max_articles: int = None) -> List[Dict[str, Any]]:
+        """
+        Scrape articles concurrently with a pool of Playwright pages.
+
+        Args:
+            max_articles: Maximum number of articles to scrape (None = all)
+
+        Returns:
+            List of article dictionaries, in sitemap order
+        """
         # Get URLs from sitemap
-        urls = self.get_article_urls_from_sitemap()
+        urls = await asyncio.to_thread(self.get_article_urls_from_sitemap)
 
         if not urls:
             print("No URLs found in sitemap")
@@ -169,121 +227,408 @@ class HelpdeskScraper:
             urls = urls[:max_articles]
             print(f"Limiting to first {max_articles} articles")
 
-        articles = []
+        return await self.scrape_urls(urls)
+
+    async def scrape_urls(self, urls: List[str], prefetched: Dict[str, bytes] = None) -> List[Dict[str, Any]]:
+        """
+        Scrape the given URLs, cheapest tier first.
+
+        With SCRAPER_FETCH_MODE=auto each page is first fetched over HTTP and
+        extracted from its markup or __NEXT_DATA__; only pages that yield too
+        little content are rendered with `concurrency` Playwright pages.
+        Per-tier counts are kept in tier_stats.
+
+        Args:
+            urls: Article URLs
+            prefetched: Page bodies already fetched over HTTP, by URL
+
+        Returns:
+            List of article dictionaries, in the order of `urls`
+        """
+        if not urls:
+            return []
+
+        results: Dict[int, Dict[str, Any]] = {}
+        started = time.perf_counter()
+        pending = list(enumerate(urls))
 
-        print(f"\nStarting to scrape {len(urls)} articles with Playwright...")
-        print("This may take 15-20 minutes for all articles.\n")
+        self._extract_pool = self._create_extract_pool()
+        try:
+            if self.fetch_mode in ("auto", "http"):
+                pending = await self._scrape_static(pending, results, prefetched or {})
+
+            if pending and self.fetch_mode in ("auto", "browser"):
+                await self._scrape_with_browser(pending, results)
+            else:
+                self.tier_stats["failed"] += len(pending)
+        finally:
+            self._extract_pool.shutdown(wait=False, cancel_futures=True)
+            self._extract_pool = None
+
+        elapsed = time.perf_counter() - started
+        print(f"\n✅ Successfully scraped {len(results)} articles out of {len(urls)} URLs in {elapsed:.0f}s")
+        print(f"Pages per tier: {self.tier_stats}")
+        print(f"Rate limiter wait per host (s): {self.rate_limiter.get_stats()}")
+        return [results[i] for i in sorted(results)]
+
+    async def _scrape_static(
+        self,
+        items: List[tuple],
+        results: Dict[int, Dict[str, Any]],
+        prefetched: Dict[str, bytes]
+    ) -> List[tuple]:
+        """HTTP tier: fetch and extract without a browser. Returns the items it could not handle."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        remaining = []
+
+        print(f"\nFetching {len(items)} articles over HTTP ({self.requests_per_second} requests/s per host)...")
+
+        async def fetch(item):
+            i, url = item
+            async with semaphore:
+                body = prefetched.get(url)
+                if body is None:
+                    response = await self.fetch_static(url)
+                    if response is not None and response.status_code == 200:
+                        body = response.content
+
+                article = await self.extract_in_pool(url, body) if body else None
+                if article:
+                    results[i] = article
+                    self.tier_stats["http"] += 1
+                    self._finished(article)
+                else:
+                    remaining.append(item)
+
+        await asyncio.gather(*[fetch(item) for item in items])
+        print(f"HTTP tier: {len(items) - len(remaining)}/{len(items)} articles extracted")
+        return sorted(remaining)
+
+    async def _scrape_with_browser(self, items: List[tuple], results: Dict[int, Dict[str, Any]]):
+        """Browser tier: render pages with a pool of Playwright pages"""
+        queue: asyncio.Queue = asyncio.Queue()
+        for item in items:
+            queue.put_nowait(item)
+
+        started = time.perf_counter()
+        done = 0
+
+        print(f"\nStarting to scrape {len(items)} articles with {self.concurrency} Playwright pages "
+              f"({self.requests_per_second} requests/s per host)...\n")
+
+        async def worker(page):
+            nonlocal done
+            while True:
+                try:
+                    i, url = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+
+                article = await self.scrape_article_with_playwright(url, page)
+                if article:
+                    results[i] = article
+                    self.tier_stats["browser"] += 1
+                    self._finished(article)
+                else:
+                    self.tier_stats["failed"] += 1
+
+                done += 1
+                if done % 50 == 0:
+                    elapsed = time.perf_counter() - started
+                    print(f"Progress: {done}/{len(items)} articles rendered ({done / elapsed:.1f} pages/s)")
+
+        async def block_resources(route):
+            if route.request.resource_type in BLOCKED_RESOURCES:
+                await route.abort()
+            else:
+                await route.continue_()
 
         # Use Playwright to scrape all articles
-        with sync_playwright() as p:
+        async with async_playwright() as p:
             # Launch browser (using Firefox for better macOS compatibility)
-            browser = p.firefox.launch(
+            browser = await p.firefox.launch(
                 headless=True
             )
-            context = browser.new_context(
-                user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
-                viewport={'width': 1920, 'height': 1080}
-            )
-            page = context.new_page()
+            try:
+                contexts = []
+                for _ in range(max(1, min(self.contexts, self.concurrency))):
+                    context = await browser.new_context(
+                        user_agent=USER_AGENT,
+                        viewport={'width': 1920, 'height': 1080}
+                    )
+                    await context.route("**/*", block_resources)
+                    contexts.append(context)
+
+                pages = []
+                for i in range(min(self.concurrency, len(items))):
+                    page = await contexts[i % len(contexts)].new_page()
+                    # Increase default timeout
+                    page.set_default_timeout(30000)
+                    pages.append(page)
+
+                await asyncio.gather(*[worker(page) for page in pages])
+            finally:
+                await browser.close()
 
-            # Increase default timeout
-            page.set_default_timeout(30000)
+    def _create_extract_pool(self) -> Executor:
+        if self.extract_workers > 0:
+            return ProcessPoolExecutor(max_workers=self.extract_workers)
+        return ThreadPoolExecutor(max_workers=1)
 
-            try:
-                for i, url in enumerate(urls, 1):
-                    if i % 50 == 0:
-                        print(f"Progress: {i}/{len(urls)} articles scraped ({len(articles)} successful)")
+    def _finished(self, article: Dict[str, Any]):
+        """Persist a finished article to the journal, if one is attached"""
+        if self.journal is not None:
+            self.journal.append(article)
 
-                    print(f"[{i}/{len(urls)}] Scraping: {url}")
+    async def fetch_static(self, url: str, headers: Dict[str, str] = None) -> Optional[requests.Response]:
+        """
+        Fetch a page as served (no JavaScript) through the pooled session.
 
-                    article = self.scrape_article_with_playwright(url, page)
+        Args:
+            url: Page URL
+            headers: Extra request headers, e.g. conditional request validators
 
-                    if article:
-                        articles.append(article)
+        Returns:
+            The response, or None on a connection error
+        """
+        await self.rate_limiter.acquire(url)
+        try:
+            response = await asyncio.to_thread(
+                self.session.get, url, headers=headers or {}, timeout=15, allow_redirects=True
+            )
+        except requests.RequestException:
+            return None
 
-                    # Rate limiting (be nice to the server)
-                    time.sleep(0.5)
+        if response.status_code == 200:
+            self.response_headers[url] = {
+                "etag": response.headers.get("etag"),
+                "last_modified": response.headers.get("last-modified")
+            }
+        return response
+
+    async def crawl_incremental(
+        self,
+        previous_articles: List[Dict[str, Any]],
+        state: CrawlState,
+        max_articles: int = None,
+        full: bool = False,
+        resumed: Dict[str, Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Re-crawl only pages that changed since the last run.
 
-            finally:
-                page.close()
-                context.close()
-                browser.close()
+        A page is skipped when its sitemap <lastmod> equals the stored one, or
+        when a conditional request (If-None-Match / If-Modified-Since) returns
+        304. Other pages are rendered; an article counts as changed only if its
+        extracted content hash differs. Failed fetches keep the previous article.
+
+        Args:
+            previous_articles: Articles from the last run
+            state: Crawl state store, updated in place (caller saves it)
+            max_articles: Maximum number of sitemap URLs to consider (None = all);
+                previous articles outside the limit are kept
+            full: Render every page regardless of the stored state
+            resumed: Articles an interrupted run already scraped, by URL (not fetched again)
+
+        Returns:
+            Dict with 'articles' (all current articles, sitemap order),
+            'changed' (new or modified articles), 'removed_urls' and 'stats'
+        """
+        entries = await asyncio.to_thread(self.get_sitemap_entries)
+        if not entries:
+            return {"articles": previous_articles, "changed": [], "removed_urls": [], "stats": {}}
+        if max_articles:
+            entries = entries[:max_articles]
+
+        previous = {article["url"]: article for article in previous_articles}
+        resumed = resumed or {}
+        stats = {"sitemap": len(entries), "resumed": 0, "unchanged_lastmod": 0, "not_modified": 0,
+                 "fetched": 0, "same_content": 0, "changed": 0, "failed": 0, "removed": 0}
+
+        # Cheap checks first: sitemap lastmod, then conditional requests
+        unchanged = set()
+        to_check = []
+        for entry in entries:
+            url, lastmod = entry["url"], entry["lastmod"]
+            known = state.get(url)
+            if url in resumed:
+                stats["resumed"] += 1
+                continue
+            if full or url not in previous or not known or not known.get("content_hash"):
+                continue
+            if lastmod and known.get("lastmod") == lastmod:
+                unchanged.add(url)
+                stats["unchanged_lastmod"] += 1
+            elif state.conditional_headers(url):
+                to_check.append(entry)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        prefetched: Dict[str, bytes] = {}
+
+        async def check(entry):
+            async with semaphore:
+                url = entry["url"]
+                response = await self.fetch_static(url, state.conditional_headers(url))
+                if response is None:
+                    return
+                if response.status_code == 304:
+                    unchanged.add(url)
+                    stats["not_modified"] += 1
+                    state.update(url, lastmod=entry["lastmod"])
+                elif response.status_code == 200:
+                    # Reused by the HTTP fetch tier instead of fetching again
+                    prefetched[url] = response.content
+
+        await asyncio.gather(*[check(entry) for entry in to_check])
+
+        to_fetch = [entry["url"] for entry in entries if entry["url"] not in unchanged and entry["url"] not in resumed]
+        stats["fetched"] = len(to_fetch)
+        print(f"Incremental crawl: {len(unchanged)} unchanged, {len(to_fetch)} to fetch")
+
+        fetched = dict(resumed)
+        fetched.update((article["url"], article) for article in await self.scrape_urls(to_fetch, prefetched))
 
-        print(f"\n✅ Successfully scraped {len(articles)} articles out of {len(urls)} URLs")
-        return articles
+        articles = []
+        changed = []
+        for entry in entries:
+            url = entry["url"]
+            article = fetched.get(url)
+            if article is None:
+                if url in to_fetch:
+                    stats["failed"] += 1
+                if url in previous:
+                    articles.append(previous[url])
+                continue
+
+            digest = article_hash(article)
+            validators = self.response_headers.get(url, {})
+            state.update(url, lastmod=entry["lastmod"], content_hash=digest, **validators)
+
+            if url in previous and article_hash(previous[url]) == digest:
+                stats["same_content"] += 1
+                articles.append(previous[url])
+            else:
+                stats["changed"] += 1
+                articles.append(article)
+                changed.append(article)
+
+        removed_urls = []
+        if max_articles:
+            # A limited crawl only covers part of the sitemap; the rest of the
+            # corpus is kept as it was
+            processed = {entry["url"] for entry in entries}
+            articles.extend(article for url, article in previous.items() if url not in processed)
+        else:
+            sitemap_urls = {entry["url"] for entry in entries}
+            removed_urls = [url for url in previous if url not in sitemap_urls]
+            for url in removed_urls:
+                state.remove(url)
+            stats["removed"] = len(removed_urls)
+
+        print(f"Incremental crawl stats: {stats}")
+        return {"articles": articles, "changed": changed, "removed_urls": removed_urls, "stats": stats}
 
     def save_articles(self, articles: List[Dict[str, Any]], output_file: str = None):
-        """Save scraped articles to JSON file"""
+        """Save scraped articles to a JSONL file (atomically replaced)"""
         if output_file is None:
-            base_dir = Path(__file__).parent.parent.parent
-            output_file = base_dir / "data" / "scraped_articles.json"
+            output_file = default_articles_file().with_suffix(".jsonl")
 
         output_path = Path(output_file)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(articles, f, indent=2, ensure_ascii=False)
+        count = write_articles(output_path, articles)
 
-        print(f"💾 Saved {len(articles)} articles to {output_path}")
+        print(f"💾 Saved {count} articles to {output_path}")
 
     def load_articles(self, input_file: str = None) -> List[Dict[str, Any]]:
-        """Load previously scraped articles from JSON file"""
+        """Load previously scraped articles from a JSONL (or legacy JSON) file"""
         if input_file is None:
-            base_dir = Path(__file__).parent.parent.parent
-            input_file = base_dir / "data" / "scraped_articles.json"
+            input_file = default_articles_file()
 
         input_path = Path(input_file)
 
         if not input_path.exists():
             return []
 
-        with open(input_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return list(iter_articles(input_path))
 
 
 def main():
     """Main function for standalone scraping"""
+    parser = argparse.ArgumentParser(description="Scrape the 1&1 help center")
+    parser.add_argument("--full", action="store_true", help="Render every page, ignoring the crawl state")
+    parser.add_argument("--max-articles", type=int, help="Only consider the first N sitemap URLs")
+    parser.add_argument("--restart", action="store_true", help="Discard the progress of an interrupted run")
+    args = parser.parse_args()
+
     scraper = HelpdeskScraper()
+    state = CrawlState()
+    previous_articles = scraper.load_articles()
+    output_file = default_articles_file().with_suffix(".jsonl")
+
+    # Finished articles are journaled as they come in, so a crash loses nothing
+    journal = ArticleJournal(output_file)
+    if args.restart:
+        journal.clear()
+    resumed = journal.resume()
+    scraper.journal = journal
 
     print("=" * 60)
     print("1&1 Hilfe-Center Article Scraper")
     print("=" * 60)
     print("This scraper will:")
-    print("  1. Fetch all article URLs from sitemap.xml")
-    print("  2. Use Playwright (headless browser) to scrape JS-rendered content")
-    print("  3. Save articles to JSON and import to ChromaDB")
-    print(f"  4. Estimated: ~976 articles, ~15-20 minutes")
+    print("  1. Fetch all article URLs and lastmod dates from sitemap.xml")
+    print("  2. Skip pages unchanged since the last run (lastmod, ETag / Last-Modified)")
+    print(f"  3. Fetch pages over HTTP; render with {scraper.concurrency} Playwright pages (headless browser)")
+    print(f"     only where the served HTML lacks the content, at up to {scraper.requests_per_second} requests/s")
+    print("  4. Save articles to JSONL and import changed ones to ChromaDB")
+    print(f"  5. Estimated for a full crawl: ~976 articles, at least ~{976 / scraper.requests_per_second / 60:.0f} minutes")
     print("=" * 60)
     print()
 
-    # Scrape articles (no max limit to get all)
-    articles = scraper.scrape_all_articles()
+    if resumed:
+        print(f"Resuming interrupted run: {len(resumed)} articles already scraped ({journal.path})")
+
+    try:
+        result = asyncio.run(scraper.crawl_incremental(
+            previous_articles, state, max_articles=args.max_articles, full=args.full, resumed=resumed
+        ))
+    finally:
+        journal.checkpoint()
+        journal.close()
+    articles = result["articles"]
 
     if not articles:
         print("\n❌ No articles scraped. Check the output above for errors.")
         return
 
-    print(f"\n✅ Scraped {len(articles)} articles")
+    print(f"\n✅ {len(articles)} articles, {len(result['changed'])} new or changed, "
+          f"{len(result['removed_urls'])} removed")
+
+    # Save to file, then the state that describes it; the run is complete
+    scraper.save_articles(articles, output_file)
+    state.save()
+    journal.clear()
 
-    # Save to file
-    scraper.save_articles(articles)
+    if not result["changed"] and not result["removed_urls"]:
+        print("Nothing changed, vector DB is up to date")
+        return
 
     # Import to vector database
-    print("\nImporting to ChromaDB vector database...")
+    print("\nImporting changes to ChromaDB vector database...")
     from vector_db.chroma_client import VectorDBClient
 
     vector_db = VectorDBClient()
 
-    documents = [a['content'] for a in articles]
-    metadatas = [{'title': a['title'], 'url': a['url']} for a in articles]
-    ids = [a['id'] for a in articles]
-
-    result = vector_db.add_documents(documents, metadatas, ids)
-    print(f"✅ Vector DB import result: {result}")
+    # Only new or changed articles are embedded; removed ones are deleted
+    import_result = vector_db.sync_articles(result["changed"], remove_missing=False)
+    print(f"✅ Vector DB import result: {import_result}")
+    removed_ids = [hashlib.md5(url.encode()).hexdigest() for url in result["removed_urls"]]
+    if removed_ids:
+        print(f"🗑️  Vector DB delete result: {vector_db.delete_articles(removed_ids)}")
 
     # Show stats
     stats = vector_db.get_stats()
-    print(f"\n📊 Vector DB now contains: {stats.get('count', 0)} articles")
+    print(f"\n📊 Vector DB now contains: {stats.get('document_count', 0)} passages")
 
 
 if __name__ == "__main__":
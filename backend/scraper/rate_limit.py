@@ -0,0 +1,59 @@
+"""
+Token-bucket rate limiting for the scraper.
+One bucket per host is shared by all concurrent pages, so the request rate
+against the help center stays bounded no matter how many pages are open.
+"""
+import asyncio
+import time
+from typing import Dict, Any
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    """Allows `rate` acquisitions per second on average, with bursts up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.waited = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        """Wait until a token is available and take it"""
+        # The lock queues waiters in FIFO order
+        async with self._lock:
+            self._refill()
+            if self.tokens < 1.0:
+                delay = (1.0 - self.tokens) / self.rate
+                self.waited += delay
+                await asyncio.sleep(delay)
+                self._refill()
+            self.tokens -= 1.0
+
+
+class HostRateLimiter:
+    """Per-host token buckets"""
+
+    def __init__(self, rate: float, burst: float = 1.0):
+        self.rate = rate
+        self.burst = burst
+        self.buckets: Dict[str, TokenBucket] = {}
+
+    async def acquire(self, url: str):
+        """Wait for a request slot for the URL's host"""
+        host = urlparse(url).netloc
+        bucket = self.buckets.get(host)
+        if bucket is None:
+            bucket = self.buckets[host] = TokenBucket(self.rate, self.burst)
+        await bucket.acquire()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Seconds spent waiting for tokens, per host"""
+        return {host: round(bucket.waited, 2) for host, bucket in self.buckets.items()}
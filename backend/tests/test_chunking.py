@@ -0,0 +1,95 @@
+"""Tests for article chunking (vector_db/chunking.py)"""
+from vector_db.chunking import split_article, split_blocks, estimate_tokens, group_by_article
+
+
+def paragraphs(n, length=200):
+    """n distinct sentences of about `length` characters"""
+    return [(f"Absatz {i} " + "wort " * length)[:length - 1].strip() + "." for i in range(n)]
+
+
+def article(content, **fields):
+    return {"id": "art1", "title": "Router einrichten", "url": "https://example.com/router",
+            "content": content, **fields}
+
+
+def test_short_article_is_one_chunk():
+    chunks = split_article(article("Erster Satz.\nZweiter Satz."))
+    assert len(chunks) == 1
+    assert chunks[0]["id"] == "art1:0"
+    assert chunks[0]["text"] == "Erster Satz.\nZweiter Satz."
+    assert chunks[0]["metadata"]["chunk_count"] == 1
+
+
+def test_chunks_respect_size_and_split_on_paragraphs():
+    blocks = paragraphs(12)
+    chunks = split_article(article("\n".join(blocks)), chunk_size=1000, overlap=0)
+    assert len(chunks) > 1
+    for chunk in chunks:
+        assert len(chunk["text"]) <= 1000
+        for line in chunk["text"].split("\n"):
+            assert line in blocks
+
+
+def test_chunks_overlap_by_whole_paragraphs():
+    chunks = split_article(article("\n".join(paragraphs(12))), chunk_size=1000, overlap=250)
+    for previous, following in zip(chunks, chunks[1:]):
+        assert following["text"].split("\n")[0] == previous["text"].split("\n")[-1]
+
+
+def test_heading_starts_a_new_chunk_without_overlap():
+    blocks = paragraphs(3) + ["WLAN einrichten"] + paragraphs(2)
+    chunks = split_article(article("\n".join(blocks)), chunk_size=1000, overlap=250)
+    assert chunks[1]["text"].startswith("WLAN einrichten")
+
+
+def test_long_paragraph_is_split_on_sentences():
+    sentences = [f"Satz Nummer {i} erklärt eine Einstellung am Router." for i in range(60)]
+    chunks = split_article(article(" ".join(sentences)), chunk_size=300, overlap=0)
+    assert len(chunks) > 1
+    for chunk in chunks:
+        assert len(chunk["text"]) <= 300
+        assert chunk["text"].endswith(".")
+
+
+def test_chunk_metadata_maps_to_the_article():
+    chunks = split_article(article("\n".join(paragraphs(12))), chunk_size=1000)
+    assert [c["metadata"]["chunk_index"] for c in chunks] == list(range(len(chunks)))
+    for chunk in chunks:
+        assert chunk["metadata"]["article_id"] == "art1"
+        assert chunk["metadata"]["chunk_count"] == len(chunks)
+        assert chunk["metadata"]["title"] == "Router einrichten"
+
+
+def test_missing_title_and_url_give_string_metadata():
+    # Chroma rejects None metadata values, and the article store keeps None fields
+    chunks = split_article(article("Text.", title=None, url=None))
+    assert chunks[0]["metadata"]["title"] == ""
+    assert chunks[0]["metadata"]["url"] == ""
+    assert all(value is not None for value in chunks[0]["metadata"].values())
+
+
+def test_article_id_falls_back_to_url_hash():
+    chunks = split_article(article("Text.", id=None))
+    assert chunks[0]["metadata"]["article_id"] != ""
+    assert chunks[0]["metadata"]["article_id"] == split_article(article("Anderer Text.", id=None))[0]["metadata"]["article_id"]
+
+
+def test_inline_link_lines_are_joined():
+    assert split_blocks("Mehr Infos auf unserer\nWebsite\n.\nNächster Satz.") == [
+        "Mehr Infos auf unserer Website.", "Nächster Satz."]
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcd") == 1
+    assert estimate_tokens("abcde") == 2
+
+
+def test_group_by_article_keeps_best_first_and_reading_order():
+    docs = ["b1", "a0", "b0"]
+    metas = [{"article_id": "b", "chunk_index": 1}, {"article_id": "a", "chunk_index": 0},
+             {"article_id": "b", "chunk_index": 0}]
+    articles = group_by_article(docs, metas, [0.1, 0.2, 0.3])
+    assert [a["article_id"] for a in articles] == ["b", "a"]
+    assert [p["text"] for p in articles[0]["passages"]] == ["b0", "b1"]
+    assert articles[0]["distance"] == 0.1
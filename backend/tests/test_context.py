@@ -0,0 +1,86 @@
+"""Tests for context budget allocation (api/context.py)"""
+import pytest
+
+from api.context import ContextBuilder
+from vector_db.chunking import estimate_tokens
+
+
+def search_results(n, words=400):
+    """n distinct single-passage articles, best first"""
+    documents, metadatas = [], []
+    for i in range(n):
+        documents.append(" ".join(f"begriff{i}x{j}" for j in range(words)) + ".")
+        metadatas.append({"article_id": f"a{i}", "title": f"Artikel {i}", "url": f"https://example.com/{i}"})
+    return {
+        "query": "begriff",
+        "documents": [documents],
+        "metadatas": [metadatas],
+        "distances": [[0.1 + i / 100 for i in range(n)]],
+    }
+
+
+def assemble(results, budget, **kwargs):
+    return ContextBuilder(default_budget=budget, **kwargs).assemble(results)
+
+
+@pytest.mark.parametrize("budget, expected", [(300, 4), (350, 5), (400, 5), (450, 5)])
+def test_small_budgets_keep_top_articles(budget, expected):
+    stats = assemble(search_results(5), budget)
+    assert stats["articles_used"] == expected
+    assert stats["dropped_budget"] == 5 - expected
+    assert stats["tokens"] <= budget
+
+
+def test_lower_ranked_articles_are_dropped_first():
+    stats = assemble(search_results(5), 300)
+    assert "Title: Artikel 3" in stats["text"]
+    assert "Artikel 4" not in stats["text"]
+
+
+def test_every_article_gets_the_minimum():
+    builder = ContextBuilder(default_budget=400, min_article_tokens=50)
+    text = builder.assemble(search_results(5))["text"]
+    bodies = [part.split("\n\n", 1)[1] for part in text.split("## Article ")[1:]]
+    assert len(bodies) == 5
+    assert all(estimate_tokens(body.strip()) >= 45 for body in bodies)
+
+
+def test_short_articles_are_kept_whole_and_leave_budget_to_long_ones():
+    results = search_results(2)
+    results["documents"][0][0] = "Kurzer Hinweis zum Router."
+    text = assemble(results, 400)["text"]
+    assert "Kurzer Hinweis zum Router." in text
+    assert estimate_tokens(text) > 300
+
+
+def test_budget_too_small_for_any_article():
+    stats = assemble(search_results(3), 30)
+    assert stats["text"] == ""
+    assert stats["articles_used"] == 0
+    assert stats["dropped_budget"] == 3
+
+
+def test_large_budget_uses_full_articles():
+    results = search_results(3, words=20)
+    stats = assemble(results, 4000)
+    assert stats["articles_used"] == 3
+    assert stats["dropped_budget"] == 0
+    for document in results["documents"][0]:
+        assert document in stats["text"]
+
+
+def test_duplicates_and_distance_are_dropped_before_budgeting():
+    results = search_results(3)
+    results["documents"][0][1] = results["documents"][0][0]
+    stats = assemble(results, 4000, max_distance=0.115)
+    assert stats["dropped_duplicates"] == 1
+    assert stats["dropped_distance"] == 1
+    assert stats["articles_used"] == 1
+
+
+def test_model_budget_prefix():
+    builder = ContextBuilder(default_budget=2000, model_budgets={"gpt-4": 1000, "gpt-4o": 3000})
+    assert builder.budget_for("gpt-4o-mini") == 3000
+    assert builder.budget_for("gpt-4-turbo") == 1000
+    assert builder.budget_for("claude-3") == 2000
+    assert builder.budget_for(None) == 2000
@@ -0,0 +1,46 @@
+"""Tests for the rule-based intent classifier (api/intent.py)"""
+import asyncio
+
+import pytest
+
+from api.intent import RuleIntentClassifier, is_gibberish_word
+
+
+def classify(text, known_word=None):
+    return asyncio.run(RuleIntentClassifier(known_word).classify([{"role": "user", "content": text}]))
+
+
+@pytest.mark.parametrize("word", ["Wert", "VDSL", "HTTP", "WLAN", "DSL", "vdsl", "http", "Router", "Glasfaser", "5G"])
+def test_real_terms_are_not_gibberish(word):
+    assert not is_gibberish_word(word)
+
+
+@pytest.mark.parametrize("word", ["asdfgh", "qwertzu", "sdfghjk", "xkcdq"])
+def test_keyboard_runs_and_vowelless_strings_are_gibberish(word):
+    assert is_gibberish_word(word)
+
+
+def test_corpus_words_are_never_gibberish():
+    assert is_gibberish_word("https")
+    assert not is_gibberish_word("https", known_word=lambda word: word == "https")
+
+
+@pytest.mark.parametrize("text", [
+    "Welchen Wert hat mein VDSL Anschluss?",
+    "HTTP Fehler beim WLAN Router",
+    "Wert der VDSL Leitung prüfen",
+])
+def test_questions_with_acronyms_search(text):
+    result = classify(text)
+    assert result["needs_search"] is True
+    assert result["query"] == text
+
+
+def test_keyboard_mashing_is_skipped():
+    result = classify("asdfgh qwertz")
+    assert result["needs_search"] is False
+    assert result["reason"] == "Keine erkennbare Anfrage"
+
+
+def test_greeting_is_skipped():
+    assert classify("Hallo")["needs_search"] is False
@@ -0,0 +1,83 @@
+"""Tests for BM25 ranking and rank fusion (vector_db/lexical_index.py)"""
+import pytest
+
+from vector_db.lexical_index import LexicalIndex, analyze, stem, reciprocal_rank_fusion
+
+
+def chunk(chunk_id, text, title=""):
+    return {"id": chunk_id, "text": text, "metadata": {"title": title, "article_id": chunk_id}}
+
+
+@pytest.fixture
+def index():
+    return LexicalIndex.build([
+        chunk("glas", "Der Glasfaser Anschluss wird vom Techniker installiert.", "Glasfaser"),
+        chunk("dsl", "Der DSL Anschluss funktioniert über die Telefonleitung. DSL ist weit verbreitet."),
+        chunk("router", "Die FRITZ!Box 7590 ist ein Router für DSL."),
+        chunk("mobil", "Mit 5G surfen Sie mobil besonders schnell."),
+    ])
+
+
+def test_stemming_merges_inflections():
+    assert stem("Anschlüsse") == stem("Anschluss")
+    assert stem("Routern") == stem("Router")
+    assert stem("gesurft") == stem("surft")
+
+
+def test_analyze_drops_stopwords_and_keeps_digit_tokens():
+    assert analyze("Der Router und die 7590") == [stem("Router"), "7590"]
+
+
+def test_bm25_ranks_by_term_frequency(index):
+    ranked = [index.keys[i] for i, _ in index.search("DSL")]
+    assert ranked[:2] == ["dsl", "router"]
+    scores = [score for _, score in index.search("DSL")]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_only_matching_documents_are_returned(index):
+    assert [index.keys[i] for i, _ in index.search("5G")] == ["mobil"]
+    assert index.search("Kabelfernsehen") == []
+    assert index.search("der und die") == []
+
+
+def test_rare_terms_outweigh_common_ones(index):
+    top, _ = index.search("Anschluss Telefonleitung")[0]
+    assert index.keys[top] == "dsl"
+
+
+def test_title_is_indexed():
+    index = LexicalIndex.build([chunk("a", "Schritt für Schritt erklärt.", "Rufnummer mitnehmen")])
+    assert [index.keys[i] for i, _ in index.search("Rufnummer")] == ["a"]
+
+
+def test_k_limits_results(index):
+    assert len(index.search("Anschluss DSL Router", k=2)) == 2
+
+
+def test_contains(index):
+    assert index.contains("Anschlüsse")
+    assert index.contains("7590")
+    assert not index.contains("7490")
+    assert not index.contains("Kabel")
+
+
+def test_save_and_load_round_trip(index, tmp_path):
+    path = tmp_path / "lexical.npz"
+    index.fingerprint = "v1"
+    index.save(str(path))
+    loaded = LexicalIndex.load(str(path))
+    assert loaded.fingerprint == "v1"
+    assert loaded.search("DSL") == index.search("DSL")
+    assert loaded.get(0) == index.get(0)
+
+
+def test_reciprocal_rank_fusion():
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["b", "c", "d"]], k=60)
+    assert [key for key, _ in fused] == ["b", "c", "a", "d"]
+    assert fused[0][1] == pytest.approx(1 / 62 + 1 / 61)
+    assert fused[-1][1] == pytest.approx(1 / 63)
+
+
+def test_reciprocal_rank_fusion_empty():
+    assert reciprocal_rank_fusion([[], []]) == []
@@ -0,0 +1,83 @@
+"""Anthropic cache breakpoints (ChatService._prepare_anthropic_messages) against the stub provider's prefix cache"""
+import json
+
+import pytest
+
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from api.chat import ChatService  # noqa: E402
+from benchmarks.stub_provider import create_stub_app  # noqa: E402
+
+
+SYSTEM = "Du bist der Kundenservice-Assistent von 1&1. " * 20
+ANSWER = "Die eSIM aktivieren Sie im Control-Center unter Verträge. " * 20
+
+
+class _VectorDB:
+    def is_known_term(self, word):
+        return False
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setenv("PROMPT_CACHING", "true")
+    monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    return ChatService(None, _VectorDB())
+
+
+@pytest.fixture
+def stub():
+    return TestClient(create_stub_app(tokens_per_response=1, token_delay=0, cache_min_tokens=100))
+
+
+def send(service, stub, messages, context=""):
+    """Send a turn to the stub; returns the prepared messages and the reported usage"""
+    system, prepared = service._prepare_anthropic_messages(messages, {"system_prompt": SYSTEM}, context)
+    response = stub.post("/v1/messages", json={
+        "model": "claude-stub", "max_tokens": 10, "stream": True, "system": system, "messages": prepared})
+    assert response.status_code == 200
+    start = next(line for line in response.text.splitlines() if '"message_start"' in line)
+    return prepared, json.loads(start[len("data: "):])["message"]["usage"]
+
+
+def text_blocks(prepared):
+    return [block for msg in prepared if isinstance(msg["content"], list) for block in msg["content"]]
+
+
+@pytest.mark.parametrize("answer", [ANSWER, [{"type": "text", "text": ANSWER}]], ids=["string", "blocks"])
+def test_previous_turn_is_read_from_cache(service, stub, answer):
+    history = [{"role": "user", "content": "Wie aktiviere ich meine eSIM?"}, {"role": "assistant", "content": answer}]
+
+    prepared, usage = send(service, stub, history + [{"role": "user", "content": "Und danach?"}], "Kontext A")
+    assert usage["cache_creation_input_tokens"] > 0
+    # The marker sits on the last block of the previous turn, never nested
+    assert prepared[-2]["content"] == [{"type": "text", "text": ANSWER, "cache_control": {"type": "ephemeral"}}]
+    assert prepared[-1]["content"] == [{"type": "text", "text": "Kontext A"}, {"type": "text", "text": "Und danach?"}]
+
+    history += [{"role": "user", "content": "Und danach?"}, {"role": "assistant", "content": "Fertig."}]
+    _, usage = send(service, stub, history + [{"role": "user", "content": "Danke"}], "Kontext B")
+    read = usage["cache_read_input_tokens"]
+    assert read > 0
+    assert usage["input_tokens"] < read
+
+
+def test_empty_previous_turn_gets_no_text_block(service, stub):
+    messages = [
+        {"role": "user", "content": "Wie aktiviere ich meine eSIM?"},
+        {"role": "assistant", "content": ""},
+        {"role": "user", "content": "Hallo?"},
+    ]
+    prepared, usage = send(service, stub, messages, "Kontext")
+    assert prepared[1]["content"] == ""
+    assert all(block["text"] for block in text_blocks(prepared))
+    assert usage["cache_read_input_tokens"] == 0
+
+
+def test_list_content_of_the_latest_message_is_not_nested(service, stub):
+    messages = [{"role": "user", "content": [{"type": "text", "text": "Wie aktiviere ich meine eSIM?"}]}]
+    prepared, _ = send(service, stub, messages, "Kontext")
+    assert prepared[0]["content"] == [{"type": "text", "text": "Kontext"},
+                                      {"type": "text", "text": "Wie aktiviere ich meine eSIM?"}]
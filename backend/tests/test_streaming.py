@@ -0,0 +1,129 @@
+"""Tests for SSE content coalescing (api/streaming.py)"""
+import asyncio
+
+import pytest
+
+from api.events import ChatEvent, CONTENT, DONE, TOOL_CALL_START
+from api.streaming import SSEStream
+
+
+async def source(items):
+    """Yield events; a number instead of an event sleeps that many seconds"""
+    for item in items:
+        if isinstance(item, (int, float)):
+            await asyncio.sleep(item)
+        else:
+            yield item
+
+
+def content(delta):
+    return ChatEvent(CONTENT, {"delta": delta})
+
+
+def coalesce(items, window_ms=30, max_bytes=512):
+    async def run():
+        return [event async for event in SSEStream(window_ms, max_bytes).coalesce(source(items))]
+    return asyncio.run(run())
+
+
+def deltas(events):
+    return [e.data["delta"] if e.type == CONTENT else e.type for e in events]
+
+
+def test_first_token_is_sent_at_once():
+    events = coalesce([content("Hal"), content("lo"), content(" Welt"), ChatEvent(DONE)])
+    assert deltas(events) == ["Hal", "lo Welt", DONE]
+
+
+def test_flush_at_byte_threshold():
+    events = coalesce([content("a")] + [content("xy")] * 5 + [ChatEvent(DONE)], max_bytes=4)
+    assert deltas(events) == ["a", "xyxy", "xyxy", "xy", DONE]
+
+
+def test_flush_when_window_closes_during_a_stall():
+    events = coalesce([content("a"), content("b"), content("c"), 0.2, content("d"), ChatEvent(DONE)], window_ms=20)
+    assert deltas(events) == ["a", "bc", "d", DONE]
+
+
+def test_other_events_flush_buffered_content_first():
+    events = coalesce([content("a"), content("b"), ChatEvent(TOOL_CALL_START, {"name": "search"}), content("c")])
+    assert deltas(events) == ["a", "b", TOOL_CALL_START, "c"]
+
+
+def test_empty_deltas_are_dropped():
+    events = coalesce([content("a"), content(""), content("b")])
+    assert deltas(events) == ["a", "b"]
+
+
+def test_zero_window_passes_every_delta_through():
+    items = [content("a"), content("b"), content("c"), ChatEvent(DONE)]
+    assert deltas(coalesce(items, window_ms=0)) == ["a", "b", "c", DONE]
+
+
+def test_encode_counts_frames():
+    stream = SSEStream(window_ms=30, max_bytes=512)
+
+    async def run():
+        return [frame async for frame in stream.encode(source([content("a"), content("b"), content("c"), ChatEvent(DONE)]))]
+
+    frames = asyncio.run(run())
+    stats = stream.get_stats()
+    assert len(frames) == stats["frames"] == 3
+    assert stats["content_events"] == 3
+    assert stats["content_frames"] == 2
+    assert stats["bytes"] == sum(len(frame) for frame in frames)
+
+
+def tracked_source(items, log):
+    """Like source(), recording the task of every step and whether the stream was closed"""
+    async def generate():
+        try:
+            for item in items:
+                log["tasks"].add(asyncio.current_task())
+                if isinstance(item, (int, float)):
+                    await asyncio.sleep(item)
+                else:
+                    yield item
+        finally:
+            log["tasks"].add(asyncio.current_task())
+            log["closed"] = True
+    return generate()
+
+
+def test_upstream_runs_and_closes_on_one_task_when_the_client_leaves():
+    log = {"tasks": set(), "closed": False}
+
+    async def run():
+        stream = SSEStream(30, 512).coalesce(tracked_source([content("a"), content("b"), 10, content("c")], log))
+        assert (await stream.__anext__()).data["delta"] == "a"
+        assert (await stream.__anext__()).data["delta"] == "b"
+        await stream.aclose()
+
+    asyncio.run(run())
+    assert log["closed"]
+    assert len(log["tasks"]) == 1
+
+
+def test_zero_window_closes_upstream():
+    log = {"tasks": set(), "closed": False}
+
+    async def run():
+        stream = SSEStream(0, 512).coalesce(tracked_source([content("a"), content("b")], log))
+        await stream.__anext__()
+        await stream.aclose()
+
+    asyncio.run(run())
+    assert log["closed"]
+
+
+def test_upstream_errors_reach_the_consumer():
+    async def failing():
+        yield content("a")
+        yield content("b")
+        raise RuntimeError("upstream failed")
+
+    async def run():
+        return [event async for event in SSEStream(30, 512).coalesce(failing())]
+
+    with pytest.raises(RuntimeError, match="upstream failed"):
+        asyncio.run(run())
@@ -2,41 +2,176 @@
 ChromaDB client for vector storage and retrieval.
 Manages embeddings and semantic search for the knowledge base.
 """
-import chromadb
-from chromadb.config import Settings
-from typing import List, Dict, Any, Optional
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Callable, Iterable, Set
 from pathlib import Path
 import os
 
+from .chunking import article_id, split_article, embedding_text, group_by_article, result_article_key, content_hash
+from .lexical_index import LexicalIndex, reciprocal_rank_fusion
+from scraper.article_files import default_articles_file, iter_articles
+
+
+class SearchQueueFullError(Exception):
+    """Raised when too many searches are already pending on the executor"""
+
 
 class VectorDBClient:
     """ChromaDB client for vector operations"""
 
-    def __init__(self, persist_directory: str = None):
+    def __init__(
+        self,
+        persist_directory: str = None,
+        search_workers: int = None,
+        max_pending_searches: int = None,
+        articles_file: str = None
+    ):
+        base_dir = Path(__file__).parent.parent.parent
         if persist_directory is None:
             # Default to project's data directory
-            base_dir = Path(__file__).parent.parent.parent
             persist_directory = str(base_dir / "data" / "chroma")
 
         # Ensure directory exists
         Path(persist_directory).mkdir(parents=True, exist_ok=True)
+        self.persist_directory = str(persist_directory)
+
+        # The Chroma client, collection and embedding model are opened on first
+        # use (or by warm_up()) so constructing the client stays cheap
+        self.collection_name = "helpdesk_chunks"
+        self._client = None
+        self._collection = None
+        self._embedding_function = None
+        self._open_lock = threading.Lock()
+        self.warm = {"collection": False, "embedder": False, "lexical_index": False}
+
+        # Passage chunking and retrieval settings
+        self.chunk_size = int(os.getenv("CHUNK_SIZE", "1000"))
+        self.chunk_overlap = int(os.getenv("CHUNK_OVERLAP", "150"))
+        self.chunk_overfetch = int(os.getenv("SEARCH_CHUNK_OVERFETCH", "3"))
+
+        # Bumped on every write so caches can drop stale search results
+        self.version = 0
+
+        # BM25 index over the scraped articles, fused with the vector results
+        # (SEARCH_MODE=hybrid) or used alone (lexical). Built on first use and
+        # persisted; rebuilt when the articles file or chunk settings change
+        # (checked on every search and after sync_articles / delete_articles).
+        self.search_mode = os.getenv("SEARCH_MODE", "hybrid")
+        self.articles_file = Path(articles_file or default_articles_file())
+        self.lexical_index_path = Path(os.getenv("LEXICAL_INDEX_PATH") or base_dir / "data" / "lexical_index.npz")
+        self._lexical_index: Optional[LexicalIndex] = None
+        # Fingerprint at which loading/building last failed; not retried until it changes
+        self._lexical_failed: Optional[str] = None
+        self._lexical_lock = threading.Lock()
+
+        # Thread pool for search_async. Query embedding (ONNX) and HNSW lookup
+        # release the GIL, so threads run searches in parallel and always see
+        # the collection and lexical index as updated by sync_articles().
+        self.search_workers = search_workers or int(os.getenv("VECTOR_SEARCH_WORKERS", "4"))
+        self.max_pending_searches = max_pending_searches or int(os.getenv("VECTOR_SEARCH_MAX_PENDING", "64"))
+        self._search_pool: Optional[ThreadPoolExecutor] = None
+        self._pending_searches = 0
+        self._rejected_searches = 0
+
+        # Progress of the last sync_articles() run
+        self.sync_status: Dict[str, Any] = {"state": "idle"}
+
+    def _open(self):
+        """Open the persistent Chroma client and the passage collection"""
+        with self._open_lock:
+            if self._collection is not None:
+                return
 
-        # Initialize ChromaDB client with persistence
-        self.client = chromadb.PersistentClient(
-            path=persist_directory,
-            settings=Settings(
-                anonymized_telemetry=False,
-                allow_reset=True
+            # Imported here: chromadb adds ~0.5s to the application import
+            import chromadb
+            from chromadb.config import Settings
+            from chromadb.utils import embedding_functions
+
+            # Initialize ChromaDB client with persistence
+            client = chromadb.PersistentClient(
+                path=self.persist_directory,
+                settings=Settings(
+                    anonymized_telemetry=False,
+                    allow_reset=True
+                )
             )
-        )
 
-        # Get or create collection
-        self.collection_name = "helpdesk_articles"
-        self.collection = self.client.get_or_create_collection(
-            name=self.collection_name,
-            metadata={"description": "1&1 help center articles"}
+            # Get or create collection (embedding function kept so queries can be
+            # embedded once and reused, e.g. by the semantic cache).
+            # Articles are stored as passages; see vector_db/chunking.py
+            self._embedding_function = embedding_functions.DefaultEmbeddingFunction()
+            self._collection = client.get_or_create_collection(
+                name=self.collection_name,
+                metadata={"description": "1&1 help center article passages"},
+                embedding_function=self._embedding_function
+            )
+            self._client = client
+            self.warm["collection"] = True
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._open()
+        return self._client
+
+    @property
+    def collection(self):
+        if self._collection is None:
+            self._open()
+        return self._collection
+
+    @property
+    def embedding_function(self):
+        if self._embedding_function is None:
+            self._open()
+        return self._embedding_function
+
+    def warm_up(self) -> Dict[str, Any]:
+        """
+        Open the collection, load the embedding model and the lexical index
+        ahead of the first request.
+
+        Returns:
+            Seconds spent per component
+        """
+        timings = {}
+
+        start = time.perf_counter()
+        count = self.collection.count()
+        timings["collection_s"] = round(time.perf_counter() - start, 3)
+
+        start = time.perf_counter()
+        self.embed(["warm-up"])
+        timings["embedder_s"] = round(time.perf_counter() - start, 3)
+
+        if self.search_mode in ("hybrid", "lexical"):
+            start = time.perf_counter()
+            self.get_lexical_index()
+            timings["lexical_index_s"] = round(time.perf_counter() - start, 3)
+
+        timings["document_count"] = count
+        return timings
+
+    def is_ready(self) -> bool:
+        """Collection open, embedder loaded and, for hybrid/lexical search, the BM25 index loaded"""
+        needs_lexical = self.search_mode in ("hybrid", "lexical")
+        return (
+            self.warm["collection"] and self.warm["embedder"]
+            and (self.warm["lexical_index"] or not needs_lexical)
         )
 
+    def _get_search_pool(self) -> ThreadPoolExecutor:
+        """Create the search executor on first use"""
+        if self._search_pool is None:
+            self._search_pool = ThreadPoolExecutor(
+                max_workers=self.search_workers,
+                thread_name_prefix="vector-search"
+            )
+        return self._search_pool
+
     def add_documents(
         self,
         documents: List[str],
@@ -67,6 +202,7 @@ class VectorDBClient:
                 metadatas=metadatas,
                 ids=ids
             )
+            self.version += 1
 
             return {
                 "status": "success",
@@ -79,47 +215,521 @@ class VectorDBClient:
                 "message": str(e)
             }
 
+    def add_articles(self, articles: List[Dict[str, Any]], batch_size: int = 256) -> Dict[str, Any]:
+        """
+        Chunk scraped articles into passages and add them to the vector database.
+
+        Passages are embedded together with their article title; the stored
+        document is the passage text only.
+
+        Args:
+            articles: Scraped articles with 'content', 'title' and 'url'
+            batch_size: Passages embedded and inserted per batch
+
+        Returns:
+            Dictionary with operation status
+        """
+        chunks = self._chunk_articles(articles)
+
+        if not chunks:
+            return {"status": "error", "message": "No documents provided"}
+
+        try:
+            for start in range(0, len(chunks), batch_size):
+                batch = chunks[start:start + batch_size]
+                self.collection.add(
+                    ids=[c["id"] for c in batch],
+                    documents=[c["text"] for c in batch],
+                    metadatas=[c["metadata"] for c in batch],
+                    embeddings=self.embed([embedding_text(c) for c in batch])
+                )
+            self.version += 1
+
+            return {
+                "status": "success",
+                "count": len(chunks),
+                "articles": len({c["metadata"]["article_id"] for c in chunks}),
+                "collection": self.collection_name
+            }
+        except Exception as e:
+            return {
+                "status": "error",
+                "message": str(e)
+            }
+
+    def _chunk_articles(self, articles: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        chunks = []
+        for article in articles:
+            if not article.get("content"):
+                continue
+            digest = content_hash(article, self.chunk_size, self.chunk_overlap)
+            for chunk in split_article(article, self.chunk_size, self.chunk_overlap):
+                chunk["metadata"]["content_hash"] = digest
+                chunks.append(chunk)
+        return chunks
+
+    def _indexed_articles(self, page_size: int = 5000) -> Dict[str, Dict[str, Any]]:
+        """Map article_id -> {'hash', 'ids'} for everything in the collection"""
+        indexed: Dict[str, Dict[str, Any]] = {}
+        offset = 0
+        while True:
+            page = self.collection.get(include=["metadatas"], limit=page_size, offset=offset)
+            for chunk_id, metadata in zip(page["ids"], page["metadatas"]):
+                metadata = metadata or {}
+                key = metadata.get("article_id") or chunk_id
+                entry = indexed.setdefault(key, {"hash": metadata.get("content_hash"), "ids": []})
+                entry["ids"].append(chunk_id)
+                if entry["hash"] != metadata.get("content_hash"):
+                    # Mixed passages of one article: force a re-embed
+                    entry["hash"] = None
+            if len(page["ids"]) < page_size:
+                return indexed
+            offset += page_size
+
+    def sync_articles(
+        self,
+        articles: Iterable[Dict[str, Any]],
+        batch_size: int = 256,
+        progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+        remove_missing: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Bring the collection in line with the scraped articles.
+
+        Only articles whose content hash differs from the one stored in their
+        passage metadata are re-chunked and embedded (upsert); passages of
+        articles that were removed, or that an article no longer produces, are
+        deleted. Progress is kept in sync_status and passed to `progress`
+        after every batch. When anything changed, a loaded BM25 index is
+        brought up to date with the articles file as well.
+
+        Args:
+            articles: Scraped articles with 'content', 'title' and 'url' (any
+                iterable, e.g. a stream from iter_articles; the first record
+                of an article counts)
+            batch_size: Passages embedded and upserted per batch
+            progress: Optional callback receiving sync_status (to_embed grows
+                as the articles are read)
+            remove_missing: Delete indexed articles not in `articles` (False to
+                apply a partial update, e.g. only re-crawled articles)
+
+        Returns:
+            Dictionary with operation status and article/passage counts
+        """
+        started = time.perf_counter()
+        self.sync_status = {"state": "running", "embedded": 0, "to_embed": 0}
+
+        try:
+            indexed = self._indexed_articles()
+            seen: Set[str] = set()
+            pending: List[Dict[str, Any]] = []
+            stale_ids: List[str] = []
+            added = updated = 0
+
+            def flush():
+                self.collection.upsert(
+                    ids=[c["id"] for c in pending],
+                    documents=[c["text"] for c in pending],
+                    metadatas=[c["metadata"] for c in pending],
+                    embeddings=self.embed([embedding_text(c) for c in pending])
+                )
+                self.sync_status["embedded"] += len(pending)
+                pending.clear()
+                if progress:
+                    progress(self.sync_status)
+
+            # Articles are read, chunked and embedded batch by batch; only the
+            # ids of indexed passages are held for the whole run
+            for article in articles:
+                if not article.get("content"):
+                    continue
+                key = article_id(article)
+                if key in seen:
+                    continue
+                seen.add(key)
+
+                digest = content_hash(article, self.chunk_size, self.chunk_overlap)
+                existing = indexed.get(key)
+                if existing and existing["hash"] == digest:
+                    continue
+
+                article_chunks = split_article(article, self.chunk_size, self.chunk_overlap)
+                for chunk in article_chunks:
+                    chunk["metadata"]["content_hash"] = digest
+                if existing is None:
+                    added += 1
+                else:
+                    updated += 1
+                    new_ids = {c["id"] for c in article_chunks}
+                    stale_ids.extend(i for i in existing["ids"] if i not in new_ids)
+
+                pending.extend(article_chunks)
+                self.sync_status["to_embed"] += len(article_chunks)
+                if len(pending) >= batch_size:
+                    flush()
+            if pending:
+                flush()
+
+            removed = [key for key in indexed if key not in seen] if remove_missing else []
+            for key in removed:
+                stale_ids.extend(indexed[key]["ids"])
+            for start in range(0, len(stale_ids), batch_size):
+                self.collection.delete(ids=stale_ids[start:start + batch_size])
+
+            if self.sync_status["to_embed"] or stale_ids:
+                self.version += 1
+                self._refresh_lexical_index()
+
+            self.sync_status.update({
+                "state": "done",
+                "articles": len(seen),
+                "unchanged": len(seen) - added - updated,
+                "added": added,
+                "updated": updated,
+                "removed": len(removed),
+                "passages_deleted": len(stale_ids),
+                "duration_s": round(time.perf_counter() - started, 2)
+            })
+            return {"status": "success", **self.sync_status}
+        except Exception as e:
+            self.sync_status.update({"state": "error", "error": str(e)})
+            return {"status": "error", "message": str(e)}
+
+    def get_lexical_index(self) -> Optional[LexicalIndex]:
+        """
+        Get the BM25 index for the current articles file (None if unavailable).
+
+        Loaded or built on first use and rebuilt when the articles file
+        changes; while a rebuild runs, other searches keep using the old index.
+        """
+        fingerprint = self._lexical_fingerprint()
+        index = self._lexical_index
+        if index is not None and index.fingerprint == fingerprint:
+            return index
+
+        if not self._lexical_lock.acquire(blocking=index is None):
+            return index
+        try:
+            index = self._lexical_index
+            if index is not None and index.fingerprint == fingerprint:
+                return index
+            # A failed build is only retried once the articles file changes
+            if fingerprint is None or fingerprint == self._lexical_failed:
+                return index
+            rebuilt = self._load_or_build_lexical_index(fingerprint)
+            self.warm["lexical_index"] = True
+            if rebuilt is None:
+                # Keep serving the previous index, if any
+                self._lexical_failed = fingerprint
+                return index
+            self._lexical_index = rebuilt
+            return rebuilt
+        finally:
+            self._lexical_lock.release()
+
+    def _refresh_lexical_index(self):
+        """After a write: retry a failed build and bring a loaded index up to date with the articles file"""
+        self._lexical_failed = None
+        if self._lexical_index is not None:
+            self.get_lexical_index()
+
+    def is_known_term(self, word: str) -> bool:
+        """True if a word occurs in the corpus (False while the BM25 index isn't loaded; never loads it)"""
+        index = self._lexical_index
+        return index is not None and index.contains(word)
+
+    def _lexical_fingerprint(self) -> Optional[str]:
+        """Identifies the articles file and chunk settings an index was built from (None if no file)"""
+        try:
+            stat = self.articles_file.stat()
+        except OSError:
+            return None
+        return f"{stat.st_size}:{stat.st_mtime_ns}:{self.chunk_size}:{self.chunk_overlap}"
+
+    def _load_or_build_lexical_index(self, fingerprint: str) -> Optional[LexicalIndex]:
+        if self.lexical_index_path.is_file():
+            try:
+                index = LexicalIndex.load(str(self.lexical_index_path))
+                if index.fingerprint == fingerprint:
+                    return index
+            except Exception as e:
+                print(f"Error loading lexical index {self.lexical_index_path}: {e}")
+
+        try:
+            index = LexicalIndex.build(self._chunk_articles(iter_articles(self.articles_file)), fingerprint)
+        except Exception as e:
+            print(f"Error building lexical index: {e}")
+            return None
+        print(f"Built lexical index with {len(index)} passages")
+
+        # Not being able to persist it only costs a rebuild on the next start
+        try:
+            index.save(str(self.lexical_index_path))
+        except Exception as e:
+            print(f"Error saving lexical index {self.lexical_index_path}: {e}")
+        return index
+
     def search(
         self,
         query: str,
         n_results: int = 5,
-        where: Optional[Dict[str, Any]] = None
+        where: Optional[Dict[str, Any]] = None,
+        query_embedding: Optional[List[float]] = None,
+        mode: Optional[str] = None
     ) -> Dict[str, Any]:
         """
-        Search for similar documents in the vector database.
+        Search for relevant passages.
+
+        Fetches n_results * chunk_overfetch passages, keeps those of the best
+        n_results articles and adds an 'articles' list with the passages
+        regrouped per article. In hybrid mode vector and BM25 rankings are
+        combined with reciprocal rank fusion; lexical mode skips embedding
+        entirely. Passages found only lexically have a distance of None.
 
         Args:
             query: Search query text
-            n_results: Number of results to return
-            where: Optional metadata filter
+            n_results: Number of articles to return
+            where: Optional metadata filter (vector search only)
+            query_embedding: Precomputed embedding of the query (skips embedding)
+            mode: 'vector', 'hybrid' or 'lexical' (defaults to SEARCH_MODE)
 
         Returns:
             Dictionary with search results
         """
+        query_embeddings = [query_embedding] if query_embedding is not None else None
+        return self.search_many([query], n_results, where, query_embeddings, mode)[0]
+
+    def search_many(
+        self,
+        queries: List[str],
+        n_results: int = 5,
+        where: Optional[Dict[str, Any]] = None,
+        query_embeddings: Optional[List[List[float]]] = None,
+        mode: Optional[str] = None,
+        batch_size: int = 1000
+    ) -> List[Dict[str, Any]]:
+        """
+        Search many queries at once.
+
+        Each batch of queries is embedded in one vectorized pass and looked up
+        with a single HNSW query; results are processed as in search().
+
+        Args:
+            queries: Search query texts
+            n_results: Number of articles to return per query
+            where: Optional metadata filter (vector search only)
+            query_embeddings: Precomputed embeddings, one per query
+            mode: 'vector', 'hybrid' or 'lexical' (defaults to SEARCH_MODE)
+            batch_size: Queries per embedding/HNSW call
+
+        Returns:
+            One result dictionary per query, in input order
+        """
+        results = []
+        for start in range(0, len(queries), batch_size):
+            batch = queries[start:start + batch_size]
+            batch_embeddings = query_embeddings[start:start + batch_size] if query_embeddings else None
+            results.extend(self._search_batch(batch, n_results, where, batch_embeddings, mode))
+        return results
+
+    def _search_batch(
+        self,
+        queries: List[str],
+        n_results: int,
+        where: Optional[Dict[str, Any]],
+        query_embeddings: Optional[List[List[float]]],
+        mode: Optional[str]
+    ) -> List[Dict[str, Any]]:
         try:
-            results = self.collection.query(
-                query_texts=[query],
-                n_results=n_results,
-                where=where
-            )
+            mode = mode or self.search_mode
+            n_candidates = n_results * self.chunk_overfetch
+            lexical = None
+            if mode in ("hybrid", "lexical") and where is None:
+                lexical = self.get_lexical_index()
+            if lexical is None:
+                mode = "vector"
 
-            return {
-                "query": query,
-                "n_results": len(results["ids"][0]) if results["ids"] else 0,
-                "documents": results["documents"],
-                "metadatas": results["metadatas"],
-                "distances": results["distances"],
-                "ids": results["ids"]
-            }
+            vector_hits: List[List[tuple]] = [[] for _ in queries]
+            if mode != "lexical" and queries:
+                if query_embeddings is not None:
+                    query_args = {"query_embeddings": query_embeddings}
+                else:
+                    query_args = {"query_texts": queries}
+
+                results = self.collection.query(
+                    n_results=n_candidates,
+                    where=where,
+                    **query_args
+                )
+
+                for i in range(len(queries)):
+                    vector_hits[i] = list(zip(results["documents"][i], results["metadatas"][i],
+                                              results["distances"][i], results["ids"][i]))
+
+            return [
+                self._rank_results(query, hits, lexical, n_results, n_candidates, mode)
+                for query, hits in zip(queries, vector_hits)
+            ]
         except Exception as e:
-            return {
-                "query": query,
-                "error": str(e),
-                "documents": [[]],
-                "metadatas": [[]],
-                "distances": [[]],
-                "ids": [[]]
-            }
+            return [
+                {
+                    "query": query,
+                    "error": str(e),
+                    "documents": [[]],
+                    "metadatas": [[]],
+                    "distances": [[]],
+                    "ids": [[]]
+                }
+                for query in queries
+            ]
+
+    def _rank_results(
+        self,
+        query: str,
+        vector_hits: List[tuple],
+        lexical: Optional[LexicalIndex],
+        n_results: int,
+        n_candidates: int,
+        mode: str
+    ) -> Dict[str, Any]:
+        """Fuse vector and lexical hits for one query and keep the best articles"""
+        candidates: Dict[str, tuple] = {}
+        vector_ranking: List[str] = []
+        lexical_ranking: List[str] = []
+
+        for hit in vector_hits:
+            candidates[hit[3]] = hit
+            vector_ranking.append(hit[3])
+
+        # Ranking score per passage: fused RRF score, or BM25 score when lexical only
+        scores: Dict[str, float] = {}
+        if lexical is not None:
+            for index, score in lexical.search(query, n_candidates):
+                chunk_id, text, metadata = lexical.get(index)
+                candidates.setdefault(chunk_id, (text, metadata, None, chunk_id))
+                lexical_ranking.append(chunk_id)
+                scores[chunk_id] = float(score)
+
+        if vector_ranking and lexical_ranking:
+            fused = reciprocal_rank_fusion([vector_ranking, lexical_ranking])
+            ranking = [key for key, _ in fused]
+            scores = dict(fused)
+        else:
+            ranking = vector_ranking or lexical_ranking
+        ranked = [candidates[key] for key in ranking[:n_candidates]]
+
+        articles = group_by_article(
+            [h[0] for h in ranked], [h[1] for h in ranked], [h[2] for h in ranked],
+            max_articles=n_results
+        )
+        kept = {a["article_id"] for a in articles}
+        hits = [hit for hit in ranked if result_article_key(hit[0], hit[1]) in kept]
+
+        return {
+            "query": query,
+            "n_results": len(hits),
+            "documents": [[h[0] for h in hits]],
+            "metadatas": [[h[1] for h in hits]],
+            "distances": [[h[2] for h in hits]],
+            "ids": [[h[3] for h in hits]],
+            "scores": [[scores.get(h[3]) for h in hits]],
+            "articles": articles,
+            "mode": mode
+        }
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts with the collection's embedding function"""
+        vectors = [list(map(float, vector)) for vector in self.embedding_function(texts)]
+        self.warm["embedder"] = True
+        return vectors
+
+    async def _run_pooled(self, method: str, *args, slots: int = 1) -> Any:
+        """
+        Run a client method on the bounded search executor.
+
+        Args:
+            slots: Pending searches the call counts as (one per query of a batch)
+
+        Raises:
+            SearchQueueFullError: If the executor queue is at capacity
+        """
+        if self._pending_searches + slots > self.max_pending_searches:
+            self._rejected_searches += 1
+            raise SearchQueueFullError(
+                f"Vector search queue is full ({self.max_pending_searches} pending)"
+            )
+
+        loop = asyncio.get_running_loop()
+        self._pending_searches += slots
+        try:
+            return await loop.run_in_executor(self._get_search_pool(), getattr(self, method), *args)
+        finally:
+            self._pending_searches -= slots
+
+    async def embed_async(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts on the search executor without blocking the event loop"""
+        return await self._run_pooled("embed", texts)
+
+    async def search_async(
+        self,
+        query: str,
+        n_results: int = 5,
+        where: Optional[Dict[str, Any]] = None,
+        query_embedding: Optional[List[float]] = None,
+        mode: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Search without blocking the event loop.
+
+        Runs search() on the bounded search executor. When more than
+        max_pending_searches are already queued or running, the call is
+        rejected immediately instead of growing the queue without limit.
+
+        Args:
+            query: Search query text
+            n_results: Number of results to return
+            where: Optional metadata filter
+            query_embedding: Precomputed embedding of the query (skips embedding)
+            mode: 'vector', 'hybrid' or 'lexical' (defaults to SEARCH_MODE)
+
+        Returns:
+            Dictionary with search results
+
+        Raises:
+            SearchQueueFullError: If the executor queue is at capacity
+        """
+        return await self._run_pooled("search", query, n_results, where, query_embedding, mode)
+
+    async def search_many_async(
+        self,
+        queries: List[str],
+        n_results: int = 5,
+        where: Optional[Dict[str, Any]] = None,
+        mode: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Batched search_many() on the search executor; every query counts as a
+        pending search, so a batch can't take more than max_pending_searches.
+
+        Raises:
+            SearchQueueFullError: If the executor queue is at capacity
+        """
+        return await self._run_pooled("search_many", queries, n_results, where, None, mode, slots=len(queries))
+
+    def get_search_pool_stats(self) -> Dict[str, Any]:
+        """Get executor sizing and backpressure counters"""
+        return {
+            "workers": self.search_workers,
+            "pending": self._pending_searches,
+            "max_pending": self.max_pending_searches,
+            "rejected": self._rejected_searches
+        }
+
+    def close(self):
+        """Shut down the search executor"""
+        if self._search_pool is not None:
+            self._search_pool.shutdown(wait=False, cancel_futures=True)
+            self._search_pool = None
 
     def get_stats(self) -> Dict[str, Any]:
         """Get statistics about the vector database"""
@@ -128,6 +738,8 @@ class VectorDBClient:
             return {
                 "collection_name": self.collection_name,
                 "document_count": count,
+                "search_pool": self.get_search_pool_stats(),
+                "sync": self.sync_status,
                 "status": "healthy"
             }
         except Exception as e:
@@ -141,6 +753,7 @@ class VectorDBClient:
         """Delete the entire collection (use with caution!)"""
         try:
             self.client.delete_collection(self.collection_name)
+            self.version += 1
             return {"status": "deleted", "collection": self.collection_name}
         except Exception as e:
             return {"status": "error", "message": str(e)}
@@ -149,14 +762,26 @@ class VectorDBClient:
         """Reset the collection (delete and recreate)"""
         try:
             self.client.delete_collection(self.collection_name)
-            self.collection = self.client.get_or_create_collection(
+            self._collection = self.client.get_or_create_collection(
                 name=self.collection_name,
-                metadata={"description": "1&1 help center articles"}
+                metadata={"description": "1&1 help center article passages"},
+                embedding_function=self.embedding_function
             )
+            self.version += 1
             return {"status": "reset", "collection": self.collection_name}
         except Exception as e:
             return {"status": "error", "message": str(e)}
 
+    def delete_articles(self, article_ids: List[str]) -> Dict[str, Any]:
+        """Delete all passages of the given articles"""
+        try:
+            self.collection.delete(where={"article_id": {"$in": list(article_ids)}})
+            self.version += 1
+            self._refresh_lexical_index()
+            return {"status": "deleted", "articles": len(article_ids)}
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+
     def update_document(
         self,
         doc_id: str,
@@ -170,6 +795,7 @@ class VectorDBClient:
                 documents=[document],
                 metadatas=[metadata]
             )
+            self.version += 1
             return {"status": "updated", "id": doc_id}
         except Exception as e:
             return {"status": "error", "message": str(e)}
@@ -178,6 +804,7 @@ class VectorDBClient:
         """Delete a specific document"""
         try:
             self.collection.delete(ids=[doc_id])
+            self.version += 1
             return {"status": "deleted", "id": doc_id}
         except Exception as e:
             return {"status": "error", "message": str(e)}
@@ -0,0 +1,206 @@
+"""
+Article chunking for passage-level retrieval.
+Splits scraped help articles into overlapping passages on paragraph and heading
+boundaries, and regroups passage search results per article.
+"""
+import hashlib
+import re
+from typing import List, Dict, Any, Optional
+
+
+SENTENCE_END = (".", "!", "?", ":", ";")
+HEADING_MAX_CHARS = 100
+
+
+def article_id(article: Dict[str, Any]) -> str:
+    """Stable article ID (scraper ID, falling back to the URL hash)"""
+    return article.get("id") or hashlib.md5((article.get("url") or "").encode()).hexdigest()
+
+
+def content_hash(article: Dict[str, Any], chunk_size: int, overlap: int) -> str:
+    """Hash of everything that determines an article's passages and embeddings"""
+    key = "\x1f".join([
+        article.get("title") or "", article.get("url") or "", article.get("content") or "",
+        str(chunk_size), str(overlap)
+    ])
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token)"""
+    return (len(text) + 3) // 4
+
+
+def split_blocks(content: str) -> List[str]:
+    """
+    Rebuild paragraphs from scraped text. The scraper emits inline links on
+    their own line ("... über unsere\\nWebsite\\noder ..."), so a line is joined
+    to the previous one unless that one ends a sentence.
+    """
+    blocks: List[str] = []
+    for line in content.split("\n"):
+        line = line.strip()
+        if not line:
+            continue
+        if blocks and not blocks[-1].endswith(SENTENCE_END):
+            separator = "" if line[0] in ".,;:!?)" else " "
+            blocks[-1] = f"{blocks[-1]}{separator}{line}"
+        elif blocks and line[0] in ".,;:!?)":
+            blocks[-1] = f"{blocks[-1]}{line}"
+        else:
+            blocks.append(line)
+    return blocks
+
+
+def _is_heading(block: str) -> bool:
+    return len(block) <= HEADING_MAX_CHARS and not block.endswith((".", ";", ","))
+
+
+def _split_long(block: str, max_chars: int) -> List[str]:
+    """Split a block longer than max_chars on sentences, then on words"""
+    if len(block) <= max_chars:
+        return [block]
+
+    pieces: List[str] = []
+    current = ""
+    for sentence in re.split(r"(?<=[.!?])\s+", block):
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(" ", 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(sentence[:cut].strip())
+            sentence = sentence[cut:].strip()
+        if current and len(current) + len(sentence) + 1 > max_chars:
+            pieces.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}".strip()
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def _overlap_tail(blocks: List[str], overlap: int) -> List[str]:
+    """Trailing blocks (or the end of the last block) totalling at most `overlap` chars"""
+    tail: List[str] = []
+    size = 0
+    for block in reversed(blocks):
+        if size + len(block) > overlap:
+            if not tail:
+                cut = block.find(" ", len(block) - overlap)
+                if cut > 0:
+                    tail.append(block[cut + 1:])
+            break
+        tail.insert(0, block)
+        size += len(block) + 1
+    return tail
+
+
+def split_article(
+    article: Dict[str, Any],
+    chunk_size: int = 1000,
+    overlap: int = 150
+) -> List[Dict[str, Any]]:
+    """
+    Split an article into overlapping passages.
+
+    Args:
+        article: Scraped article with 'content', 'title' and 'url'
+        chunk_size: Target passage size in characters
+        overlap: Characters of the previous passage repeated at the start of the next
+
+    Returns:
+        List of chunks with 'id', 'text' and 'metadata' (chunk -> article mapping)
+    """
+    content = article.get("content") or ""
+    blocks: List[str] = []
+    for block in split_blocks(content):
+        blocks.extend(_split_long(block, chunk_size))
+
+    passages: List[List[str]] = []
+    current: List[str] = []
+    size = 0
+    for block in blocks:
+        # Close the passage when it is full, or early at a heading once half full
+        full = size + len(block) > chunk_size
+        at_heading = _is_heading(block) and size >= chunk_size // 2
+        if current and (full or at_heading):
+            passages.append(current)
+            current = _overlap_tail(current, overlap) if not at_heading else []
+            size = sum(len(b) + 1 for b in current)
+        current.append(block)
+        size += len(block) + 1
+    if current:
+        passages.append(current)
+
+    parent_id = article_id(article)
+    chunks = []
+    for index, passage in enumerate(passages):
+        chunks.append({
+            "id": f"{parent_id}:{index}",
+            "text": "\n".join(passage),
+            "metadata": {
+                "title": article.get("title") or "",
+                "url": article.get("url") or "",
+                "source": "1&1 Helpdesk",
+                "article_id": parent_id,
+                "chunk_index": index,
+                "chunk_count": len(passages)
+            }
+        })
+    return chunks
+
+
+def embedding_text(chunk: Dict[str, Any]) -> str:
+    """Text used to embed a chunk: the article title gives passages their topic"""
+    title = chunk["metadata"].get("title", "")
+    if title and not chunk["text"].startswith(title):
+        return f"{title}\n{chunk['text']}"
+    return chunk["text"]
+
+
+def result_article_key(document: str, metadata: Optional[Dict[str, Any]]) -> str:
+    """Article a search hit belongs to (whole-article documents fall back to the URL)"""
+    metadata = metadata or {}
+    return metadata.get("article_id") or metadata.get("url") or document[:50]
+
+
+def group_by_article(
+    documents: List[str],
+    metadatas: List[Dict[str, Any]],
+    distances: List[float],
+    max_articles: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Regroup passage hits (best first) per article.
+
+    Returns:
+        Articles ordered by their best passage distance, each with its matched
+        passages in reading order
+    """
+    articles: Dict[str, Dict[str, Any]] = {}
+    for doc, meta, distance in zip(documents, metadatas, distances):
+        meta = meta or {}
+        key = result_article_key(doc, meta)
+        article = articles.get(key)
+        if article is None:
+            if max_articles is not None and len(articles) >= max_articles:
+                continue
+            article = articles[key] = {
+                "article_id": key,
+                "title": meta.get("title", ""),
+                "url": meta.get("url", ""),
+                "distance": distance,
+                "passages": []
+            }
+        article["passages"].append({
+            "text": doc,
+            "chunk_index": meta.get("chunk_index", 0),
+            "distance": distance
+        })
+
+    for article in articles.values():
+        article["passages"].sort(key=lambda p: p["chunk_index"])
+    return list(articles.values())
@@ -0,0 +1,232 @@
+"""
+In-process BM25 inverted index over article passages.
+Complements the embedding search for exact product terms ("Glasfaser", "5G",
+router model numbers) and is persisted as a compact numpy archive.
+"""
+import json
+import re
+from pathlib import Path
+from typing import List, Dict, Any, Tuple
+
+import numpy as np
+
+
+GERMAN_STOPWORDS = {
+    "aber", "alle", "als", "also", "am", "an", "auch", "auf", "aus", "bei", "bin", "bis",
+    "bist", "da", "damit", "dann", "das", "dass", "dem", "den", "der", "des", "die", "dies",
+    "diese", "dieser", "doch", "du", "durch", "ein", "eine", "einem", "einen", "einer",
+    "eines", "er", "es", "für", "hat", "haben", "hier", "ich", "ihr", "ihre", "ihren",
+    "ihrer", "im", "in", "ist", "ja", "kann", "können", "man", "mein", "meine", "mich",
+    "mir", "mit", "muss", "nach", "nicht", "noch", "nur", "oder", "ob", "sich", "sie",
+    "sind", "so", "über", "um", "und", "uns", "unter", "vom", "von", "vor", "war", "was",
+    "wenn", "werden", "wie", "wir", "wird", "wo", "zu", "zum", "zur",
+}
+
+_STRIP_GE = re.compile(r"^ge(.{4,})")
+_DOUBLE = re.compile(r"(.)\1")
+_UNDOUBLE = re.compile(r"(.)\*")
+
+
+def stem(word: str) -> str:
+    """
+    German stemmer (CISTEM, case-insensitive variant).
+    Weissweiler & Fraser, "Developing a Stemmer for German Based on a
+    Comparative Analysis of Publicly Available Stemmers", 2017.
+    """
+    word = word.lower()
+    word = word.replace("ü", "u").replace("ö", "o").replace("ä", "a").replace("ß", "ss")
+    word = _STRIP_GE.sub(r"\1", word)
+    word = word.replace("sch", "$").replace("ei", "%").replace("ie", "&")
+    word = _DOUBLE.sub(r"\1*", word)
+
+    while len(word) > 3:
+        if len(word) > 5 and word[-2:] in ("em", "er", "nd"):
+            word = word[:-2]
+        elif word[-1] in "tesn":
+            word = word[:-1]
+        else:
+            break
+
+    word = _UNDOUBLE.sub(r"\1\1", word)
+    return word.replace("&", "ie").replace("%", "ei").replace("$", "sch")
+
+
+def analyze(text: str) -> List[str]:
+    """Tokenize and stem text; tokens containing digits (5G, 7590) are kept verbatim"""
+    terms = []
+    for token in re.findall(r"\w+", text.lower()):
+        if token in GERMAN_STOPWORDS:
+            continue
+        terms.append(token if any(ch.isdigit() for ch in token) else stem(token))
+    return terms
+
+
+def _pack(strings: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Store strings as one UTF-8 byte blob plus byte offsets"""
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(e) for e in encoded])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def _unpack_one(blob: np.ndarray, offsets: np.ndarray, i: int) -> str:
+    return blob[offsets[i]:offsets[i + 1]].tobytes().decode("utf-8")
+
+
+def reciprocal_rank_fusion(rankings: List[List[str]], k: int = 60) -> List[Tuple[str, float]]:
+    """Fuse ranked ID lists: score = sum of 1 / (k + rank)"""
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, key in enumerate(ranking, 1):
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+class LexicalIndex:
+    """BM25 index with CSR-style posting arrays"""
+
+    def __init__(
+        self,
+        terms: List[str],
+        offsets: np.ndarray,
+        doc_ids: np.ndarray,
+        tfs: np.ndarray,
+        doc_lens: np.ndarray,
+        keys: List[str],
+        text_blob: np.ndarray,
+        text_offsets: np.ndarray,
+        meta_blob: np.ndarray,
+        meta_offsets: np.ndarray,
+        fingerprint: str = "",
+        k1: float = 1.2,
+        b: float = 0.75
+    ):
+        self.term_ids = {term: i for i, term in enumerate(terms)}
+        self.terms = terms
+        self.offsets = offsets
+        self.doc_ids = doc_ids
+        self.tfs = tfs
+        self.doc_lens = doc_lens
+        self.keys = keys
+        self.text_blob = text_blob
+        self.text_offsets = text_offsets
+        self.meta_blob = meta_blob
+        self.meta_offsets = meta_offsets
+        self.fingerprint = fingerprint
+        self.k1 = k1
+        self.b = b
+
+        n_docs = len(keys)
+        doc_freqs = np.diff(offsets).astype(np.float64)
+        self.idf = np.log(1.0 + (n_docs - doc_freqs + 0.5) / (doc_freqs + 0.5))
+        self.avg_doc_len = float(doc_lens.mean()) if n_docs else 0.0
+
+    @classmethod
+    def build(cls, chunks: List[Dict[str, Any]], fingerprint: str = "") -> "LexicalIndex":
+        """
+        Build the index from chunks as produced by chunking.split_article.
+
+        Args:
+            chunks: Dicts with 'id', 'text' and 'metadata'
+            fingerprint: Identifies the source data, stored with the index
+        """
+        postings: Dict[str, Dict[int, int]] = {}
+        doc_lens = np.zeros(len(chunks), dtype=np.float32)
+
+        for doc, chunk in enumerate(chunks):
+            title = chunk["metadata"].get("title", "")
+            terms = analyze(f"{title}\n{chunk['text']}")
+            doc_lens[doc] = len(terms)
+            for term in terms:
+                counts = postings.setdefault(term, {})
+                counts[doc] = counts.get(doc, 0) + 1
+
+        terms = sorted(postings)
+        offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(postings[t]) for t in terms])
+        doc_ids = np.empty(offsets[-1], dtype=np.int32)
+        tfs = np.empty(offsets[-1], dtype=np.uint16)
+        for i, term in enumerate(terms):
+            docs = postings[term]
+            doc_ids[offsets[i]:offsets[i + 1]] = list(docs.keys())
+            tfs[offsets[i]:offsets[i + 1]] = np.minimum(list(docs.values()), 65535)
+
+        text_blob, text_offsets = _pack([c["text"] for c in chunks])
+        meta_blob, meta_offsets = _pack([json.dumps(c["metadata"], ensure_ascii=False) for c in chunks])
+
+        return cls(terms, offsets, doc_ids, tfs, doc_lens, [c["id"] for c in chunks],
+                   text_blob, text_offsets, meta_blob, meta_offsets, fingerprint)
+
+    def save(self, path: str):
+        """Persist the index as a compressed numpy archive"""
+        term_blob, term_offsets = _pack(self.terms)
+        key_blob, key_offsets = _pack(self.keys)
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as f:
+            np.savez_compressed(
+                f,
+                term_blob=term_blob, term_offsets=term_offsets,
+                offsets=self.offsets, doc_ids=self.doc_ids, tfs=self.tfs, doc_lens=self.doc_lens,
+                key_blob=key_blob, key_offsets=key_offsets,
+                text_blob=self.text_blob, text_offsets=self.text_offsets,
+                meta_blob=self.meta_blob, meta_offsets=self.meta_offsets,
+                fingerprint=np.array(self.fingerprint)
+            )
+
+    @classmethod
+    def load(cls, path: str) -> "LexicalIndex":
+        """Load an index written by save()"""
+        with np.load(path) as data:
+            arrays = {name: data[name] for name in data.files}
+
+        term_blob, term_offsets = arrays["term_blob"], arrays["term_offsets"]
+        key_blob, key_offsets = arrays["key_blob"], arrays["key_offsets"]
+        terms = [_unpack_one(term_blob, term_offsets, i) for i in range(len(term_offsets) - 1)]
+        keys = [_unpack_one(key_blob, key_offsets, i) for i in range(len(key_offsets) - 1)]
+
+        return cls(terms, arrays["offsets"], arrays["doc_ids"], arrays["tfs"], arrays["doc_lens"],
+                   keys, arrays["text_blob"], arrays["text_offsets"],
+                   arrays["meta_blob"], arrays["meta_offsets"], str(arrays["fingerprint"]))
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def contains(self, word: str) -> bool:
+        """True if a word (after stemming) occurs in the indexed passages"""
+        term = word.lower() if any(ch.isdigit() for ch in word) else stem(word)
+        return term in self.term_ids
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[int, float]]:
+        """
+        Rank documents for a query with BM25.
+
+        Returns:
+            List of (document index, score), best first, only documents with a match
+        """
+        term_ids = [self.term_ids[t] for t in set(analyze(query)) if t in self.term_ids]
+        if not term_ids or not len(self.keys):
+            return []
+
+        scores = np.zeros(len(self.keys), dtype=np.float64)
+        for term_id in term_ids:
+            start, end = self.offsets[term_id], self.offsets[term_id + 1]
+            docs = self.doc_ids[start:end]
+            tf = self.tfs[start:end].astype(np.float64)
+            norm = self.k1 * (1.0 - self.b + self.b * self.doc_lens[docs] / self.avg_doc_len)
+            # Each doc appears once per posting list, so fancy-index add is safe
+            scores[docs] += self.idf[term_id] * tf * (self.k1 + 1.0) / (tf + norm)
+
+        k = min(k, int(np.count_nonzero(scores)))
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(i), float(scores[i])) for i in top]
+
+    def get(self, index: int) -> Tuple[str, str, Dict[str, Any]]:
+        """Get (chunk id, passage text, metadata) for a document index"""
+        return (
+            self.keys[index],
+            _unpack_one(self.text_blob, self.text_offsets, index),
+            json.loads(_unpack_one(self.meta_blob, self.meta_offsets, index))
+        )
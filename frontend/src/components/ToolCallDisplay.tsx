@@ -35,11 +35,13 @@ export const ToolCallDisplay: React.FC<ToolCallDisplayProps> = ({ toolCall }) =>
             {toolCall.results ? (
               <div className="space-y-3">
                 <div className="text-sm text-muted-foreground">
-                  Found {toolCall.results.n_results} relevant articles
+                  Found {toolCall.results.n_results} relevant passages
+                  {toolCall.results.articles && ` from ${toolCall.results.articles.length} articles`}
                 </div>
                 {toolCall.results.documents[0]?.map((doc, idx) => {
                   const metadata = toolCall.results?.metadatas[0]?.[idx];
                   const distance = toolCall.results?.distances[0]?.[idx];
+                  const score = toolCall.results?.scores?.[0]?.[idx];
 
                   return (
                     <div key={idx} className="border-l-2 border-blue-400 pl-3 py-2">
@@ -47,10 +49,15 @@ export const ToolCallDisplay: React.FC<ToolCallDisplayProps> = ({ toolCall }) =>
                         <div className="font-medium text-sm">
                           {metadata?.title || `Article ${idx + 1}`}
                         </div>
-                        {distance !== undefined && (
+                        {distance != null ? (
                           <div className="text-xs text-muted-foreground">
                             similarity: {(1 - distance).toFixed(3)}
                           </div>
+                        ) : (
+                          // Keyword-only match: no vector distance, show its rank instead
+                          <div className="text-xs text-muted-foreground">
+                            rank {idx + 1}{score != null && ` · score ${score.toFixed(4)}`}
+                          </div>
                         )}
                       </div>
                       {metadata?.url && (
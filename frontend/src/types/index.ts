@@ -32,8 +32,14 @@ export interface VectorSearchResult {
     url?: string;
     [key: string]: any;
   }>>;
-  distances: number[][];
+  // null for passages found only by the lexical (BM25) search
+  distances: Array<Array<number | null>>;
   ids: string[][];
+  // fused RRF score (hybrid), BM25 score (lexical only) or null (vector only)
+  scores?: Array<Array<number | null>>;
+  // hits regrouped per article
+  articles?: Array<{ article_id: string; title?: string; url?: string; [key: string]: any }>;
+  mode?: 'vector' | 'hybrid' | 'lexical';
 }
 
 export interface PromptConfig {
@@ -80,6 +86,6 @@ export interface ChatRequest {
 }
 
 export interface StreamEvent {
-  type: 'tool_call_start' | 'tool_call_end' | 'content' | 'reasoning' | 'done' | 'error';
+  type: 'tool_call_start' | 'tool_call_end' | 'content' | 'reasoning' | 'usage' | 'timing' | 'done' | 'error';
   data: any;
 }